@@ -0,0 +1,235 @@
+# batch_solve.py
+#
+# Command-line batch solver for the text task format and the task_binary container. Reads
+# problems from files, directories or stdin and prints one result line per problem as soon as
+# it is solved.
+# Only the GUI-free modules are imported, no Qt objects are created.
+#
+#   python batch_solve.py tasks/            every file of a directory
+#   python batch_solve.py all_tasks.txt     one or more problems in one file
+#   python batch_solve.py task.smpx         a binary task file, one problem
+#   cat *.txt | python batch_solve.py       stdin (also "-")
+#   python batch_solve.py tasks/ --jobs 8   solve on 8 worker processes
+#   python batch_solve.py tasks/ --trace trace.jsonl   also write every pivot as JSON Lines
+
+import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fractions import Fraction
+from itertools import islice
+import json
+import multiprocessing
+import os
+import sys
+
+from pricing import PRICING_RULES
+from simplex_engine import TABLEAU_ENGINES, solve
+from solve_trace import SolveTrace
+from task_binary import is_task_binary, read_task_binary
+from task_format import TaskArrays, format_task_number, read_task_arrays
+
+ENGINES = list(TABLEAU_ENGINES) + ["revised", "hybrid"]
+
+
+def iter_task_texts(lines):
+    """
+    Split a stream of lines with concatenated problems into task texts.
+    A problem is its "num_vars num_constraints" line, the goal line and num_constraints
+    constraint lines, blank lines between problems are skipped.
+    Yields (task_text, error), error is a message if the stream cannot be split further.
+    """
+    lines = iter(lines)
+    for line in lines:
+        if not line.strip():
+            continue
+        header = line.split()
+        try:
+            num_constraints = int(header[1]) if len(header) == 2 else -1
+        except ValueError:
+            num_constraints = -1
+        if num_constraints < 0:
+            yield None, f"Неверная первая строка задачи: '{line.strip()}'"
+            return
+        task_lines = [line.strip()]
+        for line in lines:
+            task_lines.append(line.rstrip('\n'))
+            if len(task_lines) == num_constraints + 2:
+                break
+        yield '\n'.join(task_lines), None
+
+
+def iter_sources(paths):
+    """
+    Yield (name, task, error) for every problem of the given paths.
+    A path is a file, a directory (its files in name order) or "-" for stdin. task is the
+    task text, or the TaskArrays of a binary task file, which holds a single problem.
+    """
+    for path in paths or ["-"]:
+        if path == "-":
+            files = [("<stdin>", None)]
+        elif os.path.isdir(path):
+            files = [(os.path.join(path, name), os.path.join(path, name)) for name in sorted(os.listdir(path))
+                     if not name.startswith('.') and os.path.isfile(os.path.join(path, name))]
+        else:
+            files = [(path, path)]
+
+        for name, file_path in files:
+            if file_path is None:
+                stream = sys.stdin
+            else:
+                try:
+                    if is_task_binary(file_path):
+                        yield f"{name}#1", read_task_binary(file_path), None
+                        continue
+                    stream = open(file_path, encoding="utf-8")
+                except (OSError, ValueError) as e:
+                    yield name, None, str(e)
+                    continue
+            with stream:
+                for number, (text, error) in enumerate(iter_task_texts(stream), start=1):
+                    yield f"{name}#{number}", text, error
+
+
+def format_value(value):
+    if isinstance(value, Fraction):
+        return format_task_number(value)
+    return f"{float(value):.12g}"
+
+
+def solve_record(name, task, engine="fraction", pricing="first", max_iterations=1000, time_limit=None,
+                 presolve=False, scaling=True, trace=False):
+    """
+    Parse and solve one task text or TaskArrays. Returns a dict that is safe to send between processes:
+    name, status ("optimal", "no_solution", "iteration_limit", "time_limit" or "error"),
+    iterations, time, and value / variables for optimal answers or message for errors.
+    trace=True adds the solve_trace records of every pivot as trace.
+    """
+    record = {"name": name}
+    collector = SolveTrace(name=name) if trace else None
+    try:
+        arrays = task if isinstance(task, TaskArrays) else read_task_arrays(task)
+        # The revised engine works on the sparse problem, there is no need for dense rows
+        problem = arrays.to_sparse_problem() if engine == "revised" else arrays.to_problem()
+        result = solve(problem, max_iterations=max_iterations, engine=engine, pricing=pricing,
+                       time_limit=time_limit, presolve=presolve, scaling=scaling, on_iteration=collector)
+    except Exception as e:
+        record.update(status="error", message=str(e))
+        return record
+    finally:
+        if trace:
+            record["trace"] = collector.records
+
+    record.update(status=result.status, iterations=result.iterations, time=result.elapsed_time)
+    if result.status == "optimal":
+        values = result.variable_values
+        record["value"] = format_value(result.optimal_value)
+        record["variables"] = {f"X{j + 1}": format_value(values.get(f"X{j + 1}", Fraction(0)))
+                               for j in range(problem.num_vars)}
+    return record
+
+
+def solve_item(item, **options):
+    name, task, error = item
+    if error is not None:
+        return {"name": name, "status": "error", "message": error}
+    return solve_record(name, task, **options)
+
+
+def solve_chunk(chunk, options):
+    # Runs in a worker process
+    return [solve_item(item, **options) for item in chunk]
+
+
+def solve_parallel(items, jobs=None, chunk_size=4, ordered=True, **options):
+    """
+    Solve (name, task, error) items from iter_sources on a pool of worker processes and
+    yield the records. Items are sent in chunks of chunk_size and at most two chunks per
+    worker are in flight, so the input is read only as fast as it is solved.
+    ordered=False yields the chunks as they finish instead of in input order.
+    options are passed to solve_record, time_limit is the limit per problem.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+
+        def submit_chunks():
+            while len(pending) < 2 * jobs:
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    return
+                pending.append(executor.submit(solve_chunk, chunk, options))
+
+        submit_chunks()
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                yield from future.result()
+            submit_chunks()
+
+
+def format_record(record, output_format="text"):
+    if output_format == "json":
+        return json.dumps(record, ensure_ascii=False)
+    fields = [record["name"], record["status"]]
+    if record["status"] == "error":
+        fields.append(record["message"])
+    elif record["status"] == "optimal":
+        fields.append(f"F={record['value']}")
+        fields.append(" ".join(f"{var}={value}" for var, value in record["variables"].items()))
+    return "\t".join(fields)
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description="Решение задач симплекс-методом без графического интерфейса.")
+    parser.add_argument("paths", nargs="*", help="файлы или папки с задачами, '-' или ничего для stdin")
+    parser.add_argument("--engine", choices=ENGINES, default="fraction")
+    parser.add_argument("--pricing", choices=list(PRICING_RULES), default="first")
+    parser.add_argument("--max-iterations", type=int, default=1000)
+    parser.add_argument("--time-limit", type=float, default=None, help="секунд на одну задачу")
+    parser.add_argument("--presolve", action="store_true", help="упростить задачи перед решением")
+    parser.add_argument("--no-scaling", dest="scaling", action="store_false",
+                        help="не масштабировать коэффициенты для float и revised")
+    parser.add_argument("--trace", help="файл JSON Lines для данных каждой итерации")
+    parser.add_argument("--format", dest="output_format", choices=["text", "json"], default="text")
+    parser.add_argument("--jobs", type=int, default=1, help="число процессов, 0 - по числу ядер")
+    parser.add_argument("--chunk-size", type=int, default=4)
+    parser.add_argument("--unordered", action="store_true", help="выводить результаты по мере готовности")
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    options = {"engine": args.engine, "pricing": args.pricing, "max_iterations": args.max_iterations,
+               "time_limit": args.time_limit, "presolve": args.presolve, "scaling": args.scaling,
+               "trace": args.trace is not None}
+    items = iter_sources(args.paths)
+    if args.jobs == 1:
+        records = (solve_item(item, **options) for item in items)
+    else:
+        records = solve_parallel(items, args.jobs or None, max(args.chunk_size, 1), not args.unordered, **options)
+
+    trace_file = open(args.trace, "w", encoding="utf-8") if args.trace else None
+    failed = False
+    try:
+        for record in records:
+            if trace_file is not None:
+                for trace_record in record.pop("trace", []):
+                    trace_file.write(json.dumps(trace_record, ensure_ascii=False) + "\n")
+            failed = failed or record["status"] == "error"
+            print(format_record(record, args.output_format), flush=True)
+    finally:
+        if trace_file is not None:
+            trace_file.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
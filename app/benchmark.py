@@ -0,0 +1,268 @@
+# benchmark.py
+#
+# Reproducible benchmark of the engines on seeded random problems in the text task format.
+# Parsing, building the initial model, solving and formatting the answer are timed separately,
+# the results are written as JSON so runs of different releases can be compared.
+#
+#   python benchmark.py                         quick suite, all engines, JSON to stdout
+#   python benchmark.py --suite full -o new.json
+#   python benchmark.py --engines rational hybrid --compare old.json
+#   python benchmark.py --binary                parse stage loads task_binary containers
+
+import argparse
+from collections import Counter
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from batch_solve import ENGINES, format_value
+from pricing import PRICING_RULES
+from revised_simplex import build_sparse_model, run_revised_simplex
+from simplex_engine import FEASIBILITY_TOLERANCE, artificial_vars, build_tableau, run_simplex, solve_hybrid
+from sparse_problem import SparseProblem
+from task_binary import task_from_buffer, task_to_bytes
+from task_format import parse_task_text, read_task_arrays
+
+RELATION_TEXT = {"≤": "<=", "≥": ">=", "=": "="}
+
+# name, num_vars, num_constraints, density, relations, kind, number of problems
+SUITES = {
+    "quick": [
+        ("le-10", 10, 10, 1.0, "≤", "random", 10),
+        ("mixed-10", 10, 10, 1.0, "≤≥=", "random", 10),
+        ("le-25", 25, 25, 1.0, "≤", "random", 5),
+        ("mixed-25", 25, 25, 1.0, "≤≥", "random", 5),
+        ("eq-25", 25, 25, 1.0, "≤≥=", "random", 5),
+        ("sparse-25", 25, 25, 0.2, "≤≥", "random", 5),
+        ("degenerate-25", 25, 25, 1.0, "≤≥", "degenerate", 5),
+        ("infeasible-25", 25, 25, 1.0, "≤≥", "infeasible", 5),
+    ],
+    "full": [
+        ("le-10", 10, 10, 1.0, "≤", "random", 20),
+        ("mixed-10", 10, 10, 1.0, "≤≥=", "random", 20),
+        ("le-25", 25, 25, 1.0, "≤", "random", 10),
+        ("mixed-25", 25, 25, 1.0, "≤≥", "random", 10),
+        ("eq-25", 25, 25, 1.0, "≤≥=", "random", 10),
+        ("sparse-25", 25, 25, 0.2, "≤≥", "random", 10),
+        ("degenerate-25", 25, 25, 1.0, "≤≥", "degenerate", 10),
+        ("infeasible-25", 25, 25, 1.0, "≤≥", "infeasible", 10),
+        ("le-50", 50, 50, 1.0, "≤", "random", 5),
+        ("mixed-50", 50, 50, 1.0, "≤≥=", "random", 5),
+        ("sparse-100", 100, 100, 0.05, "≤≥", "random", 3),
+        ("wide-20x80", 80, 20, 0.5, "≤≥", "random", 5),
+    ],
+}
+
+
+def generate_task_text(rng, num_vars, num_constraints, density=1.0, relations="≤", kind="random"):
+    """
+    Text of a random problem with coefficients from -10 to 10 like test_generate_task_file.py.
+    A nonzero coefficient appears with probability density. kind is
+    "random":     the right-hand sides are chosen so a random point satisfies every row,
+    "degenerate": like "random", but most rows pass through that point, so many Si are zero,
+    "infeasible": like "random" with two rows that contradict each other.
+    A bound on the sum of the variables keeps the problems bounded.
+    """
+    point = [rng.randint(0, 5) for _ in range(num_vars)]
+    lines = [f"{num_vars} {num_constraints + 1}",
+             " ".join(str(rng.randint(-10, 10)) for _ in range(num_vars)) + " " + rng.choice(["min", "max"])]
+
+    rows = []
+    for i in range(num_constraints):
+        coeffs = [rng.randint(-10, 10) if rng.random() < density else 0 for _ in range(num_vars)]
+        relation = rng.choice(relations)
+        value = sum(c * x for c, x in zip(coeffs, point))
+        slack = 0 if relation == "=" or (kind == "degenerate" and rng.random() < 0.8) else rng.randint(1, 20)
+        rows.append((coeffs, relation, value + slack if relation == "≤" else value - slack))
+
+    if kind == "infeasible" and num_constraints >= 2:
+        coeffs = [rng.randint(1, 10) for _ in range(num_vars)]
+        value = sum(c * x for c, x in zip(coeffs, point))
+        rows[-2] = (coeffs, "≥", value + 5)
+        rows[-1] = (coeffs, "≤", value)
+    rows.append(([1] * num_vars, "≤", 10 * num_vars))
+
+    for coeffs, relation, rhs in rows:
+        lines.append(" ".join(map(str, coeffs)) + f" {RELATION_TEXT[relation]} {rhs}")
+    return "\n".join(lines)
+
+
+def build_model(problem, engine):
+    if engine == "revised":
+        sparse = SparseProblem.from_problem(problem)
+        return sparse, build_sparse_model(sparse)
+    return build_tableau(problem)
+
+
+def solve_model(problem, model, engine, pricing, max_iterations):
+    if engine == "hybrid":
+        # solve_hybrid builds its own tableau, the build time of the model is repeated here
+        return solve_hybrid(problem, max_iterations=max_iterations, pricing=pricing)
+    if engine == "revised":
+        sparse, (A, b, c, basic_cost, basic_vars, non_basic_vars) = model
+        return run_revised_simplex(A, b, c, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                                   max_iterations=max_iterations, pricing=pricing, basic_cost=basic_cost,
+                                   feasibility_check=lambda values: sparse.is_feasible(values, FEASIBILITY_TOLERANCE),
+                                   artificial_vars=artificial_vars(sparse.relations, basic_vars, problem.num_vars),
+                                   scaling=True)
+    df, basic_vars, non_basic_vars = model
+    relations = [relation for _, relation, _ in problem.constraints]
+    return run_simplex(df, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                       max_iterations=max_iterations, constraints=problem.constraints, num_vars=problem.num_vars,
+                       engine=engine, pricing=pricing,
+                       artificial_vars=artificial_vars(relations, basic_vars, problem.num_vars), scaling=True)
+
+
+def format_answer(result, num_vars):
+    lines = [f"{result.status}"]
+    if result.status == "optimal":
+        values = result.variable_values
+        lines.append(f"F = {format_value(result.optimal_value)}")
+        lines.extend(f"X{j + 1} = {format_value(values.get(f'X{j + 1}', 0))}" for j in range(num_vars))
+    return "\n".join(lines)
+
+
+def run_case(case, engine, pricing="first", max_iterations=5000, seed=0, memory=True, binary=False):
+    """
+    Solve the problems of one suite case with one engine.
+    binary=True converts the problems to the task_binary container before the run, the parse
+    stage then times loading the container instead of parsing the text.
+    Returns a dict with the total time of every stage in seconds, the number of problems per
+    status, the iterations, pivots per second of the solve stage and the peak memory of the
+    first problem's build and solve in KiB (measured in a separate run under tracemalloc,
+    which is much slower, None if memory is False).
+    """
+    name, num_vars, num_constraints, density, relations, kind, count = case
+    rng = random.Random(f"{seed}:{name}")
+    texts = [generate_task_text(rng, num_vars, num_constraints, density, relations, kind) for _ in range(count)]
+    if binary:
+        texts = [task_to_bytes(read_task_arrays(text)) for text in texts]
+    times = Counter()
+    statuses = Counter()
+    iterations = 0
+    peak_memory = 0
+
+    for k, text in enumerate(texts):
+        start = time.perf_counter()
+        problem = task_from_buffer(text).to_problem() if binary else parse_task_text(text)
+        parsed = time.perf_counter()
+        model = build_model(problem, engine)
+        built = time.perf_counter()
+        result = solve_model(problem, model, engine, pricing, max_iterations)
+        solved = time.perf_counter()
+        format_answer(result, problem.num_vars)
+        formatted = time.perf_counter()
+
+        times["parse"] += parsed - start
+        times["build"] += built - parsed
+        times["solve"] += solved - built
+        times["format"] += formatted - solved
+        statuses[result.status] += 1
+        iterations += result.iterations
+
+        if memory and k == 0:
+            tracemalloc.start()
+            solve_model(problem, build_model(problem, engine), engine, pricing, max_iterations)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    return {
+        "case": name,
+        "engine": engine,
+        "pricing": pricing,
+        "num_vars": num_vars,
+        "num_constraints": num_constraints,
+        "density": density,
+        "relations": relations,
+        "kind": kind,
+        "input": "binary" if binary else "text",
+        "problems": count,
+        "statuses": dict(statuses),
+        "iterations": iterations,
+        "parse_time": times["parse"],
+        "build_time": times["build"],
+        "solve_time": times["solve"],
+        "format_time": times["format"],
+        "pivots_per_sec": iterations / times["solve"] if times["solve"] > 0 else None,
+        "peak_memory_kib": peak_memory / 1024 if memory else None,
+    }
+
+
+def compare(results, baseline):
+    """
+    Lines with the solve time of every case and engine relative to a previous run.
+    """
+    def key(record):
+        # Reports written before the binary input have text input only
+        return record["case"], record["engine"], record["pricing"], record.get("input", "text")
+
+    old = {key(record): record for record in baseline["results"]}
+    lines = []
+    for record in results:
+        previous = old.get(key(record))
+        if previous is None or not previous["solve_time"]:
+            continue
+        ratio = record["solve_time"] / previous["solve_time"]
+        changed = "" if record["statuses"] == previous["statuses"] else "  другие статусы!"
+        lines.append(f"{record['case']:<16} {record['engine']:<9} {previous['solve_time']:9.4f}s -> "
+                     f"{record['solve_time']:9.4f}s  x{ratio:.2f}{changed}")
+    return lines
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description="Замер скорости движков симплекс-метода на случайных задачах.")
+    parser.add_argument("--suite", choices=list(SUITES), default="quick")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--pricing", choices=list(PRICING_RULES), default="first")
+    parser.add_argument("--max-iterations", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", nargs="+", help="только эти случаи набора")
+    parser.add_argument("--binary", action="store_true", help="читать задачи из двоичного формата task_binary")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="не замерять пиковую память")
+    parser.add_argument("-o", "--output", help="файл для результатов в JSON, иначе stdout")
+    parser.add_argument("--compare", help="JSON предыдущего запуска для сравнения времени решения")
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    cases = [case for case in SUITES[args.suite] if not args.cases or case[0] in args.cases]
+    results = []
+    for case in cases:
+        for engine in args.engines:
+            record = run_case(case, engine, args.pricing, args.max_iterations, args.seed, args.memory, args.binary)
+            results.append(record)
+            print(f"{record['case']:<16} {record['engine']:<9} solve {record['solve_time']:9.4f}s  "
+                  f"{record['iterations']:6d} итераций", file=sys.stderr, flush=True)
+
+    report = {
+        "suite": args.suite,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for line in compare(results, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
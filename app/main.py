@@ -3,26 +3,89 @@ import datetime
 import os.path as path
 import sys
 import random
+import threading
+import time
 import qdarkstyle
-from pandas import DataFrame
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QComboBox, QSpinBox, QMessageBox, QAbstractSpinBox, QPlainTextEdit, QTabWidget, QFileDialog,
-    QRadioButton, QDialog
+    QRadioButton, QDialog, QProgressBar
 )
 from PyQt6.QtGui import QIcon, QRegularExpressionValidator
-from PyQt6.QtCore import Qt, QRegularExpression, QDir
+from PyQt6.QtCore import Qt, QRegularExpression, QDir, QObject, QThread, pyqtSignal
 from fractions import Fraction
 
 from solution_window import SimplexSolutionWindow, rename_df_headers, format_number
+from simplex_engine import SimplexProblem, artificial_vars, build_tableau, solve
+from task_format import (parse_input_number, format_task_number, read_task_arrays, TaskArrays,
+                         format_task_arrays)
+from task_binary import is_task_binary, load_task_file, read_task_binary, write_task_binary
 from save_answer import generate_default_filename, save_as_text, save_as_html
 
+# Larger task files are not shown in the text editor, they are read from the file when solving
+EDITOR_SIZE_LIMIT = 4 * 1024 * 1024
+TASK_FILE_FILTER = "Text Files (*.txt);;Binary Task Files (*.smpx);;All Files (*)"
+
+
+class LargeTaskWorker(QObject):
+    """
+    Solves a task that is too large for the tableau engines on a worker thread with the revised
+    engine, so the window stays responsive and the task is never built as dense rows.
+    load() returns the TaskArrays of the task, it runs on the worker thread too, so a large file
+    is read there as well.
+    """
+    progress = pyqtSignal(int, int, object)  # iteration, phase, objective
+    solved = pyqtSignal(object, object)  # SparseProblem, SimplexResult
+    failed = pyqtSignal(str, str)  # message box title, text
+
+    # The revised engine makes thousands of pivots a second, the label is updated at most this often
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, load):
+        super().__init__()
+        self.load = load
+        self._cancelled = threading.Event()
+        self._last_progress = 0
+
+    def cancel(self):
+        # Called from the GUI thread, the engine checks the flag before every pivot
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            problem = self.load().to_sparse_problem()
+        except ValueError as e:
+            self.failed.emit("Ошибка", e.args[0])
+            return
+        except OSError as e:
+            self.failed.emit("Ошибка", f"Не удалось прочитать файл:\n{e}")
+            return
+        try:
+            # The default limit is meant for the small tasks of the tableau engines
+            result = solve(problem, max_iterations=10 * (problem.num_vars + problem.num_constraints) + 1000,
+                           engine="revised", presolve=True, should_stop=self._cancelled.is_set,
+                           on_iteration=self.on_iteration)
+        except Exception as e:
+            self.failed.emit("Error", f"An error occurred during the silent simplex method: {e}")
+            return
+        self.solved.emit(problem, result)
+
+    def on_iteration(self, stats):
+        now = time.perf_counter()
+        if now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress.emit(stats.iteration, stats.phase, stats.objective)
+
 
 class SimplexCalculator(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Симплекс Метод Калькулятор v1.4.0")
         self.is_dark_theme = False
+        self.task_file_path = None  # large task file loaded without the editor
+        self.large_task_info = None  # task_info_str of the task solved by large_solver
+        self.large_solver = None
+        self.large_solver_thread = None
         self.initUI()
 
     def initUI(self):
@@ -45,7 +108,8 @@ class SimplexCalculator(QWidget):
                             "Первая строка: кол-во_переменных кол-во_уравнений\n"
                             "Вторая строка: коэфф. целевой функции и min/max\n"
                             "Далее ограничения: коэфф., знак (<=, =, >=), правая часть.\n"
-                            "Поддержка ввода чисел: целые, десятичные (2.5), дроби (3/2).")
+                            "Поддержка ввода чисел: целые, десятичные (2.5), дроби (3/2).\n"
+                            "Разреженная запись: пары номер:коэфф. (напр. 1:2 x5:-3/2 <= 4).")
         text_layout.addWidget(info_label)
 
         self.text_edit = QPlainTextEdit()
@@ -61,6 +125,20 @@ class SimplexCalculator(QWidget):
         h_layout.addWidget(self.solve_text_button)
 
         text_layout.addLayout(h_layout)
+
+        # Progress of a large task solved on a worker thread
+        self.text_progress_layout = QHBoxLayout()
+        self.text_progress_bar = QProgressBar()
+        self.text_progress_bar.setRange(0, 0)  # busy indicator, the number of iterations is not known
+        self.text_progress_label = QLabel()
+        self.text_cancel_button = QPushButton("Отменить")
+        self.text_cancel_button.clicked.connect(self.cancel_large_task)
+        self.text_progress_layout.addWidget(self.text_progress_bar)
+        self.text_progress_layout.addWidget(self.text_progress_label)
+        self.text_progress_layout.addWidget(self.text_cancel_button)
+        text_layout.addLayout(self.text_progress_layout)
+        self.set_text_progress_visible(False)
+
         self.tab_widget.addTab(text_mode_widget, "Текстовый режим")
 
         main_layout = QVBoxLayout()
@@ -339,17 +417,7 @@ class SimplexCalculator(QWidget):
             goal_values = [parse_input_number(field.text()) if field.text() else 0.0 for field in self.goal_inputs]
             goal_type_selected = self.goal_type.currentText().lower()
 
-            # Handle goal function based on selection
-            if goal_type_selected == "min":
-                # For minimization, set F row as 0 - (original goal function)
-                # E.g., min X2 - X1 → F = 0 - (X1 - X2) = -X1 + X2
-                adjusted_goal_values = [-val for val in goal_values]
-            elif goal_type_selected == "max":
-                # For maximization, convert to minimization by negating coefficients
-                # F row will be 0 - (-original) = +original
-                # E.g., max 2X1 + 3X2 → F = 0 - (-2X1 -3X2) = 2X1 +3X2
-                adjusted_goal_values = [val for val in goal_values]
-            else:
+            if goal_type_selected not in ["min", "max"]:
                 QMessageBox.warning(
                     self,
                     "Input Error",
@@ -360,8 +428,6 @@ class SimplexCalculator(QWidget):
             num_vars = self.num_vars_spin.value()
             num_constraints = self.num_constraints_spin.value()
 
-            decision_vars = [f"X{i+1}" for i in range(num_vars)]
-
             constraints = []
             for i in range(num_constraints):
                 layout = self.constraints_layout.itemAt(i).layout()
@@ -394,123 +460,11 @@ class SimplexCalculator(QWidget):
 
                 constraints.append((coeffs, relation, rhs_value))
 
-            basic_vars = {}
-            added_basic_vars = set()
-
-            for idx, (coeffs, relation, rhs) in enumerate(constraints):
-                if relation == "=":
-                    # Check for decision variables with coefficient 1 or -1
-                    basic_var_candidates = [var for var, coef in zip(decision_vars, coeffs) if abs(coef) == 1.0]
-
-                    # Further filter candidates by checking uniqueness across constraints
-                    valid_candidates = []
-                    for var in basic_var_candidates:
-                        var_index = decision_vars.index(var)
-                        appears_in_other_constraints = False
-                        for other_idx, (other_coeffs, _, _) in enumerate(constraints):
-                            if other_idx != idx and other_coeffs[var_index] != 0.0:
-                                appears_in_other_constraints = True
-                                break
-                        if not appears_in_other_constraints:
-                            valid_candidates.append(var)
-
-                    if len(valid_candidates) == 1:
-                        basic_var = valid_candidates[0]
-                        basic_vars[idx] = basic_var
-                    elif len(valid_candidates) > 1:
-                        basic_var = valid_candidates[0]
-                        basic_vars[idx] = basic_var
-                        QMessageBox.information(
-                            self,
-                            "Базисная переменная выбрана автоматически",
-                            f"Для ограничения {idx + 1} было выбрано {basic_var} как базисная переменная."
-                        )
-                    else:
-                        reply = QMessageBox.question(
-                            self,
-                            "Отсутствует базисная переменная",
-                            f"В ограничении {idx + 1} нет переменной с коэффициентом 1 или -1, которая уникальна.\n"
-                            "Хотите автоматически добавить новую базисную переменную?",
-                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                            QMessageBox.StandardButton.Yes
-                        )
-                        if reply == QMessageBox.StandardButton.Yes:
-                            # Automatically assign a new basic variable
-                            next_num = num_vars + len(added_basic_vars) + 1
-                            new_basic_var = f"X{next_num}"
-                            basic_vars[idx] = new_basic_var
-                            added_basic_vars.add(new_basic_var)
-                            # Inform the user
-                            QMessageBox.information(
-                                self,
-                                "Добавлена новая базисная переменная",
-                                f"Базисная переменная {new_basic_var} была автоматически добавлена для ограничения {idx + 1}."
-                            )
-                        else:
-                            # User chooses to go back and edit constraints
-                            QMessageBox.information(
-                                self,
-                                "Редактирование ограничений",
-                                "Пожалуйста, отредактируйте ограничения, чтобы каждая базисная переменная была уникальной и имела коэффициент 1 или -1."
-                            )
-                            return
-                elif relation in ["≤", "≥"]:
-                    next_num = num_vars + len(added_basic_vars) + 1
-                    new_basic_var = f"X{next_num}"
-                    basic_vars[idx] = new_basic_var
-                    added_basic_vars.add(new_basic_var)
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Input Error",
-                        f"Уравнение {idx + 1} имеет недопустимое отношение."
-                    )
-                    return
-
-            final_decision_vars = [var for var in decision_vars if var not in basic_vars.values()]
-
-            if len(final_decision_vars) < len(decision_vars):
-                QMessageBox.information(
-                    self,
-                    "Исключение базисных переменных",
-                    "Некоторые переменные были автоматически исключены из целевой функции, так как они являются базисными переменными."
-                )
-
-            tableau_data = []
-            row_names = []
-
-            for idx, (coeffs, relation, rhs) in enumerate(constraints):
-                basic_var = basic_vars[idx]
-                row_names.append(basic_var)
-
-                adjusted_rhs = rhs
-                adjusted_coeffs = coeffs.copy()
-
-                if relation == "≥":
-                    adjusted_coeffs = [-c for c in adjusted_coeffs]
-                    adjusted_rhs = -rhs
-
-                row = [Fraction(adjusted_rhs)]
-                for var in final_decision_vars:
-                    var_index = decision_vars.index(var)
-                    coef = adjusted_coeffs[var_index] if var_index < len(adjusted_coeffs) else 0.0
-                    row.append(Fraction(coef))
-                tableau_data.append(row)
-
-            objective_row = [Fraction(0)]  # 0 for Si
-            for var in final_decision_vars:
-                var_index = decision_vars.index(var)
-                coef = adjusted_goal_values[var_index]
-                objective_row.append(Fraction(coef))
-            row_names.append("F")
-            tableau_data.append(objective_row)
-
-            columns = ["Si"] + final_decision_vars
-
-            df = DataFrame(tableau_data, columns=columns, index=row_names)
-
-            copy_basic_vars = row_names[:-1]
-            copy_non_basic_vars = columns[1:]
+            # Equality rows without a suitable basic variable get an artificial one, removed in phase 1
+            problem = SimplexProblem(num_vars, goal_values, goal_type_selected, constraints)
+            df, copy_basic_vars, copy_non_basic_vars = build_tableau(problem)
+            copy_artificial_vars = artificial_vars([relation for _, relation, _ in constraints], copy_basic_vars,
+                                                   num_vars)
             maximization_flag = True if goal_type_selected == "max" else False
 
             terms = []
@@ -580,9 +534,16 @@ class SimplexCalculator(QWidget):
                 task_info += f"{constraint_str}\n"
 
             # Display the initial tableau in the solution window
+            last_optimal = None
+            if hasattr(self, 'solution_window'):
+                # The old window is replaced, its worker thread must not outlive it
+                self.solution_window.stop_solving()
+                # Its optimal basis is reused if only right-hand sides or goal coefficients were edited
+                last_optimal = self.solution_window.last_optimal
             self.solution_window = SimplexSolutionWindow(dark_theme=self.is_dark_theme, task_info=task_info,
                                                          original_constraints=constraints, num_vars=num_vars)
-            self.solution_window.add_step(df, copy_basic_vars, copy_non_basic_vars, is_maximization=maximization_flag)
+            self.solution_window.add_step(df, copy_basic_vars, copy_non_basic_vars, is_maximization=maximization_flag,
+                                          last_optimal=last_optimal, artificial_vars=copy_artificial_vars)
             self.solution_window.show()
 
         except ValueError as e:
@@ -661,11 +622,20 @@ class SimplexCalculator(QWidget):
             self,
             "Сохранить задачу",
             QDir.homePath() + "/" + default_filename,
-            "Text Files (*.txt);;All Files (*)"
+            TASK_FILE_FILTER
         )
         if not filepath:
             return  # user canceled
 
+        if filepath.lower().endswith(".smpx"):
+            try:
+                problem = SimplexProblem(num_vars, goal_values, goal_type_selected, constraints)
+                write_task_binary(TaskArrays.from_problem(problem), filepath)
+                QMessageBox.information(self, "Успех", f"Задача сохранена в файл:\n{filepath}")
+            except Exception as e:
+                QMessageBox.warning(self, "Ошибка записи файла", f"Не удалось записать файл:\n{e}")
+            return
+
         # Write to file
         try:
             with open(filepath, "w", encoding="utf-8") as f:
@@ -717,170 +687,61 @@ class SimplexCalculator(QWidget):
             QMessageBox.warning(self, "Ошибка записи файла", f"Не удалось записать файл:\n{e}")
 
     def load_task_from_file(self):
-        filepath, _ = QFileDialog.getOpenFileName(self, "Выбрать файл с задачей", QDir.homePath(), "Text Files (*.txt);;All Files (*)")
+        filepath, _ = QFileDialog.getOpenFileName(self, "Выбрать файл с задачей", QDir.homePath(), TASK_FILE_FILTER)
         if filepath:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
+            size = path.getsize(filepath)
+            if size > EDITOR_SIZE_LIMIT:
+                self.task_file_path = filepath
+                self.text_edit.clear()
+                self.text_edit.setPlaceholderText(
+                    f"Файл {path.basename(filepath)} ({size / (1024 * 1024):.1f} МБ) слишком большой для редактора.\n"
+                    f"Нажмите «Решить», чтобы решить задачу прямо из файла, или введите другую задачу.")
+                return
+            self.task_file_path = None
+            self.text_edit.setPlaceholderText("")
+            if is_task_binary(filepath):
+                try:
+                    content = format_task_arrays(read_task_binary(filepath))
+                except ValueError as e:
+                    QMessageBox.warning(self, "Ошибка", e.args[0])
+                    return
+            else:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    content = f.read()
             self.text_edit.setPlainText(content)
 
     def solve_text_mode(self):
-        text = self.text_edit.toPlainText().strip()
-        if not text:
-            QMessageBox.warning(self, "Ошибка", "Текст задачи пуст.")
-            return
-
-        lines = text.split('\n')
-        if len(lines) < 2:
-            QMessageBox.warning(self, "Ошибка", "Недостаточно строк.")
-            return
-
-        first_line = lines[0].strip().split()
-        if len(first_line) != 2:
-            QMessageBox.warning(self, "Ошибка", "Первая строка: 2 числа (переменные и ограничения).")
+        text = self.text_edit.toPlainText()
+        if self.task_file_path and not text.strip():
+            filepath = self.task_file_path
+            self.solve_large_task(lambda: load_task_file(filepath), f"Задача из файла: {filepath}\n")
             return
-
         try:
-            num_vars = int(first_line[0])
-            num_constraints = int(first_line[1])
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Первая строка нечисловая.")
+            arrays = read_task_arrays(text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", e.args[0])
             return
 
+        num_vars = arrays.num_vars
+        num_constraints = arrays.num_constraints
         if num_vars > 25 or num_constraints > 25:
-            QMessageBox.warning(self, "Отказ", "Не больше 25 переменных и уравнений")
-
-        second_line = lines[1].strip().split()
-        if len(second_line) != (num_vars+1):
-            QMessageBox.warning(self, "Ошибка", "Вторая строка: коэфф. + min/max")
+            # Too large for the exact tableau on the GUI thread. The size line is written by on_large_task_solved
+            self.solve_large_task(lambda: arrays, format_task_arrays(arrays).split("\n", 1)[1])
             return
+        problem = arrays.to_problem()
 
-        goal_values_str = second_line[:num_vars]
-        goal_type_str = second_line[num_vars].lower()
-        if goal_type_str not in ["min","max"]:
-            QMessageBox.warning(self,"Ошибка","Должно быть min или max в конце второй строки.")
-            return
+        goal_values = problem.goal_values
+        goal_type_str = problem.goal_type
+        constraints = problem.constraints
 
-        goal_values = []
-        for gs in goal_values_str:
-            try:
-                val = parse_input_number(gs)
-                goal_values.append(val)
-            except ValueError as e:
-                QMessageBox.warning(self, "Ошибка", e.args[0])
-                return
+        is_max = problem.is_maximization
 
-        if len(lines)<2+num_constraints:
-            QMessageBox.warning(self,"Ошибка","Ограничений меньше, чем указано.")
+        try:
+            result = solve(problem, presolve=True)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"An error occurred during the silent simplex method: {e}")
             return
 
-        allowed_relations = {"<":"≤","<=":"≤",">":"≥",">=":"≥","=":"="}
-        constraints = []
-        from_line = 2
-        for i in range(num_constraints):
-            line = lines[from_line+i].strip().split()
-            if len(line)!=(num_vars+2):
-                QMessageBox.warning(self,"Ошибка",f"Огр. {i+1} неверный формат.")
-                return
-            coeffs_str = line[:num_vars]
-            relation_str = line[num_vars]
-            rhs_str = line[num_vars+1]
-            if relation_str not in allowed_relations:
-                QMessageBox.warning(self,"Ошибка",f"Неверный знак в огр. {i+1}")
-                return
-            relation = allowed_relations[relation_str]
-
-            coeffs=[]
-            try:
-                for cs in coeffs_str:
-                    c=parse_input_number(cs)
-                    coeffs.append(c)
-                rhs_val = parse_input_number(rhs_str)
-                constraints.append((coeffs, relation, rhs_val))
-            except ValueError as e:
-                QMessageBox.warning(self, "Ошибка", e.args[0])
-                return
-
-
-        num_vars_i = num_vars
-        decision_vars = [f"X{i+1}" for i in range(num_vars_i)]
-        goal_type_selected = goal_type_str
-        if goal_type_selected=="min":
-            adjusted_goal_values = [-val for val in goal_values]
-        else:
-            adjusted_goal_values = [val for val in goal_values]
-
-
-        basic_vars = {}
-        added_basic_vars = set()
-        for idx,(coeffs,relation,rhs) in enumerate(constraints):
-            if relation=="=":
-                basic_var_candidates=[var for var,coef in zip(decision_vars,coeffs) if abs(coef)==1.0]
-                valid_candidates=[]
-                for var in basic_var_candidates:
-                    var_index=decision_vars.index(var)
-                    appears_in_others=False
-                    for other_idx,(other_coeffs,_,_) in enumerate(constraints):
-                        if other_idx!=idx and other_coeffs[var_index]!=0.0:
-                            appears_in_others=True
-                            break
-                    if not appears_in_others:
-                        valid_candidates.append(var)
-                if len(valid_candidates)==1:
-                    basic_vars[idx]=valid_candidates[0]
-                elif len(valid_candidates)>1:
-                    basic_vars[idx]=valid_candidates[0]
-
-                else:
-                    next_num=num_vars_i+len(added_basic_vars)+1
-                    new_basic_var = f"X{next_num}"
-                    basic_vars[idx]=new_basic_var
-                    added_basic_vars.add(new_basic_var)
-            elif relation in ["≤","≥"]:
-                next_num=num_vars_i+len(added_basic_vars)+1
-                new_basic_var=f"X{next_num}"
-                basic_vars[idx]=new_basic_var
-                added_basic_vars.add(new_basic_var)
-            else:
-                QMessageBox.warning(self,"Ошибка",f"Неверное отношение {relation}")
-                return
-
-        final_decision_vars=[var for var in decision_vars if var not in basic_vars.values()]
-
-
-        tableau_data=[]
-        row_names=[]
-        for idx,(coeffs,relation,rhs) in enumerate(constraints):
-            basic_var=basic_vars[idx]
-            row_names.append(basic_var)
-            adjusted_rhs=rhs
-            adjusted_coeffs=coeffs.copy()
-            if relation=="≥":
-                adjusted_coeffs = [-c for c in adjusted_coeffs]
-                adjusted_rhs=-rhs
-            row=[Fraction(adjusted_rhs)]
-            for var in final_decision_vars:
-                var_index=decision_vars.index(var)
-                coef= adjusted_coeffs[var_index] if var_index<len(adjusted_coeffs) else 0.0
-                row.append(Fraction(coef))
-            tableau_data.append(row)
-
-        objective_row=[Fraction(0)]
-        for var in final_decision_vars:
-            var_index=decision_vars.index(var)
-            coef=adjusted_goal_values[var_index]
-            objective_row.append(Fraction(coef))
-        row_names.append("F")
-        tableau_data.append(objective_row)
-
-        columns=["Si"]+final_decision_vars
-        df=DataFrame(tableau_data,columns=columns,index=row_names)
-
-        is_max=(goal_type_selected=="max")
-
-        sw=SimplexSolutionWindow(dark_theme=self.is_dark_theme,task_info="From Text Mode",
-                                 original_constraints=constraints, num_vars=num_vars)
-        final_df, final_basic_vars, final_non_basic_vars, elapsed_time, status = sw.run_simplex_silently(df,row_names[:-1],final_decision_vars,is_max)
-
         reverse_relations = {"≤": "<=", "≥": ">=", "=": "="}
         task_info_str = f"{num_vars} {num_constraints}\n"
         # goal line
@@ -907,23 +768,84 @@ class SimplexCalculator(QWidget):
             rel_str = reverse_relations[relation]
             task_info_str += " ".join(c_strs) + f" {rel_str} {rhs_str}\n"
 
+        self.show_text_mode_result(result, task_info_str, is_max)
+
+    def solve_large_task(self, load, task_text):
+        """
+        Solve the task of load() on a worker thread, the result is shown by on_large_task_solved.
+        task_text is written before the answer when it is saved, after the task size.
+        """
+        self.solve_text_button.setEnabled(False)
+        self.large_task_info = task_text
+        self.large_solver_thread = QThread()
+        self.large_solver = LargeTaskWorker(load)
+        self.large_solver.moveToThread(self.large_solver_thread)
+        self.large_solver_thread.started.connect(self.large_solver.run)
+        self.large_solver.progress.connect(self.show_text_progress)
+        self.large_solver.solved.connect(self.on_large_task_solved)
+        self.large_solver.failed.connect(self.on_large_task_failed)
+        self.large_solver.solved.connect(self.large_solver_thread.quit)
+        self.large_solver.failed.connect(self.large_solver_thread.quit)
+        self.large_solver_thread.finished.connect(self.on_large_task_thread_finished)
+        self.text_progress_label.setText("Чтение задачи...")
+        self.set_text_progress_visible(True)
+        self.large_solver_thread.start()
+
+    def show_text_progress(self, iteration, phase, objective):
+        if phase == 1:
+            self.text_progress_label.setText(f"Итерация {iteration}, фаза 1: сумма искусственных переменных = "
+                                             f"{objective:.6g}")
+        else:
+            self.text_progress_label.setText(f"Итерация {iteration}, F = {objective:.6g}")
+
+    def set_text_progress_visible(self, visible):
+        self.text_progress_bar.setVisible(visible)
+        self.text_progress_label.setVisible(visible)
+        self.text_cancel_button.setVisible(visible)
+        self.text_cancel_button.setEnabled(visible)
+
+    def cancel_large_task(self):
+        if self.large_solver is not None:
+            self.large_solver.cancel()
+            self.text_cancel_button.setEnabled(False)
+            self.text_progress_label.setText("Отмена...")
+
+    def on_large_task_solved(self, problem, result):
+        # A task file is not written out again, the saved answer refers to its file
+        task_info_str = f"{problem.num_vars} {problem.num_constraints}\n{self.large_task_info}"
+        self.show_text_mode_result(result, task_info_str, problem.is_maximization)
+
+    def on_large_task_failed(self, title, message):
+        QMessageBox.warning(self, title, message)
+
+    def on_large_task_thread_finished(self):
+        self.set_text_progress_visible(False)
+        self.solve_text_button.setEnabled(True)
+        self.large_solver = None
+        self.large_solver_thread = None
+        self.large_task_info = None
+
+    def closeEvent(self, event):
+        # The thread must not outlive the window, a running solve is cancelled first and its
+        # answer is not shown any more
+        if self.large_solver_thread is not None:
+            self.large_solver.solved.disconnect(self.on_large_task_solved)
+            self.large_solver.failed.disconnect(self.on_large_task_failed)
+            self.large_solver.cancel()
+            self.large_solver_thread.quit()
+            self.large_solver_thread.wait()
+        super().closeEvent(event)
+
+    def show_text_mode_result(self, result, task_info_str, is_max):
+        status = result.status
         if status == "optimal":
-            F_row_index = len(final_df.index) - 1
-            optimal_value = final_df.iloc[F_row_index, 0]
-            if is_max:
-                optimal_value = optimal_value * -1
-
-            variable_values = {}
-            for i, var in enumerate(final_basic_vars):
-                val = final_df.iloc[i, 0]
-                variable_values[var] = val
-            for var in final_non_basic_vars:
-                variable_values[var] = Fraction(0)
-
-            result_str = f"Оптимальное значение (F): {optimal_value}\n\nОптимальное решение:\n"
-            for var in sorted(variable_values.keys()):
-                result_str += f"{var} = {variable_values[var]}\n"
-            result_str += f"\nВремя вычисления: {elapsed_time:.10f} секунд"
+            optimal_value = result.optimal_value
+            variable_values = result.variable_values
+
+            lines = [f"Оптимальное значение (F): {optimal_value}\n\nОптимальное решение:"]
+            lines.extend(f"{var} = {variable_values[var]}" for var in sorted(variable_values.keys()))
+            lines.append(f"\nВремя вычисления: {result.elapsed_time:.10f} секунд")
+            result_str = "\n".join(lines)
 
             QMessageBox.information(self, "Результат", result_str)
 
@@ -932,6 +854,8 @@ class SimplexCalculator(QWidget):
             QMessageBox.information(self, "Результат", "Нет решения для данной задачи.")
         elif status == "iteration_limit":
             QMessageBox.information(self, "Результат", "Достигнут предел итераций без нахождения оптимума.")
+        elif status == "cancelled":
+            QMessageBox.information(self, "Результат", "Вычисление отменено.")
 
     def save_text_mode_solution(self, task_info_str, solution_str, is_max):
         """
@@ -1039,80 +963,6 @@ class SimplexCalculator(QWidget):
             return f"{val}{decimal_part}"
 
 
-def parse_input_number(text):
-    text = text.strip()
-    if not text:
-        return Fraction(0)
-
-    if 'x' in text.lower():
-        raise ValueError(f"Текстовый режим не позволяет вводить имена переменных: '{text}'")
-
-    # Replace comma with dot for decimals
-    text = text.replace(',', '.')
-
-    if '/' in text:
-        parts = text.split('/')
-        if len(parts) != 2:
-            raise ValueError(f"Неверный формат дроби: {text}")
-
-        num_str, den_str = parts
-
-        if '.' in num_str or '.' in den_str:
-            raise ValueError("Дроби должны быть только с целыми числами (напр. '3/2', нет '3.5/2').")
-
-        try:
-            numerator = int(num_str)
-            denominator = int(den_str)
-        except ValueError:
-            raise ValueError(f"Не целые числа в дроби: {text}")
-
-        if denominator == 0:
-            raise ValueError("Деление на ноль в дроби")
-
-        return Fraction(numerator, denominator)
-    else:
-        if '.' in text:
-            # Decimal number, convert to fraction by counting decimals
-            # e.g. 2.1 => integral:2, decimal:1 digit -> 2.1 = 21/10
-            # e.g. -3.25 => -3 and 25 -> numerator = (-3)*100 + 25 = -300+25 = -275/100
-            sign = 1
-            if text.startswith('-'):
-                sign = -1
-                text = text[1:]
-
-            integral_str, decimal_str = text.split('.')
-            if not integral_str:
-                integral_str = '0'
-            try:
-                integral_part = int(integral_str)
-            except ValueError:
-                raise ValueError(f"Invalid integral part: {integral_str}")
-
-            if not decimal_str.isdigit():
-                raise ValueError(f"Invalid decimal part: {decimal_str}")
-
-            decimal_length = len(decimal_str)
-            denominator = 10**decimal_length
-            numerator = integral_part * denominator + int(decimal_str)
-            numerator *= sign
-
-            return Fraction(numerator, denominator)
-        else:
-            # Pure integer
-            try:
-                val = int(text)  # If user typed something like '2' or '-3'
-                return Fraction(val)
-            except ValueError:
-                raise ValueError(f"Invalid integer: {text}")
-
-
-def format_task_number(num):
-    if num.denominator == 1:
-        return str(num.numerator)
-    else:
-        return f"{num.numerator}/{num.denominator}"
-
-
 if __name__ == "__main__":
     APP_PATH = ""
     if getattr(sys, "frozen", False):
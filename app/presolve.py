@@ -0,0 +1,266 @@
+# presolve.py
+#
+# Presolve pass run before the engines. Rows and columns that can be decided without
+# pivoting are removed or folded into bounds, and postsolve maps the answer of the reduced
+# problem back to X1..Xn of the original one.
+
+from fractions import Fraction
+import time
+
+from pandas import DataFrame
+
+from simplex_engine import SimplexProblem, SimplexResult
+from sparse_problem import CSRMatrix, SparseProblem
+
+FLIPPED_RELATIONS = {"≤": "≥", "≥": "≤", "=": "="}
+
+
+class PresolvedProblem:
+    """
+    Result of presolve_problem.
+    problem: the reduced problem of the same kind as the original one, None if presolve
+        already found that there is no solution
+    columns: original index of every variable of the reduced problem
+    fixed: {original index: value} of the removed variables
+    lower: lower bound of every original variable, the reduced variables are shifted by it
+    offset: goal value of the fixed variables and the shifts
+    """
+
+    def __init__(self, original, problem, columns, fixed, lower, offset, elapsed_time):
+        self.original = original
+        self.problem = problem
+        self.columns = columns
+        self.fixed = fixed
+        self.lower = lower
+        self.offset = offset
+        self.elapsed_time = elapsed_time
+
+    @property
+    def removed_rows(self):
+        kept = self.problem.num_constraints if self.problem is not None else 0
+        return self.original.num_constraints - kept
+
+    @property
+    def removed_columns(self):
+        return len(self.fixed)
+
+    def postsolve(self, result=None):
+        """
+        SimplexResult of the original problem from the result of the reduced one, whose
+        tableau_df holds only the Si column with the values of X1..Xn and F.
+        result=None gives the "no_solution" answer found by presolve.
+        """
+        if result is None:
+            return SimplexResult("no_solution", self._tableau([Fraction(0)] * self.original.num_vars, Fraction(0)),
+                                 [f"X{j + 1}" for j in range(self.original.num_vars)], [], self.elapsed_time, 0,
+                                 self.original.is_maximization)
+
+        reduced_values = result.variable_values
+        values = [Fraction(0)] * self.original.num_vars
+        for j, value in self.fixed.items():
+            values[j] = value
+        for k, j in enumerate(self.columns):
+            values[j] = add_exact(reduced_values.get(f"X{k + 1}", Fraction(0)), self.lower[j])
+        objective = add_exact(result.optimal_value, self.offset)
+        return SimplexResult(result.status, self._tableau(values, objective),
+                             [f"X{j + 1}" for j in range(self.original.num_vars)], [],
+                             result.elapsed_time + self.elapsed_time, result.iterations,
+                             self.original.is_maximization)
+
+    def _tableau(self, values, objective):
+        # The F row holds the minimized value, like in the engines
+        F = -objective if self.original.is_maximization else objective
+        return DataFrame({"Si": list(values) + [F]},
+                         index=[f"X{j + 1}" for j in range(self.original.num_vars)] + ["F"])
+
+
+def add_exact(value, delta):
+    # Float engines give NumPy floats, which cannot be added to a Fraction
+    if isinstance(value, Fraction) or isinstance(value, int):
+        return value + delta
+    return value + float(delta)
+
+
+def problem_rows(problem):
+    """
+    Constraints of a SimplexProblem or SparseProblem as ({column: coefficient}, relation, rhs)
+    without zero coefficients.
+    """
+    if isinstance(problem, SparseProblem):
+        for i in range(problem.num_constraints):
+            cols, values = problem.matrix.row(i)
+            yield ({int(j): Fraction(value) for j, value in zip(cols, values) if value != 0},
+                   problem.relations[i], Fraction(problem.rhs[i]))
+    else:
+        for coeffs, relation, rhs in problem.constraints:
+            yield ({j: Fraction(coef) for j, coef in enumerate(coeffs[:problem.num_vars]) if coef != 0},
+                   relation, Fraction(rhs))
+
+
+def holds(lhs, relation, rhs):
+    if relation == "≤":
+        return lhs <= rhs
+    if relation == "≥":
+        return lhs >= rhs
+    return lhs == rhs
+
+
+def merge_parallel_rows(rows):
+    """
+    Fold rows with proportional coefficients into one row, or into a pair of ≤ and ≥ rows.
+    Every row is scaled so its first coefficient is 1, rows with the same coefficients then
+    bound the same expression from above and below and only the tightest bounds are kept.
+    Returns (rows, merged), rows is None if the bounds contradict each other.
+    """
+    groups = {}
+    for coeffs, relation, rhs in rows:
+        first = coeffs[min(coeffs)]
+        if first < 0:
+            relation = FLIPPED_RELATIONS[relation]
+        normalized = {j: value / first for j, value in coeffs.items()}
+        rhs = rhs / first
+        key = tuple(sorted(normalized.items()))
+        if key not in groups:
+            groups[key] = [normalized, None, None, 0]
+        group = groups[key]
+        group[3] += 1
+        if relation in ["≥", "="]:
+            group[1] = rhs if group[1] is None else max(group[1], rhs)
+        if relation in ["≤", "="]:
+            group[2] = rhs if group[2] is None else min(group[2], rhs)
+
+    merged = False
+    new_rows = []
+    for coeffs, low, high, count in groups.values():
+        if low is not None and high is not None:
+            if low > high:
+                return None, True
+            if low == high:
+                new_rows.append((coeffs, "=", low))
+                merged = merged or count > 1
+                continue
+        if high is not None:
+            new_rows.append((coeffs, "≤", high))
+        if low is not None:
+            new_rows.append((coeffs, "≥", low))
+        merged = merged or count > (high is not None) + (low is not None)
+    return new_rows, merged
+
+
+def presolve_problem(problem):
+    """
+    Reduce a SimplexProblem or SparseProblem before solving. Repeated until nothing changes:
+    - empty rows are checked and removed,
+    - singleton rows become lower and upper bounds of their variable,
+    - variables whose bounds meet are fixed and substituted,
+    - a dominated variable, one whose goal term and constraints never get worse when it
+      moves towards its lower (or finite upper) bound, is fixed at that bound,
+    - rows with proportional coefficients are folded into the tightest bounds.
+    The kept variables are shifted by their lower bounds, finite upper bounds come back
+    as singleton ≤ rows. Returns a PresolvedProblem.
+    """
+    start_time = time.perf_counter()
+    num_vars = problem.num_vars
+    goal = [Fraction(value) for value in problem.goal_values]
+    # Goal coefficients of the minimized form
+    cost = [-value for value in goal] if problem.is_maximization else goal
+    lower = [Fraction(0)] * num_vars
+    upper = [None] * num_vars
+    fixed = {}
+    offset = Fraction(0)
+    rows = list(problem_rows(problem))
+
+    def infeasible():
+        return PresolvedProblem(problem, None, [], fixed, lower, offset, time.perf_counter() - start_time)
+
+    changed = True
+    while changed:
+        changed = False
+
+        kept_rows = []
+        for coeffs, relation, rhs in rows:
+            if not coeffs:
+                if not holds(Fraction(0), relation, rhs):
+                    return infeasible()
+                changed = True
+                continue
+            if len(coeffs) == 1:
+                (j, coef), = coeffs.items()
+                bound = rhs / coef
+                if coef < 0:
+                    relation = FLIPPED_RELATIONS[relation]
+                if relation in ["≥", "="]:
+                    lower[j] = max(lower[j], bound)
+                if relation in ["≤", "="]:
+                    upper[j] = bound if upper[j] is None else min(upper[j], bound)
+                changed = True
+                continue
+            kept_rows.append((coeffs, relation, rhs))
+        rows = kept_rows
+
+        # Directions a variable can move in without making any row worse
+        can_decrease = [True] * num_vars
+        can_increase = [True] * num_vars
+        for coeffs, relation, _ in rows:
+            for j, coef in coeffs.items():
+                if relation == "=" or (relation == "≤") == (coef < 0):
+                    can_decrease[j] = False
+                if relation == "=" or (relation == "≤") == (coef > 0):
+                    can_increase[j] = False
+
+        fix = {}
+        for j in range(num_vars):
+            if j in fixed:
+                continue
+            if upper[j] is not None and upper[j] < lower[j]:
+                return infeasible()
+            if upper[j] == lower[j]:
+                fix[j] = lower[j]
+            elif cost[j] >= 0 and can_decrease[j]:
+                fix[j] = lower[j]
+            elif cost[j] <= 0 and upper[j] is not None and can_increase[j]:
+                fix[j] = upper[j]
+
+        if fix:
+            changed = True
+            fixed.update(fix)
+            offset += sum(goal[j] * value for j, value in fix.items())
+            rows = [({j: coef for j, coef in coeffs.items() if j not in fix}, relation,
+                     rhs - sum(coef * fix[j] for j, coef in coeffs.items() if j in fix))
+                    for coeffs, relation, rhs in rows]
+            # Rows emptied by the substitution are checked on the next pass
+            if any(not coeffs for coeffs, _, _ in rows):
+                continue
+
+        rows, merged = merge_parallel_rows(rows)
+        if rows is None:
+            return infeasible()
+        changed = changed or merged
+
+    columns = [j for j in range(num_vars) if j not in fixed]
+    new_index = {j: k for k, j in enumerate(columns)}
+    offset += sum(goal[j] * lower[j] for j in columns)
+    reduced_rows = []
+    for coeffs, relation, rhs in rows:
+        rhs -= sum(coef * lower[j] for j, coef in coeffs.items())
+        reduced_rows.append(({new_index[j]: coef for j, coef in coeffs.items()}, relation, rhs))
+    for j in columns:
+        if upper[j] is not None:
+            reduced_rows.append(({new_index[j]: Fraction(1)}, "≤", upper[j] - lower[j]))
+
+    reduced_goal = [goal[j] for j in columns]
+    if isinstance(problem, SparseProblem):
+        matrix = CSRMatrix.from_rows(((sorted(coeffs), [coeffs[j] for j in sorted(coeffs)])
+                                      for coeffs, _, _ in reduced_rows), len(columns))
+        reduced = SparseProblem(len(columns), reduced_goal, problem.goal_type, matrix,
+                                [relation for _, relation, _ in reduced_rows], [rhs for _, _, rhs in reduced_rows])
+    else:
+        constraints = []
+        for coeffs, relation, rhs in reduced_rows:
+            dense = [Fraction(0)] * len(columns)
+            for k, coef in coeffs.items():
+                dense[k] = coef
+            constraints.append((dense, relation, rhs))
+        reduced = SimplexProblem(len(columns), reduced_goal, problem.goal_type, constraints)
+
+    return PresolvedProblem(problem, reduced, columns, fixed, lower, offset, time.perf_counter() - start_time)
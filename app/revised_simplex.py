@@ -0,0 +1,529 @@
+# revised_simplex.py
+#
+# Revised simplex engine for large problems. Instead of updating the whole tableau on
+# every pivot it keeps a factorization of the basis and computes only the pieces of the
+# tableau that the pivot rules look at: the Si column, one row, one column and the F row.
+# The pivot rules are the same as in simplex_engine.select_pivot, so the engine follows
+# the same path as the tableau engines.
+
+import time
+
+import numpy as np
+from pandas import DataFrame
+
+from pricing import make_pricing
+from scaling import scale_factors
+from simplex_engine import (SimplexResult, IterationStats, FEASIBILITY_TOLERANCE, STALL_LIMIT, artificial_vars,
+                            variable_numbers)
+from sparse_problem import CSRMatrix, SparseProblem
+from tableau import SimplexError
+
+# Columns of the basis factorization handled per step of lu_factor and lu_solve
+LU_BLOCK_SIZE = 32
+
+
+def lu_factor(K, block_size=LU_BLOCK_SIZE):
+    """
+    LU factorization of the square matrix K with partial pivoting, K[perm] = L U.
+    Returns (LU, perm, blocks): the strictly lower triangle of LU is L without its unit diagonal,
+    the rest is U, like the result of LAPACK getrf but with the row swaps applied to perm.
+    Columns are factorized block_size at a time and the rest of the matrix is updated with one
+    matrix product per block. blocks holds (start, end, L_inv, U_inv) of the diagonal blocks of L
+    and U for lu_solve.
+    Raises SimplexError if K is singular.
+    """
+    LU = np.array(K, dtype=float)
+    n = LU.shape[0]
+    perm = np.arange(n)
+    blocks = []
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        for k in range(start, end):
+            p = k + int(np.argmax(np.abs(LU[k:, k])))
+            if LU[p, k] == 0:
+                raise SimplexError("Basis matrix is singular.")
+            if p != k:
+                LU[[k, p]] = LU[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+            LU[k + 1:, k] /= LU[k, k]
+            LU[k + 1:, k + 1:end] -= np.outer(LU[k + 1:, k], LU[k, k + 1:end])
+        L = np.tril(LU[start:end, start:end], -1) + np.eye(end - start)
+        U = np.triu(LU[start:end, start:end])
+        if end < n:
+            LU[start:end, end:] = np.linalg.solve(L, LU[start:end, end:])
+            LU[end:, end:] -= LU[end:, start:end] @ LU[start:end, end:]
+        blocks.append((start, end, np.linalg.inv(L), np.linalg.inv(U)))
+    return LU, perm, blocks
+
+
+def lu_solve(factors, v, trans=False):
+    """
+    Solve K x = v, or K^T x = v if trans, with the factors of lu_factor(K) by block forward
+    and back substitution.
+    """
+    LU, perm, blocks = factors
+    if not trans:
+        # L U x = v[perm]
+        x = np.asarray(v, dtype=float)[perm]
+        for start, end, L_inv, _ in blocks:
+            x[start:end] = L_inv @ x[start:end]
+            x[end:] -= LU[end:, start:end] @ x[start:end]
+        for start, end, _, U_inv in reversed(blocks):
+            x[start:end] = U_inv @ x[start:end]
+            x[:start] -= LU[:start, start:end] @ x[start:end]
+        return x
+    # U^T L^T z = v, then x[perm] = z
+    z = np.array(v, dtype=float)
+    for start, end, _, U_inv in blocks:
+        z[start:end] = U_inv.T @ z[start:end]
+        z[end:] -= LU[start:end, end:].T @ z[start:end]
+    for start, end, L_inv, _ in reversed(blocks):
+        z[start:end] = L_inv.T @ z[start:end]
+        z[:start] -= LU[start:end, :start].T @ z[start:end]
+    x = np.empty(len(perm))
+    x[perm] = z
+    return x
+
+
+class BasisFactorization:
+    """
+    Factorization of the basis B of the matrix [A | I], A is a float CSRMatrix.
+    Basic slack columns are unit vectors, so after permuting rows and columns
+        B = | K  0 |    K = A[bump_rows, struct_cols]
+            | C  I |    C = A[slack_rows, struct_cols]
+    and only the small dense block K has to be factorized, C stays sparse. K is kept as dense LU
+    factors with partial pivoting (see lu_factor), which are never updated: pivots since the last
+    refactorization are kept as product-form eta vectors on top of them, and K is built and
+    factorized again every refactor_frequency pivots.
+    """
+
+    def __init__(self, A, basis, refactor_frequency=64):
+        self.A = A
+        self.At = A.transpose()  # rows of At are the columns of A
+        self.refactor_frequency = refactor_frequency
+        self.refactor(basis)
+
+    def refactor(self, basis):
+        num_rows, num_cols = self.A.shape
+        self.basis = np.array(basis)
+        is_slack = self.basis >= num_cols
+        self.slack_pos = np.flatnonzero(is_slack)
+        self.struct_pos = np.flatnonzero(~is_slack)
+        self.slack_rows = self.basis[self.slack_pos] - num_cols
+        self.struct_cols = self.basis[self.struct_pos]
+        self.bump_rows = np.setdiff1d(np.arange(num_rows), self.slack_rows)
+
+        # Nonzeros of the basic structural columns: row, value and position in struct_cols
+        lengths = self.At.indptr[self.struct_cols + 1] - self.At.indptr[self.struct_cols]
+        nnz = np.concatenate([np.arange(self.At.indptr[j], self.At.indptr[j + 1]) for j in self.struct_cols]) \
+            if len(self.struct_cols) else np.zeros(0, dtype=np.int64)
+        self.S_rows = self.At.indices[nnz]
+        self.S_data = self.At.data[nnz]
+        self.S_owner = np.repeat(np.arange(len(self.struct_cols)), lengths)
+
+        size = len(self.struct_cols)
+        bump_index = np.full(num_rows, -1)
+        bump_index[self.bump_rows] = np.arange(len(self.bump_rows))
+        in_bump = bump_index[self.S_rows] >= 0
+        K = np.zeros((len(self.bump_rows), size))
+        np.add.at(K, (bump_index[self.S_rows[in_bump]], self.S_owner[in_bump]), self.S_data[in_bump])
+        self.K_lu = lu_factor(K)
+        self.etas = []
+
+    def ftran(self, v):
+        """
+        Solve B w = v, w is indexed by basis position.
+        """
+        w = np.empty(len(self.basis))
+        x_struct = lu_solve(self.K_lu, v[self.bump_rows])
+        w[self.struct_pos] = x_struct
+        C_x = np.bincount(self.S_rows, weights=self.S_data * x_struct[self.S_owner], minlength=len(v))
+        w[self.slack_pos] = v[self.slack_rows] - C_x[self.slack_rows]
+        for r, d in self.etas:
+            w_r = w[r] / d[r]
+            w -= d * w_r
+            w[r] = w_r
+        return w
+
+    def btran(self, c):
+        """
+        Solve B^T y = c, c is indexed by basis position and y by row.
+        """
+        c = np.array(c, dtype=float)
+        for r, d in reversed(self.etas):
+            c[r] = (c[r] - d @ c + d[r] * c[r]) / d[r]
+        y = np.zeros(len(self.basis))
+        y[self.slack_rows] = c[self.slack_pos]
+        # Bump rows of y are still zero, so this is C^T * y_slack
+        Ct_y = np.bincount(self.S_owner, weights=self.S_data * y[self.S_rows], minlength=len(self.struct_pos))
+        y[self.bump_rows] = lu_solve(self.K_lu, c[self.struct_pos] - Ct_y, trans=True)
+        return y
+
+    def update(self, pivot_row_index, d, basis):
+        """
+        Record the pivot on position pivot_row_index, d = B^-1 * (entering column).
+        Returns True if the basis was refactored.
+        """
+        self.basis = np.array(basis)
+        self.etas.append((pivot_row_index, d.copy()))
+        if len(self.etas) >= self.refactor_frequency:
+            self.refactor(basis)
+            return True
+        return False
+
+
+def run_revised_simplex(A, b, c, basic_vars, non_basic_vars, is_maximization=False, max_iterations=1000,
+                        feasibility_check=None, tol=1e-9, refactor_frequency=64, pricing="first",
+                        stall_limit=STALL_LIMIT, time_limit=None, basic_cost=None, artificial_vars=None,
+                        scaling=False, should_stop=None, on_iteration=None):
+    """
+    Run the revised simplex method for the tableau with Si column b, coefficients A and F row -c.
+    A is a float CSRMatrix or a dense array.
+    Column j < n of [A | I] is non_basic_vars[j], column n + i is basic_vars[i].
+    basic_cost is the goal coefficient of every basic variable, zero if not given.
+    If feasibility_check(variable_values) returns False, an optimal answer is reported as "no_solution".
+    pricing is a pricing.PRICING_RULES name. Steepest-edge weights start from the exact
+    column norms of the slack basis and are updated with the same recurrence as in the tableau engines.
+    stall_limit, time_limit, should_stop, artificial_vars, scaling and on_iteration work like in
+    simplex_engine.run_simplex, A is scaled with scaling.scale_factors. The ratio test time of
+    on_iteration includes the ftran of the candidate columns.
+    Returns a SimplexResult whose tableau_df holds only the Si column.
+    """
+    start_time = time.perf_counter()
+
+    if not isinstance(A, CSRMatrix):
+        A = CSRMatrix.from_dense(np.asarray(A, dtype=float))
+    b = np.asarray(b, dtype=float)
+    num_rows, num_cols = A.shape
+    cost = np.concatenate([np.asarray(c, dtype=float),
+                           np.zeros(num_rows) if basic_cost is None else np.asarray(basic_cost, dtype=float)])
+    # Value of every column's variable per unit of the scaled one
+    variable_scale = np.ones(num_cols + num_rows)
+    if scaling:
+        row_factors, col_factors = scale_factors(A.row_of_nnz, A.indices, A.data, A.shape)
+        A = A.scale_rows(row_factors).scale_columns(col_factors)
+        b = b * row_factors
+        variable_scale = np.concatenate([col_factors, 1 / row_factors])
+        cost = cost * variable_scale
+    # Artificial columns after phase 1, they read as zero in every tableau row
+    blocked = np.zeros(num_cols + num_rows, dtype=bool)
+
+    basis = np.arange(num_cols, num_cols + num_rows)
+    nonbasic = np.arange(num_cols)  # position j is tableau column j + 1
+    factor = BasisFactorization(A, basis, refactor_frequency)
+    x_B = factor.ftran(b)
+    rule = make_pricing(pricing)
+    rule.start(np.bincount(A.indices, weights=A.data ** 2, minlength=num_cols))
+
+    def column(k):
+        result = np.zeros(num_rows)
+        if k < num_cols:
+            rows, values = factor.At.row(k)
+            result[rows] = values
+        else:
+            result[k - num_cols] = 1
+        return result
+
+    def tableau_row(v):
+        # v^T [A | I] restricted to the non-basic columns, in tableau order
+        row = np.concatenate([A.rmatvec(v), v])[nonbasic]
+        row[blocked[nonbasic]] = 0
+        return row
+
+    def pivot_row_of(r):
+        unit = np.zeros(num_rows)
+        unit[r] = 1
+        return tableau_row(factor.btran(unit))
+
+    ratio_test_time = 0
+
+    def timed_ftran(k):
+        # ftran of a candidate column, counted as part of the ratio test
+        nonlocal ratio_test_time
+        start = time.perf_counter()
+        d = factor.ftran(column(k))
+        ratio_test_time += time.perf_counter() - start
+        return d
+
+    def min_ratio_row(d, row_priority=None):
+        nonlocal ratio_test_time
+        start = time.perf_counter()
+        try:
+            return ratio_row(d, row_priority)
+        finally:
+            ratio_test_time += time.perf_counter() - start
+
+    def ratio_row(d, row_priority):
+        rows = np.flatnonzero(d > tol)
+        if len(rows) == 0:
+            return None
+        ratios = x_B[rows] / d[rows]
+        valid = ratios >= -tol
+        if not valid.any():
+            return None
+        rows = rows[valid]
+        ratios = ratios[valid]
+        ties = rows[ratios <= ratios.min() + tol]
+        if row_priority is not None:
+            return int(ties[np.argmin(row_priority[ties])])
+        return int(ties[0])
+
+    def select_bland():
+        # Same choice as simplex_engine.select_pivot_bland, returns (status, row, col, d, pivot_row)
+        negative_Si_rows = np.flatnonzero(x_B < -tol)
+        if len(negative_Si_rows):
+            r = int(negative_Si_rows[np.argmin(basic_numbers[negative_Si_rows])])
+            row = pivot_row_of(r)
+            negative_cols = np.flatnonzero(row < -tol)
+            if not len(negative_cols):
+                return "no_solution", None, None, None, None
+            col = int(negative_cols[np.argmin(non_basic_numbers[negative_cols])])
+            d = timed_ftran(nonbasic[col])
+            row_index = min_ratio_row(d, basic_numbers)
+            if row_index is not None and x_B[row_index] / d[row_index] < x_B[r] / d[r]:
+                r = row_index
+                row = pivot_row_of(r) if rule.needs_update else None
+            return "pivot", r, col, d, row
+
+        y = factor.btran(cost[basis])
+        F_row = tableau_row(y) - cost[nonbasic]
+        candidates = np.flatnonzero(F_row > tol)
+        for col in candidates[np.argsort(non_basic_numbers[candidates], kind="stable")]:
+            d = timed_ftran(nonbasic[col])
+            r = min_ratio_row(d, basic_numbers)
+            if r is not None:
+                return "pivot", r, int(col), d, pivot_row_of(r) if rule.needs_update else None
+        return "optimal", None, None, None, None
+
+    def progress_key(F_row):
+        infeasibility = -x_B[x_B < -tol].sum()
+        if infeasibility > 0:
+            if not (F_row > tol).any():
+                return 1, cost[basis] @ x_B
+            return 0, -infeasibility
+        return 2, -(cost[basis] @ x_B)
+
+    def make_result(status):
+        si = np.append(x_B * variable_scale[basis], cost[basis] @ x_B)
+        df = DataFrame({"Si": si}, index=list(basic_vars) + ["F"])
+        return SimplexResult(status, df, basic_vars, non_basic_vars, time.perf_counter() - start_time,
+                             iteration, is_maximization)
+
+    def pivot(pivot_row_index, pivot_col_index, d):
+        nonlocal x_B
+        theta = x_B[pivot_row_index] / d[pivot_row_index]
+        x_B -= theta * d
+        x_B[pivot_row_index] = theta
+
+        leaving = basis[pivot_row_index]
+        basis[pivot_row_index] = nonbasic[pivot_col_index]
+        nonbasic[pivot_col_index] = leaving
+        basic_vars[pivot_row_index], non_basic_vars[pivot_col_index] = \
+            non_basic_vars[pivot_col_index], basic_vars[pivot_row_index]
+
+        if factor.update(pivot_row_index, d, basis):
+            # Recompute the basic solution from the fresh factorization to drop accumulated error
+            x_B = factor.ftran(b)
+
+    iteration = 0
+
+    def run_phase(phase=2):
+        # Pivots until the current cost is optimal, returns the status
+        nonlocal iteration, basic_numbers, non_basic_numbers, ratio_test_time
+        bland = False
+        best_progress = None
+        stalled = 0
+
+        while iteration < max_iterations:
+            if time_limit is not None and time.perf_counter() - start_time > time_limit:
+                return "time_limit"
+            if should_stop is not None and should_stop():
+                return "cancelled"
+            iteration += 1
+            pricing_start = time.perf_counter()
+            ratio_test_time = 0
+
+            negative_Si_rows = np.flatnonzero(x_B < -tol)
+            F_row = None
+            if len(negative_Si_rows) and not bland:
+                # F row entries are y^T a_j - c_j with y = B^-T c_B
+                F_row = tableau_row(factor.btran(cost[basis])) - cost[nonbasic]
+
+            if stall_limit is not None and not bland:
+                progress = progress_key(F_row)
+                if best_progress is None or progress[0] > best_progress[0] \
+                        or (progress[0] == best_progress[0] and progress[1] > best_progress[1] + tol):
+                    best_progress = progress
+                    stalled = 0
+                else:
+                    stalled += 1
+                    if stalled >= stall_limit:
+                        bland = True
+                        basic_numbers = variable_numbers(basic_vars)
+                        non_basic_numbers = variable_numbers(non_basic_vars)
+
+            if bland:
+                status, pivot_row_index, pivot_col_index, d, pivot_row = select_bland()
+                if status != "pivot":
+                    return status
+            elif len(negative_Si_rows) and not (F_row > tol).any():
+                # Dual simplex like in simplex_engine.select_pivot: the most negative Si row leaves and
+                # the entering column has the smallest F / value over the negative entries of the row
+                pivot_row_index = int(negative_Si_rows[np.argmin(x_B[negative_Si_rows])])
+                pivot_row = pivot_row_of(pivot_row_index)
+                ratio_start = time.perf_counter()
+                negative_cols = np.flatnonzero(pivot_row < -tol)
+                if not len(negative_cols):
+                    return "no_solution"
+                ratios = F_row[negative_cols] / pivot_row[negative_cols]
+                pivot_col_index = int(negative_cols[np.argmax(ratios <= ratios.min() + tol)])
+                ratio_test_time += time.perf_counter() - ratio_start
+                d = timed_ftran(nonbasic[pivot_col_index])
+            elif len(negative_Si_rows):
+                # Take a negative from Si column, the first negative in its row is the pivot element
+                pivot_row_index = rule.choose_row(x_B, negative_Si_rows)
+                pivot_row = pivot_row_of(pivot_row_index)
+                negative_cols = np.flatnonzero(pivot_row < -tol)
+                if not len(negative_cols):
+                    return "no_solution"
+                pivot_col_index = int(negative_cols[0])
+                d = timed_ftran(nonbasic[pivot_col_index])
+            else:
+                # F row entries are y^T a_j - c_j with y = B^-T c_B
+                y = factor.btran(cost[basis])
+                F_row = tableau_row(y) - cost[nonbasic]
+                pivot_row_index = None
+                candidates = np.flatnonzero(F_row > tol)
+                if len(candidates):
+                    candidates = rule.order(candidates, F_row)
+                for pivot_col_index in candidates:
+                    d = timed_ftran(nonbasic[pivot_col_index])
+                    pivot_row_index = min_ratio_row(d)
+                    if pivot_row_index is not None:
+                        break
+                if pivot_row_index is None:
+                    return "optimal"
+
+                if rule.needs_update:
+                    pivot_row = pivot_row_of(pivot_row_index)
+
+            if abs(d[pivot_row_index]) <= tol:
+                raise SimplexError("Pivot element is zero. Cannot perform pivot operation.")
+
+            if rule.needs_update:
+                # Dot products of the tableau columns with d are a_j^T B^-T d
+                column_dots = tableau_row(factor.btran(d)) if rule.needs_column_dots else None
+                rule.update(pivot_col_index, pivot_row, column_dots)
+
+            entering = non_basic_vars[pivot_col_index]
+            leaving = basic_vars[pivot_row_index]
+            update_start = time.perf_counter()
+            pivot(pivot_row_index, pivot_col_index, d)
+            update_time = time.perf_counter() - update_start
+            if bland:
+                basic_numbers[pivot_row_index], non_basic_numbers[pivot_col_index] = \
+                    non_basic_numbers[pivot_col_index], basic_numbers[pivot_row_index]
+
+            if on_iteration is not None:
+                objective = float(cost[basis] @ x_B)
+                if phase == 2 and is_maximization:
+                    objective = -objective
+                on_iteration(IterationStats(iteration, phase, entering, leaving, float(d[pivot_row_index]),
+                                            objective, int((x_B < -tol).sum()),
+                                            update_start - pricing_start - ratio_test_time, ratio_test_time,
+                                            update_time))
+
+        return "iteration_limit"
+
+    basic_numbers = non_basic_numbers = None
+    artificial = set(artificial_vars or ())
+    artificial_columns = [num_cols + i for i, var in enumerate(basic_vars) if var in artificial]
+    if artificial_columns:
+        # Phase 1: minimize the sum of the artificial variables
+        goal_cost = cost
+        cost = np.zeros_like(goal_cost)
+        cost[artificial_columns] = 1
+        status = run_phase(phase=1)
+        if status != "optimal":
+            return make_result(status)
+        if cost[basis] @ x_B > tol:
+            return make_result("no_solution")
+
+        # Swap artificial variables left in the basis for any other variable of their row,
+        # rows without one are redundant
+        blocked[artificial_columns] = True
+        for i in np.flatnonzero(blocked[basis]):
+            row = np.abs(pivot_row_of(i))
+            if row.max() > tol:
+                pivot_col_index = int(np.argmax(row))
+                pivot(i, pivot_col_index, factor.ftran(column(nonbasic[pivot_col_index])))
+        cost = goal_cost
+
+    status = run_phase()
+    result = make_result(status)
+    if status == "optimal" and feasibility_check is not None and not feasibility_check(result.variable_values):
+        result.status = "no_solution"
+    return result
+
+
+def build_sparse_model(problem):
+    """
+    Initial model of a SparseProblem with the same basic variables as simplex_engine.build_tableau,
+    built without the dense tableau. Column nonzero counts give the uniqueness check for
+    equality rows in linear time. Rows are scaled like in build_tableau.
+    Returns: (A, b, c, basic_cost, basic_vars, non_basic_vars), A is a float CSRMatrix
+    """
+    num_vars = problem.num_vars
+    matrix = problem.matrix
+    counts = matrix.column_counts()
+    is_basic = np.zeros(num_vars, dtype=bool)
+    basic_vars = []
+    signs = []
+    next_num = num_vars + 1
+    for i, relation in enumerate(problem.relations):
+        if relation == "=":
+            cols, values = matrix.row(i)
+            candidates = [(j, value) for j, value in zip(cols, values) if abs(value) == 1 and counts[j] == 1]
+            if candidates:
+                var_index, value = min(candidates)
+                basic_vars.append(f"X{var_index + 1}")
+                is_basic[var_index] = True
+                signs.append(float(value))
+                continue
+            signs.append(-1.0 if problem.rhs[i] < 0 else 1.0)
+        elif relation in ["≤", "≥"]:
+            signs.append(-1.0 if relation == "≥" else 1.0)
+        else:
+            raise ValueError(f"Неверное отношение {relation}")
+        basic_vars.append(f"X{next_num}")
+        next_num += 1
+
+    columns = np.flatnonzero(~is_basic)
+    non_basic_vars = [f"X{j + 1}" for j in columns]
+
+    signs = np.array(signs)
+    A = matrix.select_columns(columns).astype(float).scale_rows(signs)
+    b = np.array([float(v) for v in problem.rhs]) * signs
+    goal = np.array([float(v) for v in problem.goal_values])
+    if problem.is_maximization:
+        goal = -goal
+    # Basic decision variables keep their goal coefficient, slack and artificial variables cost nothing
+    basic_cost = np.array([goal[int(var[1:]) - 1] if int(var[1:]) <= num_vars else 0.0 for var in basic_vars])
+    return A, b, goal[columns], basic_cost, basic_vars, non_basic_vars
+
+
+def solve_revised(problem, max_iterations=1000, tol=1e-9, pricing="first", time_limit=None, scaling=False,
+                  should_stop=None, on_iteration=None):
+    """
+    Solve a SimplexProblem or SparseProblem with the revised simplex method.
+    Returns a SimplexResult.
+    """
+    if not isinstance(problem, SparseProblem):
+        problem = SparseProblem.from_problem(problem)
+    A, b, c, basic_cost, basic_vars, non_basic_vars = build_sparse_model(problem)
+    return run_revised_simplex(A, b, c, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                               max_iterations=max_iterations,
+                               feasibility_check=lambda values: problem.is_feasible(values, FEASIBILITY_TOLERANCE),
+                               tol=tol, pricing=pricing, time_limit=time_limit, basic_cost=basic_cost,
+                               artificial_vars=artificial_vars(problem.relations, basic_vars, problem.num_vars),
+                               scaling=scaling, should_stop=should_stop, on_iteration=on_iteration)
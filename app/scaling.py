@@ -0,0 +1,85 @@
+# scaling.py
+#
+# Row and column scaling of the constraint coefficients for the floating point engines.
+# The factors are powers of two, so scaling and unscaling do not round.
+
+import numpy as np
+
+SCALING_PASSES = 4
+
+
+def scale_factors(rows, cols, values, shape, passes=SCALING_PASSES):
+    """
+    Factors that bring the nonzeros a_ij (given as coordinate arrays) closer to 1:
+    a few geometric mean passes, where every row and then every column is divided by the
+    geometric mean of its smallest and largest entry, and a final equilibration of the rows
+    so that their largest entry is about 1.
+    Returns (row_factors, col_factors), the scaled entries are row_factors[i] * a_ij * col_factors[j].
+    """
+    num_rows, num_cols = shape
+    row_log = np.zeros(num_rows)
+    col_log = np.zeros(num_cols)
+    if not len(values):
+        return np.ones(num_rows), np.ones(num_cols)
+    log_values = np.log2(np.abs(np.asarray(values, dtype=float)))
+
+    def extremes(index, scaled, size):
+        high = np.full(size, -np.inf)
+        low = np.full(size, np.inf)
+        np.maximum.at(high, index, scaled)
+        np.minimum.at(low, index, scaled)
+        # Empty rows and columns keep the factor 1
+        empty = np.isinf(high)
+        high[empty] = 0
+        low[empty] = 0
+        return low, high
+
+    for _ in range(passes):
+        low, high = extremes(rows, log_values + col_log[cols], num_rows)
+        row_log = -(low + high) / 2
+        low, high = extremes(cols, log_values + row_log[rows], num_cols)
+        col_log = -(low + high) / 2
+
+    _, high = extremes(rows, log_values + col_log[cols], num_rows)
+    row_log = -high
+    return np.exp2(np.round(row_log)), np.exp2(np.round(col_log))
+
+
+def scale_tableau(values, passes=SCALING_PASSES):
+    """
+    Scale the variables of a float tableau (Si column first, F row last) given as a NumPy array.
+    Basic variable i is replaced by basic_i * row_factors[i] and non-basic variable j by
+    non_basic_j / col_factors[j], which multiplies the coefficients by row_factors[i] * col_factors[j],
+    Si by row_factors and the F row by col_factors. The result is the tableau of the scaled
+    variables, so the simplex method can run on it unchanged.
+    Returns (scaled_values, row_factors, col_factors).
+    """
+    coefficients = values[:-1, 1:]
+    rows, cols = np.nonzero(coefficients != 0)
+    row_factors, col_factors = scale_factors(rows, cols, coefficients[rows, cols], coefficients.shape, passes)
+    scaled = values.copy()
+    scaled[:-1] *= row_factors[:, None]
+    scaled[:, 1:] *= col_factors
+    return scaled, row_factors, col_factors
+
+
+def variable_scales(basic_vars, non_basic_vars, row_factors, col_factors):
+    """
+    {variable: factor} with the value of every variable in units of the scaled tableau:
+    variable = factor * scaled variable.
+    """
+    scales = {var: 1 / factor for var, factor in zip(basic_vars, row_factors)}
+    scales.update(zip(non_basic_vars, col_factors))
+    return scales
+
+
+def unscale_tableau(values, basic_vars, non_basic_vars, scales):
+    """
+    Inverse of scale_tableau for a tableau in any basis: scales come from variable_scales.
+    """
+    basic_scales = np.array([scales[var] for var in basic_vars])
+    non_basic_scales = np.array([scales[var] for var in non_basic_vars])
+    unscaled = values.copy()
+    unscaled[:-1] *= basic_scales[:, None]
+    unscaled[:, 1:] /= non_basic_scales
+    return unscaled
@@ -0,0 +1,721 @@
+# simplex_engine.py
+#
+# GUI-free simplex engine. Nothing in this module may import PyQt6, so it can be
+# used from batch workers and command-line tools without a QApplication.
+
+from fractions import Fraction
+import time
+
+import numpy as np
+from pandas import DataFrame
+
+from pricing import make_pricing
+from scaling import scale_tableau, unscale_tableau, variable_scales
+from tableau import FractionTableau, FloatTableau, RationalTableau
+
+TABLEAU_ENGINES = {
+    "fraction": FractionTableau,
+    "float": FloatTableau,
+    "rational": RationalTableau,
+}
+
+# Absolute tolerance of the final constraint check for floating point engines
+FEASIBILITY_TOLERANCE = 1e-6
+
+# Pivots without progress after which the run switches to Bland's rule
+STALL_LIMIT = 50
+
+
+class SimplexProblem:
+    """
+    A linear program in the calculator's input form.
+    goal_values: objective coefficients of X1..Xn
+    goal_type: "min" or "max"
+    constraints: list of (coeffs, relation, rhs), relation is one of "≤", "≥", "="
+    """
+
+    def __init__(self, num_vars, goal_values, goal_type, constraints):
+        self.num_vars = num_vars
+        self.goal_values = list(goal_values)
+        self.goal_type = goal_type
+        self.constraints = list(constraints)
+
+    @property
+    def num_constraints(self):
+        return len(self.constraints)
+
+    @property
+    def is_maximization(self):
+        return self.goal_type == "max"
+
+
+class SimplexResult:
+    """
+    Outcome of a simplex run.
+    status can be:
+       "optimal"         if an optimal solution is found,
+       "no_solution"     if no feasible solution exists,
+       "iteration_limit" if the maximum number of iterations was reached,
+       "time_limit"      if the time limit was reached,
+       "cancelled"       if the run was stopped from outside.
+    """
+
+    def __init__(self, status, tableau_df, basic_vars, non_basic_vars, elapsed_time, iterations,
+                 is_maximization=False):
+        self.status = status
+        self.tableau_df = tableau_df
+        self.basic_vars = basic_vars
+        self.non_basic_vars = non_basic_vars
+        self.elapsed_time = elapsed_time
+        self.iterations = iterations
+        self.is_maximization = is_maximization
+
+    @property
+    def optimal_value(self):
+        value = self.tableau_df.iloc[len(self.tableau_df.index) - 1, 0]
+        if self.is_maximization:
+            value = value * -1
+        return value
+
+    @property
+    def variable_values(self):
+        variable_values = {}
+        for i, var in enumerate(self.basic_vars):
+            variable_values[var] = self.tableau_df.iloc[i, 0]
+        for var in self.non_basic_vars:
+            variable_values[var] = Fraction(0)
+        return variable_values
+
+
+class IterationStats:
+    """
+    What happened in one pivot of a run, passed to the on_iteration hook of the engines.
+    iteration: number of the pivot in the run
+    phase: 1 while the sum of the artificial variables is minimized, otherwise 2
+    entering, leaving: names of the variables that entered and left the basis
+    pivot_value: the pivot element as a float (in scaled units when the run is scaled)
+    objective: goal value after the pivot, in phase 1 the sum of the artificial variables
+    infeasible_rows: number of negative Si rows after the pivot
+    pricing_time: seconds spent choosing the pivot row or column and updating pricing weights
+    ratio_test_time: seconds spent in the ratio tests
+    update_time: seconds spent updating the tableau or the basis
+    """
+
+    def __init__(self, iteration, phase, entering, leaving, pivot_value, objective, infeasible_rows,
+                 pricing_time, ratio_test_time, update_time):
+        self.iteration = iteration
+        self.phase = phase
+        self.entering = entering
+        self.leaving = leaving
+        self.pivot_value = pivot_value
+        self.objective = objective
+        self.infeasible_rows = infeasible_rows
+        self.pricing_time = pricing_time
+        self.ratio_test_time = ratio_test_time
+        self.update_time = update_time
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def build_tableau(problem):
+    """
+    Build the initial tableau for the problem.
+    Returns: (df, basic_vars, non_basic_vars)
+    An equality row gets as its basic variable a decision variable with coefficient 1 or -1 that
+    does not appear in any other constraint, found with the column nonzero counts in one pass.
+    The row is divided by that coefficient and the variable's goal coefficient is moved into
+    the F row. Other equality rows get an artificial variable (see artificial_vars) and are
+    negated if their right-hand side is negative, so the artificial variable starts non-negative.
+    """
+    num_vars = problem.num_vars
+    constraints = problem.constraints
+
+    if problem.goal_type == "min":
+        adjusted_goal_values = [-val for val in problem.goal_values]
+    elif problem.goal_type == "max":
+        adjusted_goal_values = [val for val in problem.goal_values]
+    else:
+        raise ValueError(f"Неверный тип целевой функции: {problem.goal_type}")
+
+    # Number of constraints every decision variable appears in
+    counts = [0] * num_vars
+    for coeffs, _, _ in constraints:
+        for j, coef in enumerate(coeffs[:num_vars]):
+            if coef != 0:
+                counts[j] += 1
+
+    basic_vars = []
+    row_signs = []
+    is_basic = [False] * num_vars
+    next_num = num_vars + 1
+    for coeffs, relation, rhs in constraints:
+        if relation == "=":
+            var_index = next((j for j, coef in enumerate(coeffs[:num_vars]) if abs(coef) == 1 and counts[j] == 1),
+                             None)
+            if var_index is not None:
+                basic_vars.append(f"X{var_index + 1}")
+                is_basic[var_index] = True
+                row_signs.append(Fraction(coeffs[var_index]))
+                continue
+            row_signs.append(-1 if rhs < 0 else 1)
+        elif relation in ["≤", "≥"]:
+            row_signs.append(-1 if relation == "≥" else 1)
+        else:
+            raise ValueError(f"Неверное отношение {relation}")
+        basic_vars.append(f"X{next_num}")
+        next_num += 1
+
+    columns = [j for j in range(num_vars) if not is_basic[j]]
+    non_basic_vars = [f"X{j + 1}" for j in columns]
+
+    tableau_data = []
+    for (coeffs, _, rhs), sign in zip(constraints, row_signs):
+        row = [Fraction(rhs) * sign]
+        row.extend(Fraction(coeffs[j]) * sign if j < len(coeffs) else Fraction(0) for j in columns)
+        tableau_data.append(row)
+
+    objective_row = [Fraction(0)] + [Fraction(adjusted_goal_values[j]) for j in columns]
+    # A basic decision variable is its row's Si minus the row, its goal term goes into the F row that way
+    for row, var in zip(tableau_data, basic_vars):
+        j = int(var[1:]) - 1
+        if j < num_vars and adjusted_goal_values[j] != 0:
+            goal = Fraction(adjusted_goal_values[j])
+            objective_row = [f - goal * x for f, x in zip(objective_row, row)]
+    tableau_data.append(objective_row)
+
+    df = DataFrame(tableau_data, columns=["Si"] + non_basic_vars, index=basic_vars + ["F"])
+
+    return df, basic_vars, non_basic_vars
+
+
+def artificial_vars(relations, basic_vars, num_vars):
+    """
+    Artificial variables of build_tableau: the basic variables of "=" rows that are not
+    decision variables. They have to be zero in an answer, run_simplex removes them in phase 1.
+    """
+    return [var for relation, var in zip(relations, basic_vars) if relation == "=" and int(var[1:]) > num_vars]
+
+
+def final_feasibility_check(constraints, num_vars, variable_values, tol=Fraction(0)):
+    """
+    variable_values: dict { "X1": fraction, "X2": fraction, ... }
+    tol: allowed violation, use a small positive value for float answers
+    returns True if all constraints are satisfied, otherwise False
+    """
+    for (coeffs, relation, rhs) in constraints:
+        LHS = sum(coeffs[j] * variable_values.get(f"X{j + 1}", Fraction(0)) for j in range(num_vars))
+        if relation == "≤":
+            if LHS > rhs + tol:
+                return False
+        elif relation == "≥":
+            if LHS < rhs - tol:
+                return False
+        elif relation == "=":
+            if abs(LHS - rhs) > tol:
+                return False
+        else:
+            # Unexpected relation?
+            return False
+    return True
+
+
+def add_time(timings, key, start):
+    # Adds the seconds since start to timings[key], timings=None keeps no timings
+    if timings is not None:
+        timings[key] = timings.get(key, 0) + time.perf_counter() - start
+
+
+def select_pivot(tableau, num_basic, pricing=None, timings=None):
+    """
+    Choose the next pivot element.
+    pricing is a pricing rule instance, None keeps the original first-entry rule.
+    The seconds spent in the ratio tests are added to timings["ratio_test"] if a dict is given.
+    Returns: (status, pivot_row_index, pivot_col_index)
+    status is "pivot", "optimal" or "no_solution".
+    """
+    negative_Si_rows = tableau.negative_si_rows(num_basic)
+
+    if len(negative_Si_rows) and not len(tableau.positive_f_cols()):
+        # Dual simplex: with no positive F entries the most negative Si row leaves and the
+        # dual ratio test picks the entering column, so the F row stays non-positive
+        pivot_row_index = int(negative_Si_rows[np.argmin(tableau.float_column(0)[negative_Si_rows])])
+        start = time.perf_counter()
+        pivot_col_index = tableau.dual_ratio_col(pivot_row_index)
+        add_time(timings, "ratio_test", start)
+        if pivot_col_index is None:
+            return "no_solution", None, None
+        return "pivot", pivot_row_index, pivot_col_index
+
+    if len(negative_Si_rows):
+        # Take a negative from Si column (the first one unless the pricing rule says otherwise),
+        # the first negative in its row is the pivot element
+        if pricing is not None and pricing.needs_values:
+            pivot_row_index = pricing.choose_row(tableau.float_column(0)[:num_basic], negative_Si_rows)
+        else:
+            pivot_row_index = int(negative_Si_rows[0])
+        start = time.perf_counter()
+        negative_cols = tableau.negative_cols(pivot_row_index)
+        add_time(timings, "ratio_test", start)
+        if len(negative_cols):
+            return "pivot", pivot_row_index, int(negative_cols[0])
+        return "no_solution", None, None
+
+    # Take positive from F row except Si that has a valid ratio in its column,
+    # in column order or in the order of the pricing rule
+    candidates = tableau.positive_f_cols()
+    if pricing is not None and pricing.needs_values and len(candidates):
+        candidates = pricing.order(candidates - 1, tableau.float_row(-1)[1:]) + 1
+    for pivot_col_index in candidates:
+        start = time.perf_counter()
+        pivot_row_index = tableau.min_ratio_row(pivot_col_index, num_basic)
+        add_time(timings, "ratio_test", start)
+        if pivot_row_index is not None:
+            return "pivot", pivot_row_index, int(pivot_col_index)
+
+    # No positive elements in F row under non-basic variables
+    return "optimal", None, None
+
+
+def select_pivot_bland(tableau, num_basic, basic_numbers, non_basic_numbers, timings=None):
+    """
+    Choose the next pivot with Bland's rule, which cannot cycle: among the candidates the
+    variable with the smallest number enters and ties in the ratio test go to the basic
+    variable with the smallest number.
+    basic_numbers, non_basic_numbers: NumPy arrays of the variable numbers in tableau order.
+    A negative Si row is fixed with a ratio test over the feasible rows, so feasible rows stay
+    feasible and the row's Si never decreases.
+    Returns: (status, pivot_row_index, pivot_col_index) like select_pivot, timings as well.
+    """
+    negative_Si_rows = tableau.negative_si_rows(num_basic)
+
+    if len(negative_Si_rows):
+        pivot_row_index = int(negative_Si_rows[np.argmin(basic_numbers[negative_Si_rows])])
+        negative_cols = tableau.negative_cols(pivot_row_index)
+        if not len(negative_cols):
+            return "no_solution", None, None
+        pivot_col_index = int(negative_cols[np.argmin(non_basic_numbers[negative_cols - 1])])
+        # A feasible row that would turn negative before this row reaches zero is the pivot row instead
+        start = time.perf_counter()
+        row_index = tableau.min_ratio_row(pivot_col_index, num_basic, basic_numbers)
+        if row_index is not None:
+            row_ratio = tableau.value(row_index, 0) / tableau.value(row_index, pivot_col_index)
+            if row_ratio < tableau.value(pivot_row_index, 0) / tableau.value(pivot_row_index, pivot_col_index):
+                pivot_row_index = row_index
+        add_time(timings, "ratio_test", start)
+        return "pivot", pivot_row_index, pivot_col_index
+
+    candidates = tableau.positive_f_cols()
+    for pivot_col_index in candidates[np.argsort(non_basic_numbers[candidates - 1], kind="stable")]:
+        start = time.perf_counter()
+        pivot_row_index = tableau.min_ratio_row(pivot_col_index, num_basic, basic_numbers)
+        add_time(timings, "ratio_test", start)
+        if pivot_row_index is not None:
+            return "pivot", pivot_row_index, int(pivot_col_index)
+
+    return "optimal", None, None
+
+
+def variable_numbers(names):
+    return np.array([int(name[1:]) for name in names])
+
+
+def swap_variables(basic_vars, non_basic_vars, pivot_row_index, pivot_col_index):
+    """
+    Swap basic and non-basic variable names after a pivot.
+    """
+    leaving_var = basic_vars[pivot_row_index]
+    entering_var = non_basic_vars[pivot_col_index - 1]  # Adjust for 'Si' at index 0
+    basic_vars[pivot_row_index] = entering_var
+    non_basic_vars[pivot_col_index - 1] = leaving_var
+
+
+def run_simplex(df, basic_vars, non_basic_vars, is_maximization=False, max_iterations=1000, on_pivot=None,
+                constraints=None, num_vars=0, engine="fraction", inplace=False, pricing="first",
+                stall_limit=STALL_LIMIT, time_limit=None, should_stop=None, artificial_vars=None, scaling=False,
+                start_basic_vars=None, on_iteration=None):
+    """
+    Run the simplex method on a prepared tableau.
+    engine selects the tableau backend from TABLEAU_ENGINES ("fraction", "float" or "rational").
+    inplace=True pivots inside one preallocated tableau, so memory does not grow with the iterations.
+    pricing selects the entering column rule from pricing.PRICING_RULES.
+    After stall_limit pivots without progress (the Si infeasibility or the F value does not
+    improve) the run switches to select_pivot_bland for good, so degenerate problems cannot
+    cycle until max_iterations. stall_limit=None disables the switch.
+    time_limit is checked before every pivot, in seconds.
+    should_stop() is called before every pivot as well, the run ends as "cancelled" when it returns True.
+    artificial_vars (see artificial_vars()) that are basic are driven to zero in phase 1 with the sum of
+    them as the F row, a positive minimum means "no_solution". Then the real F row is restored and
+    artificial columns are never pivoted in again.
+    on_pivot(tableau, basic_vars, non_basic_vars, pivot_row_index, pivot_col_index) is called after every
+    pivot with the live tableau backend, use tableau.to_dataframe() to keep a copy. The pivot indexes
+    are None when the F row was replaced at the start or the end of phase 1.
+    on_iteration(stats) is called after every pivot of the pivot rules with an IterationStats;
+    the pivots that drive artificial variables out of the basis and those of start_basic_vars have none.
+    scaling=True runs the float engine on the tableau scaled with scaling.scale_tableau, on_pivot
+    then sees the scaled tableau. The result is unscaled. Exact engines ignore it.
+    start_basic_vars, e.g. the final basis of a float run, makes the run start from that basis:
+    the tableau is first pivoted into it with pivot_to_basis, those pivots count as iterations.
+    If constraints are given, an optimal answer that violates them is reported as "no_solution".
+    Raises ValueError for non-numeric tableau values and SimplexError on a zero pivot.
+    """
+    start_time = time.perf_counter()
+
+    if engine not in TABLEAU_ENGINES:
+        raise ValueError(f"Unknown simplex engine: {engine}")
+    scales = None
+    if scaling and engine == "float":
+        values, row_factors, col_factors = scale_tableau(df.to_numpy(dtype=float))
+        df = DataFrame(values, index=df.index, columns=df.columns)
+        scales = variable_scales(basic_vars, non_basic_vars, row_factors, col_factors)
+    tableau = TABLEAU_ENGINES[engine](df, inplace=inplace)
+    num_basic = len(basic_vars)
+    rule = make_pricing(pricing)
+    if rule.needs_values:
+        rule.start((tableau.float_values()[:num_basic, 1:] ** 2).sum(axis=0))
+
+    iteration = 0
+    if start_basic_vars is not None:
+        iteration = pivot_to_basis(tableau, basic_vars, non_basic_vars, start_basic_vars)
+
+    def make_result(status):
+        tableau_df = tableau.to_dataframe()
+        if scales is not None:
+            tableau_df = DataFrame(unscale_tableau(tableau_df.to_numpy(), basic_vars, non_basic_vars, scales),
+                                   index=tableau_df.index, columns=tableau_df.columns)
+        return SimplexResult(status, tableau_df, basic_vars, non_basic_vars,
+                             time.perf_counter() - start_time, iteration, is_maximization)
+
+    if start_basic_vars is not None:
+        # A start basis where the run stopped as "no_solution" usually has a negative Si row without
+        # negative entries, which proves there is no solution. The pivot rules would look at
+        # the first negative row only.
+        for pivot_row_index in tableau.negative_si_rows(num_basic):
+            if not len(tableau.negative_cols(pivot_row_index)):
+                return make_result("no_solution")
+
+    def pivot(pivot_row_index, pivot_col_index):
+        tableau.pivot(pivot_row_index, pivot_col_index)
+        swap_variables(basic_vars, non_basic_vars, pivot_row_index, pivot_col_index)
+        if on_pivot is not None:
+            on_pivot(tableau, basic_vars, non_basic_vars, pivot_row_index, pivot_col_index)
+
+    def set_f_row(values):
+        tableau.set_f_row(values)
+        if on_pivot is not None:
+            on_pivot(tableau, basic_vars, non_basic_vars, None, None)
+
+    def run_phase(phase=2):
+        # Pivots until the current F row is optimal, returns the status
+        nonlocal iteration
+        bland = False
+        best_progress = None
+        stalled = 0
+        timings = None
+
+        while iteration < max_iterations:
+            if time_limit is not None and time.perf_counter() - start_time > time_limit:
+                return "time_limit"
+            if should_stop is not None and should_stop():
+                return "cancelled"
+            iteration += 1
+            pricing_start = time.perf_counter()
+            if on_iteration is not None:
+                timings = {}
+            if stall_limit is not None and not bland:
+                progress = progress_key(tableau, num_basic)
+                if best_progress is None or progress[0] > best_progress[0] \
+                        or (progress[0] == best_progress[0] and progress[1] > best_progress[1] + tableau.tol):
+                    best_progress = progress
+                    stalled = 0
+                else:
+                    stalled += 1
+                    if stalled >= stall_limit:
+                        bland = True
+                        basic_numbers = variable_numbers(basic_vars)
+                        non_basic_numbers = variable_numbers(non_basic_vars)
+
+            if bland:
+                status, pivot_row_index, pivot_col_index = select_pivot_bland(tableau, num_basic, basic_numbers,
+                                                                              non_basic_numbers, timings)
+            else:
+                status, pivot_row_index, pivot_col_index = select_pivot(tableau, num_basic, rule, timings)
+
+            if status != "pivot":
+                return status
+
+            if bland:
+                basic_numbers[pivot_row_index], non_basic_numbers[pivot_col_index - 1] = \
+                    non_basic_numbers[pivot_col_index - 1], basic_numbers[pivot_row_index]
+            elif rule.needs_update:
+                column_dots = None
+                if rule.needs_column_dots:
+                    values = tableau.float_values()
+                    column_dots = values[:num_basic, 1:].T @ values[:num_basic, pivot_col_index]
+                rule.update(pivot_col_index - 1, tableau.float_row(pivot_row_index)[1:], column_dots)
+
+            if on_iteration is None:
+                pivot(pivot_row_index, pivot_col_index)
+                continue
+            entering = non_basic_vars[pivot_col_index - 1]
+            leaving = basic_vars[pivot_row_index]
+            pivot_value = float(tableau.value(pivot_row_index, pivot_col_index))
+            update_start = time.perf_counter()
+            pivot(pivot_row_index, pivot_col_index)
+            update_time = time.perf_counter() - update_start
+            ratio_test_time = timings.get("ratio_test", 0)
+            objective = float(tableau.value(tableau.shape[0] - 1, 0))
+            if phase == 2 and is_maximization:
+                objective = -objective
+            on_iteration(IterationStats(iteration, phase, entering, leaving, pivot_value, objective,
+                                        len(tableau.negative_si_rows(num_basic)),
+                                        update_start - pricing_start - ratio_test_time, ratio_test_time,
+                                        update_time))
+
+        return "iteration_limit"
+
+    artificial = set(artificial_vars or ())
+    if artificial:
+        artificial_rows = [i for i, var in enumerate(basic_vars) if var in artificial]
+        if artificial_rows:
+            start_F_row = tableau.row(-1)
+            start_non_basic_vars = list(non_basic_vars)
+
+            # Phase 1: the F row is the sum of the artificial variables
+            phase_one_row = sum(tableau.row(i) for i in artificial_rows)
+            for j, var in enumerate(non_basic_vars, start=1):
+                if var in artificial:
+                    phase_one_row[j] -= 1
+            set_f_row(phase_one_row)
+            status = run_phase(phase=1)
+            if status != "optimal":
+                return make_result(status)
+            if tableau.value(-1, 0) > tableau.tol:
+                return make_result("no_solution")
+
+            # Artificial variables left in the basis are zero, swap them for any other variable of their row.
+            # Rows without one are redundant and keep their artificial variable at zero.
+            for i in range(num_basic):
+                if basic_vars[i] in artificial:
+                    row = np.abs(tableau.float_row(i))
+                    row[[0] + [j for j, var in enumerate(non_basic_vars, start=1) if var in artificial]] = 0
+                    if row.max() > tableau.tol:
+                        pivot(i, int(np.argmax(row)))
+
+            set_f_row(transformed_f_row(tableau, basic_vars, non_basic_vars, start_non_basic_vars, start_F_row))
+        tableau.block_columns([j for j, var in enumerate(non_basic_vars, start=1) if var in artificial])
+
+    status = run_phase()
+    result = make_result(status)
+    if status == "optimal" and constraints is not None:
+        tol = Fraction(0) if tableau.tol == 0 else FEASIBILITY_TOLERANCE
+        if not final_feasibility_check(constraints, num_vars, result.variable_values, tol):
+            result.status = "no_solution"
+    return result
+
+
+def pivot_to_basis(tableau, basic_vars, non_basic_vars, target_basic_vars):
+    """
+    Pivot the tableau towards the basis target_basic_vars without any pivot rule, like a
+    refactorization: every target variable that is not basic enters in the row of a variable
+    that leaves the basis, with the largest element of its column among those rows.
+    A target variable whose column is zero in all those rows is skipped, so for a singular
+    target basis the tableau ends in the closest basis found.
+    Returns the number of pivots.
+    """
+    target = set(target_basic_vars)
+    num_basic = len(basic_vars)
+    pivots = 0
+    for var in target_basic_vars:
+        if var not in non_basic_vars:
+            continue
+        pivot_col_index = non_basic_vars.index(var) + 1
+        rows = [i for i in range(num_basic) if basic_vars[i] not in target and tableau.value(i, pivot_col_index) != 0]
+        if not rows:
+            continue
+        column = np.abs(tableau.float_column(pivot_col_index))
+        pivot_row_index = max(rows, key=lambda i: column[i])
+        tableau.pivot(pivot_row_index, pivot_col_index)
+        swap_variables(basic_vars, non_basic_vars, pivot_row_index, pivot_col_index)
+        pivots += 1
+    return pivots
+
+
+def transformed_f_row(tableau, basic_vars, non_basic_vars, start_non_basic_vars, start_F_row):
+    """
+    start_F_row, the F row when start_non_basic_vars were non-basic, in the current basis of the
+    tableau: the goal term of a variable that became basic is replaced by its row.
+    """
+    F_row = start_F_row * 0
+    F_row[0] = start_F_row[0]
+    row_of = {var: i for i, var in enumerate(basic_vars)}
+    col_of = {var: j for j, var in enumerate(non_basic_vars, start=1)}
+    for var, value in zip(start_non_basic_vars, start_F_row[1:]):
+        if value == 0:
+            continue
+        if var in col_of:
+            F_row[col_of[var]] += value
+        else:
+            F_row -= tableau.row(row_of[var]) * value
+    return F_row
+
+
+def warm_start_tableau(initial_df, final_df, basic_vars, non_basic_vars, new_df):
+    """
+    Tableau of a final basis for a changed problem, without pivoting.
+    initial_df is the tableau the basis was reached from, final_df with basic_vars and
+    non_basic_vars the tableau in that basis, and new_df the initial tableau of the changed problem.
+    If new_df differs from initial_df only in the Si column and the F row (right-hand sides
+    and goal coefficients), the same pivots would turn it into the returned tableau:
+    an Si change of a row moves the Si column along the column of the row's initial basic variable,
+    a goal change of a variable adds its column, or its row if it is basic, to the F row, and a
+    change of the F row Si (the goal terms of "=" rows solved for a decision variable) is added as is.
+    Returns None if the rows, the columns or the constraint coefficients differ.
+    After a right-hand side change only the F value can change, so the run continues with the
+    negative Si rows, after a goal change Si is unchanged and the run continues with the F row.
+    """
+    if list(new_df.index) != list(initial_df.index) or list(new_df.columns) != list(initial_df.columns):
+        return None
+    old = initial_df.to_numpy()
+    new = new_df.to_numpy()
+    if not (old[:-1, 1:] == new[:-1, 1:]).all():
+        return None
+
+    values = final_df.to_numpy().copy()
+    row_of = {var: i for i, var in enumerate(basic_vars)}
+    col_of = {var: j + 1 for j, var in enumerate(non_basic_vars)}
+
+    # The F row Si holds the goal terms of the decision variables build_tableau makes basic in
+    # "=" rows, the pivots only add multiples of the rows to it, so its change carries over as is
+    values[-1, 0] += new[-1, 0] - old[-1, 0]
+
+    for i, var in enumerate(initial_df.index[:-1]):
+        delta = new[i, 0] - old[i, 0]
+        if delta == 0:
+            continue
+        if var in row_of:
+            values[row_of[var], 0] += delta
+        else:
+            values[:, 0] += values[:, col_of[var]] * delta
+
+    for j, var in enumerate(initial_df.columns[1:], start=1):
+        delta = new[-1, j] - old[-1, j]
+        if delta == 0:
+            continue
+        if var in col_of:
+            values[-1, col_of[var]] += delta
+        else:
+            values[-1] -= values[row_of[var]] * delta
+
+    return DataFrame(values, index=final_df.index, columns=final_df.columns)
+
+
+def progress_key(tableau, num_basic):
+    """
+    Key that grows whenever a pivot makes progress: first the Si infeasibility shrinks,
+    or the F value grows once dual simplex pivots are made, then the F value decreases.
+    """
+    infeasibility = tableau.infeasibility(num_basic)
+    if infeasibility > 0:
+        if not len(tableau.positive_f_cols()):
+            return 1, tableau.value(tableau.shape[0] - 1, 0)
+        return 0, -infeasibility
+    return 2, -tableau.value(tableau.shape[0] - 1, 0)
+
+
+def solve(problem, max_iterations=1000, engine="fraction", inplace=False, pricing="first", time_limit=None,
+          presolve=False, scaling=True, should_stop=None, on_iteration=None):
+    """
+    Solve a SimplexProblem without any GUI.
+    problem is a SimplexProblem or a sparse_problem.SparseProblem.
+    engine is a TABLEAU_ENGINES name, "revised" for the revised simplex method or "hybrid"
+    for solve_hybrid.
+    pricing is a pricing.PRICING_RULES name.
+    time_limit in seconds stops the run with the "time_limit" status.
+    presolve=True solves the problem reduced by presolve.presolve_problem, the result then
+    holds only the values of X1..Xn.
+    scaling=True scales the coefficients for the floating point engines ("float", "revised" and the
+    float run of "hybrid").
+    should_stop() ends the run with the "cancelled" status and on_iteration(stats) is called with an
+    IterationStats after every pivot, see run_simplex.
+    Returns a SimplexResult.
+    """
+    if presolve:
+        # Imported here because presolve builds on this module
+        from presolve import presolve_problem
+        presolved = presolve_problem(problem)
+        if presolved.problem is None:
+            return presolved.postsolve()
+        return presolved.postsolve(solve(presolved.problem, max_iterations=max_iterations, engine=engine,
+                                         inplace=inplace, pricing=pricing, time_limit=time_limit,
+                                         scaling=scaling, should_stop=should_stop, on_iteration=on_iteration))
+
+    if engine == "revised":
+        # Imported here because revised_simplex builds on this module
+        from revised_simplex import solve_revised
+        return solve_revised(problem, max_iterations=max_iterations, pricing=pricing, time_limit=time_limit,
+                             scaling=scaling, should_stop=should_stop, on_iteration=on_iteration)
+
+    if hasattr(problem, "to_problem"):
+        # SparseProblem: the tableau engines need the dense rows
+        problem = problem.to_problem()
+
+    if engine == "hybrid":
+        return solve_hybrid(problem, max_iterations=max_iterations, pricing=pricing, time_limit=time_limit,
+                            scaling=scaling, should_stop=should_stop, on_iteration=on_iteration)
+
+    df, basic_vars, non_basic_vars = build_tableau(problem)
+    relations = [relation for _, relation, _ in problem.constraints]
+    return run_simplex(df, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                       max_iterations=max_iterations, constraints=problem.constraints,
+                       num_vars=problem.num_vars, engine=engine, inplace=inplace, pricing=pricing,
+                       time_limit=time_limit, should_stop=should_stop,
+                       artificial_vars=artificial_vars(relations, basic_vars, problem.num_vars), scaling=scaling,
+                       on_iteration=on_iteration)
+
+
+def solve_hybrid(problem, max_iterations=1000, pricing="first", time_limit=None, scaling=True, should_stop=None,
+                 on_iteration=None):
+    """
+    Solve a SimplexProblem with float pivots and an exact answer. The float engine finds a final
+    basis, then the initial tableau is pivoted into that basis in exact rationals and the exact
+    engine continues from it. If the float basis is optimal, the exact run only confirms it with
+    its own optimality test and the constraint check; otherwise it goes on pivoting from there,
+    so rounding in the float run can cost pivots but never changes the answer.
+    The iterations of the result include the float pivots.
+    on_iteration sees the pivots of both runs, the iteration numbers of the exact run continue
+    after the float ones.
+    """
+    start_time = time.perf_counter()
+    df, basic_vars, non_basic_vars = build_tableau(problem)
+    relations = [relation for _, relation, _ in problem.constraints]
+    artificial = artificial_vars(relations, basic_vars, problem.num_vars)
+
+    float_result = run_simplex(df, list(basic_vars), list(non_basic_vars), is_maximization=problem.is_maximization,
+                               max_iterations=max_iterations, engine="float", pricing=pricing,
+                               time_limit=time_limit, should_stop=should_stop, artificial_vars=artificial,
+                               scaling=scaling, on_iteration=on_iteration)
+    if float_result.status in ("time_limit", "cancelled"):
+        return float_result
+
+    if time_limit is not None:
+        time_limit = max(time_limit - (time.perf_counter() - start_time), 0)
+    result = run_simplex(df, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                         max_iterations=max_iterations, constraints=problem.constraints,
+                         num_vars=problem.num_vars, engine="rational", pricing=pricing, time_limit=time_limit,
+                         should_stop=should_stop, artificial_vars=artificial, start_basic_vars=float_result.basic_vars,
+                         on_iteration=offset_iterations(on_iteration, float_result.iterations))
+    result.iterations += float_result.iterations
+    result.elapsed_time = time.perf_counter() - start_time
+    return result
+
+
+def offset_iterations(on_iteration, offset):
+    # on_iteration hook whose iteration numbers continue after offset earlier pivots
+    if on_iteration is None:
+        return None
+
+    def hook(stats):
+        stats.iteration += offset
+        on_iteration(stats)
+    return hook
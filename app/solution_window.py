@@ -1,14 +1,141 @@
 # solution_window.py
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QLabel, QMessageBox, QFrame, QAbstractItemView, QDialog, QRadioButton
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QProgressBar,
+    QTableView, QLabel, QMessageBox, QFrame, QAbstractItemView, QDialog, QRadioButton
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor
 from fractions import Fraction
+import threading
 import time
 
+from simplex_engine import run_simplex, final_feasibility_check, warm_start_tableau
+from step_history import StepHistory
+
+
+class SimplexWorker(QObject):
+    """
+    Runs the simplex method on a worker thread. Every pivot is sent to the window through
+    signals, so the steps are stored and shown on the GUI thread only. Only the pivot is sent,
+    plus the whole tableau of every checkpoint_every-th step and of every step where phase 1
+    replaced the F row (its row and col are None).
+    """
+    pivoted = pyqtSignal(object, object, object)  # row, col, (df, basic_vars, non_basic_vars) checkpoint or None
+    progress = pyqtSignal(int, int, object)  # iteration, phase, objective value (in phase 1 the sum of the artificials)
+    solved = pyqtSignal(object)  # SimplexResult
+    failed = pyqtSignal(str, str)  # message box title, text
+
+    def __init__(self, df, basic_vars, non_basic_vars, is_maximization, max_iterations=300, checkpoint_every=10,
+                 artificial_vars=None):
+        super().__init__()
+        self.df = df
+        self.basic_vars = list(basic_vars)
+        self.non_basic_vars = list(non_basic_vars)
+        self.is_maximization = is_maximization
+        self.artificial_vars = artificial_vars
+        self.max_iterations = max_iterations
+        self.checkpoint_every = checkpoint_every
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        # Called from the GUI thread, the engine checks the flag before every pivot
+        self._cancelled.set()
+
+    def run(self):
+        iteration = 0
+        phase = 2
+
+        def on_pivot(tableau, basic_vars, non_basic_vars, pivot_row_index, pivot_col_index):
+            nonlocal iteration, phase
+            if pivot_row_index is None:
+                # The F row was replaced, the step cannot be replayed from the previous one.
+                # That happens at the start of phase 1 and at its end, when the goal comes back
+                phase = 1 if phase == 2 else 2
+                self.pivoted.emit(None, None, (tableau.to_dataframe(), basic_vars.copy(), non_basic_vars.copy()))
+                return
+
+            iteration += 1
+            checkpoint = None
+            if iteration % self.checkpoint_every == 0:
+                checkpoint = (tableau.to_dataframe(), basic_vars.copy(), non_basic_vars.copy())
+            self.pivoted.emit(pivot_row_index, pivot_col_index, checkpoint)
+            objective = tableau.value(tableau.shape[0] - 1, 0)
+            if phase == 2 and self.is_maximization:
+                objective = -objective
+            self.progress.emit(iteration, phase, objective)
+
+        try:
+            result = run_simplex(self.df, self.basic_vars, self.non_basic_vars, is_maximization=self.is_maximization,
+                                 max_iterations=self.max_iterations, on_pivot=on_pivot,
+                                 should_stop=self._cancelled.is_set, artificial_vars=self.artificial_vars)
+        except ValueError as e:
+            self.failed.emit("Value Error", f"Invalid value in the initial tableau: {e}")
+        except Exception as e:
+            self.failed.emit("Error", f"An error occurred during the simplex method: {e}")
+        else:
+            self.solved.emit(result)
+
+
+class TableauModel(QAbstractTableModel):
+    """
+    Read-only model over the values of one step. Cells are formatted only when the view
+    asks for them, i.e. for the visible part of the table, and the formatted text is cached
+    until the next step is set. The pivot element is marked through PivotRole, its
+    background is derived from it.
+    """
+    PivotRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = None
+        self.row_labels = []
+        self.col_labels = []
+        self.pivot = None
+        self.pivot_color = QColor("#37AEFE")
+        self._text = {}
+
+    def set_step(self, values, row_labels, col_labels, pivot=None):
+        self.beginResetModel()
+        self.values = values
+        self.row_labels = list(row_labels)
+        self.col_labels = list(col_labels)
+        self.pivot = pivot
+        self._text = {}
+        self.endResetModel()
+
+    def clear(self):
+        self.set_step(None, [], [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.values is None else self.values.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.values is None else self.values.shape[1]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        cell = (index.row(), index.column())
+        if role == Qt.ItemDataRole.DisplayRole:
+            text = self._text.get(cell)
+            if text is None:
+                text = self._text[cell] = str(self.values[cell])
+            return text
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == self.PivotRole:
+            return cell == self.pivot
+        if role == Qt.ItemDataRole.BackgroundRole and cell == self.pivot:
+            return self.pivot_color
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        labels = self.col_labels if orientation == Qt.Orientation.Horizontal else self.row_labels
+        return labels[section] if section < len(labels) else None
+
 
 class SimplexSolutionWindow(QWidget):
     def __init__(self, dark_theme, task_info, original_constraints=None, num_vars=0):
@@ -37,15 +164,21 @@ class SimplexSolutionWindow(QWidget):
         self.left_layout.addWidget(self.left_label)
         self.right_layout.addWidget(self.right_label)
 
-        # Initialize QTableWidgets
-        self.left_table = QTableWidget()
-        self.right_table = QTableWidget()
+        # Table views over the models of the two displayed steps
+        self.left_model = TableauModel(self)
+        self.right_model = TableauModel(self)
+        self.left_table = QTableView()
+        self.right_table = QTableView()
+        self.left_table.setModel(self.left_model)
+        self.right_table.setModel(self.right_model)
         self.left_layout.addWidget(self.left_table)
         self.right_layout.addWidget(self.right_table)
 
-        # Disable editing
-        self.left_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.right_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        for table in (self.left_table, self.right_table):
+            # Disable editing
+            table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            # Size columns by the visible rows only, so only those cells are formatted
+            table.horizontalHeader().setResizeContentsPrecision(0)
 
         # Add an arrow between the tables
         self.arrow_label = QLabel("→")
@@ -58,6 +191,19 @@ class SimplexSolutionWindow(QWidget):
         self.tableau_layout.addLayout(self.right_layout)
         self.layout.addLayout(self.tableau_layout)
 
+        # Progress of a running solve
+        self.progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # busy indicator, the number of iterations is not known
+        self.progress_label = QLabel()
+        self.cancel_button = QPushButton("Отменить")
+        self.cancel_button.clicked.connect(self.cancel_solving)
+        self.progress_layout.addWidget(self.progress_bar)
+        self.progress_layout.addWidget(self.progress_label)
+        self.progress_layout.addWidget(self.cancel_button)
+        self.layout.addLayout(self.progress_layout)
+        self.set_progress_visible(False)
+
         # Add navigation buttons
         self.navigation_layout = QHBoxLayout()
         self.prev_button = QPushButton("Предыдущий шаг")
@@ -95,44 +241,60 @@ class SimplexSolutionWindow(QWidget):
 
         self.steps = []
         self.current_step_index = 0
+        self.solver = None
+        self.solver_thread = None
+
+        # Initial tableau of the entered problem and (initial_df, SimplexResult) of the last optimal solve
+        self.initial_step = None
+        self.last_optimal = None
+        self.warm_started = False
 
         # Initialize variable lists
         self.basic_vars = []
         self.non_basic_vars = []
         self.is_maximization = False
+        self.artificial_vars = None
 
-    def add_step(self, tableau_df, basic_vars, non_basic_vars, pivot_row_index=None, pivot_col_index=None,
-                 is_maximization=False):
+    def add_step(self, tableau_df, basic_vars, non_basic_vars, is_maximization=False, last_optimal=None,
+                 artificial_vars=None):
         """
-        Add a new step to the steps list.
+        Set the initial tableau and start solving, the following steps are recorded by record_step.
+        last_optimal is the last_optimal of the previous window. If the problem differs from it only
+        in right-hand sides and goal coefficients, solving starts from its optimal basis.
+        artificial_vars are passed to run_simplex.
         """
         if tableau_df is None:
             return
 
-        self.steps.append({
-            'tableau_df': tableau_df.copy(),
-            'basic_vars': basic_vars.copy(),
-            'non_basic_vars': non_basic_vars.copy(),
-            'pivot_row_index': pivot_row_index,
-            'pivot_col_index': pivot_col_index
-        })
-
+        self.initial_step = (tableau_df, basic_vars.copy(), non_basic_vars.copy())
+        self.last_optimal = last_optimal
+        if last_optimal is not None:
+            initial_df, result = last_optimal
+            warm_df = warm_start_tableau(initial_df, result.tableau_df, result.basic_vars, result.non_basic_vars,
+                                         tableau_df)
+            if warm_df is not None:
+                tableau_df, basic_vars, non_basic_vars = warm_df, result.basic_vars, result.non_basic_vars
+                self.warm_started = True
+
+        self.steps = StepHistory(tableau_df, basic_vars, non_basic_vars)
+        self.current_step_index = 0
         self.basic_vars = basic_vars.copy()
         self.non_basic_vars = non_basic_vars.copy()
+        self.is_maximization = is_maximization
+        self.artificial_vars = artificial_vars
+        self.display_current_steps()
+        self.perform_simplex_method(tableau_df)
 
-        if len(self.steps) == 1:
-            self.is_maximization = is_maximization
-
+    def record_step(self, pivot_row_index, pivot_col_index, checkpoint):
+        """
+        Record the pivot of the last step as a new step.
+        """
+        self.steps.add_pivot(pivot_row_index, pivot_col_index, checkpoint)
         self.update_navigation_buttons()
 
-        check = ""
-        if len(self.steps) == 1:
-            check = self.perform_simplex_method(tableau_df)
-
-        if check is not None and check == "no_solution":
-            self.solution_label.setText("Нет решения (возврат алгоритма преобразования матриц).")
-
-        self.display_current_steps()
+        # Steps recorded while solving are shown only if they are in the displayed pair
+        if len(self.steps) - 1 <= self.current_step_index + 1:
+            self.display_current_steps()
 
     def update_navigation_buttons(self):
         self.prev_button.setEnabled(self.current_step_index > 0)
@@ -140,7 +302,7 @@ class SimplexSolutionWindow(QWidget):
 
     def display_current_steps(self):
         """
-        Display the current pair of steps in the QTableWidgets.
+        Display the current pair of steps in the table views.
         """
         if 0 <= self.current_step_index < len(self.steps):
             step_data = self.steps[self.current_step_index]
@@ -154,7 +316,7 @@ class SimplexSolutionWindow(QWidget):
             )
             self.left_label.setText(f"Шаг {self.current_step_index + 1}")
         else:
-            self.left_table.clear()
+            self.left_model.clear()
             self.left_label.setText("")
 
         next_index = self.current_step_index + 1
@@ -168,57 +330,24 @@ class SimplexSolutionWindow(QWidget):
             )
             self.right_label.setText(f"Шаг {next_index + 1}")
         else:
-            self.right_table.clear()
+            self.right_model.clear()
             self.right_label.setText("")
 
         self.update_navigation_buttons()
 
-    def display_tableau(self, table_widget, tableau_df, basic_vars, non_basic_vars, pivot_row_index=None,
+    def display_tableau(self, table_view, tableau_df, basic_vars, non_basic_vars, pivot_row_index=None,
                         pivot_col_index=None):
         """
-        Display the given tableau DataFrame in the provided QTableWidget.
+        Display the given tableau DataFrame in the provided QTableView.
         """
-        rows, cols = tableau_df.shape
-        table_widget.setRowCount(rows)
-        table_widget.setColumnCount(cols)
-
-        col_labels = ['Si'] + non_basic_vars
-        row_labels = basic_vars + ['F']
-
-        table_widget.setHorizontalHeaderLabels(col_labels)
-        table_widget.setVerticalHeaderLabels(row_labels)
-
-        for i in range(rows):
-            for j in range(cols):
-                value = tableau_df.iloc[i, j]
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table_widget.setItem(i, j, item)
-
-        table_widget.resizeColumnsToContents()
-
-        self.clear_highlights(table_widget)
-
+        pivot = None
         if pivot_row_index is not None and pivot_col_index is not None:
-            pivot_item = table_widget.item(pivot_row_index, pivot_col_index)
-            if pivot_item:
-                if self.is_dark_theme:
-                    pivot_item.setBackground(QColor("blue"))
-                else:
-                    pivot_item.setBackground(QColor("#37AEFE"))
-
-    def clear_highlights(self, table_widget):
-        """
-        Clear all cell highlights in the tableau.
-        """
-        for i in range(table_widget.rowCount()):
-            for j in range(table_widget.columnCount()):
-                item = table_widget.item(i, j)
-                if item:
-                    if self.is_dark_theme:
-                        item.setBackground(QColor("#19232D"))
-                    else:
-                        item.setBackground(QColor("#FAFAFA"))
+            pivot = (pivot_row_index, pivot_col_index)
+
+        model = table_view.model()
+        model.pivot_color = QColor("blue") if self.is_dark_theme else QColor("#37AEFE")
+        model.set_step(tableau_df.to_numpy(), basic_vars + ['F'], ['Si'] + non_basic_vars, pivot)
+        table_view.resizeColumnsToContents()
 
     def prev_steps(self):
         if self.current_step_index > 0:
@@ -234,113 +363,92 @@ class SimplexSolutionWindow(QWidget):
 
     def perform_simplex_method(self, df):
         """
-        Perform the simplex method iterations according to the corrected algorithm.
+        Start the simplex method on a worker thread, every pivot is recorded as a step.
+        The window stays responsive and the solve can be cancelled.
         """
-        iteration = 0
-        max_iterations = 300  # Prevent infinite loops
+        self.calculation_start_time = time.perf_counter()
+        self.solver_thread = QThread()
+        self.solver = SimplexWorker(df, self.basic_vars, self.non_basic_vars, self.is_maximization,
+                                    max_iterations=300, checkpoint_every=self.steps.checkpoint_every,
+                                    artificial_vars=self.artificial_vars)
+        self.solver.moveToThread(self.solver_thread)
+        self.solver_thread.started.connect(self.solver.run)
+        self.solver.pivoted.connect(self.record_step)
+        self.solver.progress.connect(self.show_progress)
+        self.solver.solved.connect(self.on_solved)
+        self.solver.failed.connect(self.on_solve_failed)
+        self.solver.solved.connect(self.solver_thread.quit)
+        self.solver.failed.connect(self.solver_thread.quit)
+        self.solver_thread.finished.connect(self.on_solver_thread_finished)
+
+        self.progress_label.setText("Итерация 0")
+        self.set_progress_visible(True)
+        self.solver_thread.start()
+
+    def show_progress(self, iteration, phase, objective):
+        if phase == 1:
+            # The F row holds the sum of the artificial variables, not the goal
+            self.progress_label.setText(f"Итерация {iteration}, фаза 1: сумма искусственных переменных = "
+                                        f"{format_number(objective)}")
+        else:
+            self.progress_label.setText(f"Итерация {iteration}, F = {format_number(objective)}")
 
-        try:
-            for col in df.columns:
-                df[col] = df[col].apply(lambda x: Fraction(x) if not isinstance(x, Fraction) else x)
-        except ValueError as e:
+    def set_progress_visible(self, visible):
+        self.progress_bar.setVisible(visible)
+        self.progress_label.setVisible(visible)
+        self.cancel_button.setVisible(visible)
+        self.cancel_button.setEnabled(visible)
+
+    def is_solving(self):
+        return self.solver_thread is not None
+
+    def cancel_solving(self):
+        if self.solver is not None:
+            self.solver.cancel()
+            self.cancel_button.setEnabled(False)
+            self.progress_label.setText("Отмена...")
+
+    def stop_solving(self):
+        """
+        Cancel a running solve and wait for the worker thread to finish.
+        """
+        if self.solver_thread is not None:
+            self.solver.cancel()
+            self.solver_thread.quit()
+            self.solver_thread.wait()
+
+    def on_solver_thread_finished(self):
+        self.set_progress_visible(False)
+        self.solver = None
+        self.solver_thread = None
+
+    def on_solve_failed(self, title, message):
+        QMessageBox.warning(self, title, message)
+
+    def on_solved(self, result):
+        self.basic_vars = list(result.basic_vars)
+        self.non_basic_vars = list(result.non_basic_vars)
+        # The final tableau is kept as a checkpoint, it is shown and saved most often
+        self.steps.add_checkpoint(len(self.steps) - 1, result.tableau_df, self.basic_vars, self.non_basic_vars)
+
+        if result.status == "optimal":
+            # The final basis is reached from the entered problem's tableau, the next solve may start from it
+            self.last_optimal = (self.initial_step[0], result)
+            self.calculation_end_time = time.perf_counter()
+            self.elapsed_time = result.elapsed_time
+            self.display_optimal_solution(result.tableau_df)
+            return
+        elif result.status == "no_solution":
             QMessageBox.warning(
                 self,
-                "Value Error",
-                f"Invalid value in the initial tableau: {e}"
+                "Нет решения",
+                "Нет решения для этого задания."
             )
+            self.solution_label.setText("Нет решения (возврат алгоритма преобразования матриц).")
+            return
+        elif result.status == "cancelled":
+            self.solution_label.setText("Вычисление отменено.")
             return
-
-        self.calculation_start_time = time.perf_counter()
-        while iteration < max_iterations:
-            iteration += 1
-
-            try:
-                # Step 1: Check Si column from basic variable rows (excluding 'F' row)
-                basic_rows = list(range(len(self.basic_vars)))  # Row indices
-                negative_Si_rows = [i for i in basic_rows if df.iloc[i, 0] < 0]  # Si column is at index 0
-
-                if negative_Si_rows:
-                    # Rule 3: Take first negative from Si column from basic variable rows
-                    pivot_row_index = negative_Si_rows[0]
-                    # Look for first negative in this row (excluding 'Si' at index 0)
-                    row_series = df.iloc[pivot_row_index, 1:]  # Exclude 'Si'
-                    negative_cols = [j+1 for j, val in enumerate(row_series) if val < 0]  # Adjust for 'Si' at index 0
-                    if negative_cols:
-                        # First negative in this row is pivot element
-                        pivot_col_index = negative_cols[0]
-
-                        # Before performing the pivot operation, save current tableau with the pivot element highlighted
-                        self.steps[-1]['pivot_row_index'] = pivot_row_index
-                        self.steps[-1]['pivot_col_index'] = pivot_col_index
-                        # Perform pivot operation
-                        df = self.pivot_operation(df, pivot_row_index, pivot_col_index)
-
-                        # After pivot operation, save the new tableau without highlighting pivot element
-                        self.add_step(df.copy(), self.basic_vars.copy(), self.non_basic_vars.copy())
-
-                        continue
-                    else:
-                        QMessageBox.warning(
-                            self,
-                            "Нет решения",
-                            "Нет решения для этого задания."
-                        )
-                        return "no_solution"
-                else:
-                    # Rule 2: Check if optimal solution is found
-                    F_row_index = len(df.index) - 1
-                    F_row = df.iloc[F_row_index, 1:]  # Exclude 'Si'
-                    positive_F_entries = [j+1 for j, val in enumerate(F_row) if val > 0]
-                    if not positive_F_entries:
-                        # Optimal solution found
-                        self.calculation_end_time = time.perf_counter()
-                        self.elapsed_time = self.calculation_end_time - self.calculation_start_time
-                        self.display_optimal_solution(df)
-                        return
-                    else:
-                        # Rule 4: Take first positive from F row except Si
-                        for pivot_col_index in positive_F_entries:
-                            # Check if column above selected element in basic variable rows has positive element
-                            positive_rows = [i for i in basic_rows if df.iloc[i, pivot_col_index] > 0]
-                            if not positive_rows:
-                                # No positive elements in this column, continue to next positive element in F row
-                                continue
-                            else:
-                                # Calculate ratios Si / column value for positive elements
-                                ratios = []
-                                for i in positive_rows:
-                                    value = df.iloc[i, pivot_col_index]
-                                    if value != 0:
-                                        ratio = df.iloc[i, 0] / value  # Si column is at index 0
-                                        if ratio >= 0:
-                                            ratios.append((ratio, i))
-                                if ratios:
-                                    # Select pivot row with smallest positive ratio
-                                    pivot_row_index = min(ratios, key=lambda x: x[0])[1]
-
-                                    # Before performing the pivot operation, save the current tableau with the pivot element highlighted
-                                    self.steps[-1]['pivot_row_index'] = pivot_row_index
-                                    self.steps[-1]['pivot_col_index'] = pivot_col_index
-                                    # Perform pivot operation
-                                    df = self.pivot_operation(df, pivot_row_index, pivot_col_index)
-
-                                    # After pivot operation, save the new tableau without highlighting pivot element
-                                    self.add_step(df.copy(), self.basic_vars.copy(), self.non_basic_vars.copy())
-
-                                    break
-                        else:
-                            # Optimal solution found (no positive elements in F row under non-basic variables)
-                            self.calculation_end_time = time.perf_counter()
-                            self.elapsed_time = self.calculation_end_time - self.calculation_start_time
-                            self.display_optimal_solution(df)
-                            return
-            except Exception as e:
-                QMessageBox.warning(
-                    self,
-                    "Error",
-                    f"An error occurred during the simplex method: {e}"
-                )
-                return
 
         QMessageBox.warning(
             self,
@@ -349,67 +457,9 @@ class SimplexSolutionWindow(QWidget):
         )
         return
 
-    def pivot_operation(self, df, pivot_row_index, pivot_col_index):
-        """
-        Perform the pivot operation according to the corrected algorithm.
-        """
-        df = df.copy()
-        y = df.iloc[pivot_row_index, pivot_col_index]  # Pivot element
-
-        if y == 0:
-            QMessageBox.warning(
-                self,
-                "Pivot Error",
-                "Pivot element is zero. Cannot perform pivot operation."
-            )
-            raise Exception("Pivot element is zero. Cannot perform pivot operation.")
-
-        original_df = df.copy()
-
-        try:
-            # Step 1: Compute new values for all elements not in pivot row or pivot column
-            for i in range(len(df)):
-                if i != pivot_row_index:
-                    for j in range(len(df.columns)):
-                        if j != pivot_col_index:
-                            t1 = original_df.iloc[i, j]
-                            y1 = original_df.iloc[i, pivot_col_index]
-                            y2 = original_df.iloc[pivot_row_index, j]
-                            t2 = t1 - (y1 * y2) / y
-                            df.iloc[i, j] = t2
-
-            # Step 2: Update pivot row (excluding pivot element)
-            for j in range(len(df.columns)):
-                if j != pivot_col_index:
-                    t1 = original_df.iloc[pivot_row_index, j]
-                    df.iloc[pivot_row_index, j] = t1 / y
-
-            # Step 3: Update pivot column (excluding pivot element)
-            for i in range(len(df)):
-                if i != pivot_row_index:
-                    t1 = original_df.iloc[i, pivot_col_index]
-                    df.iloc[i, pivot_col_index] = t1 / -y
-
-            # Step 4: Update pivot element
-            df.iloc[pivot_row_index, pivot_col_index] = Fraction(1, y)
-
-            # Swap basic and non-basic variable names
-            leaving_var = self.basic_vars[pivot_row_index]
-            entering_var = self.non_basic_vars[pivot_col_index - 1]  # Adjust for 'Si' at index 0
-
-            # Update basic_vars and non_basic_vars
-            self.basic_vars[pivot_row_index] = entering_var
-            self.non_basic_vars[pivot_col_index - 1] = leaving_var
-
-        except Exception as e:
-            QMessageBox.warning(
-                self,
-                "Pivot Operation Error",
-                f"An error occurred during the pivot operation: {e}"
-            )
-            raise
-
-        return df
+    def closeEvent(self, event):
+        self.stop_solving()
+        super().closeEvent(event)
 
     def display_optimal_solution(self, df):
         """
@@ -440,6 +490,8 @@ class SimplexSolutionWindow(QWidget):
             for var in sorted(variable_values.keys()):
                 solution_str += f"{var} = {variable_values[var]}\n"
 
+            if self.warm_started:
+                solution_str += "\nРешение начато с оптимального базиса предыдущей задачи."
             if hasattr(self, 'elapsed_time'):
                 solution_str += f"\nВремя вычисления: {self.elapsed_time:.10f} секунд"
 
@@ -463,201 +515,7 @@ class SimplexSolutionWindow(QWidget):
         variable_values: dict { "X1": fraction, "X2": fraction, ... }
         returns True if all constraints are satisfied, otherwise False
         """
-        tol = Fraction(0)  # If you want a small tolerance for floats, but here we have Fractions
-
-        for (coeffs, relation, rhs) in self.original_constraints:
-            LHS = sum(coeffs[j] * variable_values.get(f"X{j + 1}", Fraction(0)) for j in range(self.num_vars))
-            if relation == "≤":
-                if LHS > rhs + tol:
-                    return False
-            elif relation == "≥":
-                if LHS < rhs - tol:
-                    return False
-            elif relation == "=":
-                if LHS != rhs:
-                    return False
-            else:
-                # Unexpected relation?
-                return False
-        return True
-
-    def run_simplex_silently(self, df, basic_vars, non_basic_vars, is_maximization):
-        """
-    Run the simplex method without GUI updates.
-    Returns: (final_df, final_basic_vars, final_non_basic_vars, elapsed_time, status)
-    status can be:
-       "optimal"        if an optimal solution is found,
-       "no_solution"     if no feasible solution exists,
-       "iteration_limit" if the maximum number of iterations was reached.
-    """
-        start_time = time.perf_counter()
-
-        try:
-            for col in df.columns:
-                df[col] = df[col].apply(lambda x: Fraction(x) if not isinstance(x, Fraction) else x)
-        except ValueError as e:
-            QMessageBox.warning(
-                self,
-                "Value Error",
-                f"Invalid value in the initial tableau: {e}"
-            )
-            return df, basic_vars, non_basic_vars, 0, "no_solution"
-
-        iteration = 0
-        max_iterations = 1000
-
-        try:
-            while iteration < max_iterations:
-                iteration += 1
-                basic_rows = list(range(len(basic_vars)))
-                negative_Si_rows = [i for i in basic_rows if df.iloc[i, 0] < 0]
-
-                if negative_Si_rows:
-                    pivot_row_index = negative_Si_rows[0]
-                    row_series = df.iloc[pivot_row_index, 1:]
-                    negative_cols = [j + 1 for j, val in enumerate(row_series) if val < 0]
-                    if negative_cols:
-                        pivot_col_index = negative_cols[0]
-                        df, basic_vars, non_basic_vars = self.pivot_operation_silent(df, pivot_row_index,
-                                                                                     pivot_col_index, basic_vars,
-                                                                                     non_basic_vars)
-                        continue
-                    else:
-                        QMessageBox.warning(
-                            self,
-                            "No Solution",
-                            "No solution exists for this problem."
-                        )
-                        end_time = time.perf_counter()
-                        return df, basic_vars, non_basic_vars, (end_time - start_time), "no_solution"
-                else:
-                    F_row_index = len(df.index) - 1
-                    F_row = df.iloc[F_row_index, 1:]
-                    positive_F_entries = [j + 1 for j, val in enumerate(F_row) if val > 0]
-                    if not positive_F_entries:
-                        end_time = time.perf_counter()
-                        elapsed_time = end_time - start_time
-
-                        variable_values = {}
-                        for i, var in enumerate(basic_vars):
-                            variable_values[var] = df.iloc[i, 0]
-                        for var in non_basic_vars:
-                            variable_values[var] = Fraction(0)
-
-                        if not self.final_feasibility_check(variable_values):
-                            return df, basic_vars, non_basic_vars, elapsed_time, "no_solution"
-
-                        return df, basic_vars, non_basic_vars, elapsed_time, "optimal"
-                    else:
-                        done_pivot = False
-                        for pivot_col_index in positive_F_entries:
-                            positive_rows = [i for i in basic_rows if df.iloc[i, pivot_col_index] > 0]
-                            if not positive_rows:
-                                continue
-                            ratios = []
-                            for i in positive_rows:
-                                value = df.iloc[i, pivot_col_index]
-                                if value != 0:
-                                    ratio = df.iloc[i, 0] / value
-                                    if ratio >= 0:
-                                        ratios.append((ratio, i))
-                            if ratios:
-                                pivot_row_index = min(ratios, key=lambda x: x[0])[1]
-                                df, basic_vars, non_basic_vars = self.pivot_operation_silent(df, pivot_row_index,
-                                                                                             pivot_col_index,
-                                                                                             basic_vars, non_basic_vars)
-                                done_pivot = True
-                                break
-                        if not done_pivot:
-                            end_time = time.perf_counter()
-                            elapsed_time = end_time - start_time
-
-                            variable_values = {}
-                            for i, var in enumerate(basic_vars):
-                                variable_values[var] = df.iloc[i, 0]
-                            for var in non_basic_vars:
-                                variable_values[var] = Fraction(0)
-
-                            if not self.final_feasibility_check(variable_values):
-                                return df, basic_vars, non_basic_vars, elapsed_time, "no_solution"
-
-                            return df, basic_vars, non_basic_vars, elapsed_time, "optimal"
-            QMessageBox.warning(
-                self,
-                "Лимит итераций достигнут",
-                "Максимальное чисто итераций алгоритма было достигнуто без нахождения оптимального решения."
-            )
-            end_time = time.perf_counter()
-            return df, basic_vars, non_basic_vars, (end_time - start_time), "iteration_limit"
-
-        except Exception as e:
-            QMessageBox.warning(
-                self,
-                "Error",
-                f"An error occurred during the silent simplex method: {e}"
-            )
-            end_time = time.perf_counter()
-            return df, basic_vars, non_basic_vars, (end_time - start_time), "no_solution"
-
-    def pivot_operation_silent(self, df, pivot_row_index, pivot_col_index, basic_vars, non_basic_vars):
-        """
-        Perform the pivot operation in silent mode (no GUI updates), with error handling.
-        """
-        df = df.copy()
-        y = df.iloc[pivot_row_index, pivot_col_index]
-
-        if y == 0:
-            QMessageBox.warning(
-                self,
-                "Pivot Error",
-                "Pivot element is zero. Cannot perform silent pivot operation."
-            )
-            raise Exception("Pivot element is zero in silent mode.")
-
-        original_df = df.copy()
-
-        try:
-            # Step 1: Compute new values for all elements not in pivot row or column
-            for i in range(len(df)):
-                if i != pivot_row_index:
-                    for j in range(len(df.columns)):
-                        if j != pivot_col_index:
-                            t1 = original_df.iloc[i, j]
-                            y1 = original_df.iloc[i, pivot_col_index]
-                            y2 = original_df.iloc[pivot_row_index, j]
-                            t2 = t1 - (y1 * y2) / y
-                            df.iloc[i, j] = t2
-
-            # Step 2: Update pivot row (excluding pivot element)
-            for j in range(len(df.columns)):
-                if j != pivot_col_index:
-                    t1 = original_df.iloc[pivot_row_index, j]
-                    df.iloc[pivot_row_index, j] = t1 / y
-
-            # Step 3: Update pivot column (excluding pivot element)
-            for i in range(len(df)):
-                if i != pivot_row_index:
-                    t1 = original_df.iloc[i, pivot_col_index]
-                    df.iloc[i, pivot_col_index] = t1 / -y
-
-            # Step 4: Update pivot element
-            df.iloc[pivot_row_index, pivot_col_index] = Fraction(1, y)
-
-            # Swap basic and non-basic variable names
-            leaving_var = basic_vars[pivot_row_index]
-            entering_var = non_basic_vars[pivot_col_index - 1]
-            basic_vars[pivot_row_index] = entering_var
-            non_basic_vars[pivot_col_index - 1] = leaving_var
-
-            return df, basic_vars, non_basic_vars
-
-        except Exception as e:
-            QMessageBox.warning(
-                self,
-                "Pivot Operation Error",
-                f"An error occurred during the silent pivot operation: {e}"
-            )
-            raise
+        return final_feasibility_check(self.original_constraints, self.num_vars, variable_values)
 
     def format_matrix_text(self, df):
         values_str = [[format_number(df.iloc[i, j]) for j in range(df.shape[1])]
@@ -739,10 +597,8 @@ class SimplexSolutionWindow(QWidget):
             cols = len(self.non_basic_vars) + 1
             is_max = self.is_maximization
             task_info = self.task_info
-            start_step = self.steps[0]
-            start_df = start_step['tableau_df']
-            start_basic = start_step['basic_vars']
-            start_non_basic = start_step['non_basic_vars']
+            # The entered problem, not the first step, which is the previous basis after a warm start
+            start_df, start_basic, start_non_basic = self.initial_step
             start_df_renamed = rename_df_headers(start_df, start_basic, start_non_basic)
 
             end_step = self.steps[-1]
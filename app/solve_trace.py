@@ -0,0 +1,57 @@
+# solve_trace.py
+#
+# Trace of a solve: collects the IterationStats the engines pass to their on_iteration hook
+# and writes them as JSON Lines, one object per pivot, so long runs can be examined
+# afterwards, e.g. to see whether pricing, the ratio test or the update dominates.
+#
+#   trace = SolveTrace(open("trace.jsonl", "w"), name="task1")
+#   solve(problem, engine="float", on_iteration=trace)
+#   print(trace.totals())
+
+import json
+
+TIME_FIELDS = ["pricing_time", "ratio_test_time", "update_time"]
+
+
+class SolveTrace:
+    """
+    on_iteration hook that keeps every IterationStats as a dict in records.
+    stream: text file the records are written to as JSON Lines as soon as they arrive, None keeps
+        them only in memory
+    fields: extra keys added to every record, e.g. the problem name
+    """
+
+    def __init__(self, stream=None, **fields):
+        self.stream = stream
+        self.fields = fields
+        self.records = []
+
+    def __call__(self, stats):
+        record = dict(self.fields)
+        record.update(stats.as_dict())
+        self.records.append(record)
+        if self.stream is not None:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def totals(self):
+        return trace_totals(self.records)
+
+
+def trace_totals(records):
+    """
+    Summary of trace records: the number of pivots per phase and the total seconds spent in
+    pricing, the ratio test and the update.
+    """
+    totals = {"iterations": len(records),
+              "phase_1_iterations": sum(1 for record in records if record["phase"] == 1)}
+    for field in TIME_FIELDS:
+        totals[field] = sum(record[field] for record in records)
+    return totals
+
+
+def read_trace(path):
+    """
+    Records of a JSON Lines trace file.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,177 @@
+# sparse_problem.py
+#
+# Sparse storage for problems whose constraint rows have only a few nonzeros.
+# Memory scales with the number of nonzeros instead of num_vars * num_constraints.
+
+from fractions import Fraction
+
+import numpy as np
+
+from simplex_engine import SimplexProblem
+
+
+class CSRMatrix:
+    """
+    Compressed sparse row matrix on NumPy arrays: the nonzeros of row i are
+    data[indptr[i]:indptr[i + 1]] in columns indices[indptr[i]:indptr[i + 1]].
+    data may be float64 or an object array of Fractions.
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data)
+        self.shape = tuple(shape)
+        self._row_of_nnz = None
+
+    @classmethod
+    def from_rows(cls, rows, num_cols):
+        """
+        rows: iterable of (column_indices, values) pairs, one per row.
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for cols, values in rows:
+            indices.extend(cols)
+            data.extend(values)
+            indptr.append(len(indices))
+        return cls(indptr, indices, np.array(data, dtype=object), (len(indptr) - 1, num_cols))
+
+    @classmethod
+    def from_dense(cls, values):
+        values = np.asarray(values)
+        rows, cols = np.nonzero(values)
+        indptr = np.zeros(values.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=values.shape[0]), out=indptr[1:])
+        return cls(indptr, cols, values[rows, cols], values.shape)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    @property
+    def row_of_nnz(self):
+        if self._row_of_nnz is None:
+            self._row_of_nnz = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return self._row_of_nnz
+
+    def row(self, i):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def astype(self, dtype):
+        return CSRMatrix(self.indptr, self.indices, self.data.astype(dtype), self.shape)
+
+    def matvec(self, x):
+        """
+        A @ x for float data.
+        """
+        return np.bincount(self.row_of_nnz, weights=self.data * x[self.indices], minlength=self.shape[0])
+
+    def rmatvec(self, y):
+        """
+        A^T @ y for float data.
+        """
+        return np.bincount(self.indices, weights=self.data * y[self.row_of_nnz], minlength=self.shape[1])
+
+    def transpose(self):
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=indptr[1:])
+        return CSRMatrix(indptr, self.row_of_nnz[order], self.data[order], (self.shape[1], self.shape[0]))
+
+    def column_counts(self):
+        return np.bincount(self.indices, minlength=self.shape[1])
+
+    def select_columns(self, cols):
+        """
+        Keep only the given columns, renumbered 0..len(cols)-1 in the given order.
+        """
+        new_index = np.full(self.shape[1], -1, dtype=np.int64)
+        new_index[np.asarray(cols, dtype=np.int64)] = np.arange(len(cols))
+        mapped = new_index[self.indices]
+        keep = mapped >= 0
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.row_of_nnz[keep], minlength=self.shape[0]), out=indptr[1:])
+        return CSRMatrix(indptr, mapped[keep], self.data[keep], (self.shape[0], len(cols)))
+
+    def scale_rows(self, factors):
+        """
+        Multiply row i by factors[i].
+        """
+        return CSRMatrix(self.indptr, self.indices, self.data * np.asarray(factors)[self.row_of_nnz], self.shape)
+
+    def scale_columns(self, factors):
+        """
+        Multiply column j by factors[j].
+        """
+        return CSRMatrix(self.indptr, self.indices, self.data * np.asarray(factors)[self.indices], self.shape)
+
+
+class SparseProblem:
+    """
+    A linear program with the constraint coefficients in a CSRMatrix of Fractions.
+    goal_values: objective coefficients of X1..Xn
+    goal_type: "min" or "max"
+    relations: one of "≤", "≥", "=" per constraint
+    rhs: right-hand side per constraint
+    """
+
+    def __init__(self, num_vars, goal_values, goal_type, matrix, relations, rhs):
+        self.num_vars = num_vars
+        self.goal_values = list(goal_values)
+        self.goal_type = goal_type
+        self.matrix = matrix
+        self.relations = list(relations)
+        self.rhs = list(rhs)
+
+    @property
+    def num_constraints(self):
+        return len(self.relations)
+
+    @property
+    def is_maximization(self):
+        return self.goal_type == "max"
+
+    @classmethod
+    def from_problem(cls, problem):
+        rows = []
+        for coeffs, _, _ in problem.constraints:
+            cols = [j for j, c in enumerate(coeffs) if c != 0]
+            rows.append((cols, [Fraction(coeffs[j]) for j in cols]))
+        return cls(problem.num_vars, [Fraction(v) for v in problem.goal_values], problem.goal_type,
+                   CSRMatrix.from_rows(rows, problem.num_vars),
+                   [relation for _, relation, _ in problem.constraints],
+                   [Fraction(rhs) for _, _, rhs in problem.constraints])
+
+    def to_problem(self):
+        """
+        Dense SimplexProblem for the tableau engines and the GUI.
+        """
+        constraints = []
+        for i in range(self.num_constraints):
+            coeffs = [Fraction(0)] * self.num_vars
+            cols, values = self.matrix.row(i)
+            for j, value in zip(cols, values):
+                coeffs[j] = value
+            constraints.append((coeffs, self.relations[i], self.rhs[i]))
+        return SimplexProblem(self.num_vars, self.goal_values, self.goal_type, constraints)
+
+    def is_feasible(self, variable_values, tol=1e-6):
+        """
+        Check the answer against the original constraints in floating point.
+        variable_values: dict { "X1": value, ... }
+        """
+        x = np.array([float(variable_values.get(f"X{j + 1}", 0)) for j in range(self.num_vars)])
+        lhs = self.matrix.astype(float).matvec(x)
+        rhs = np.array([float(v) for v in self.rhs])
+        relations = np.array(self.relations, dtype=object)
+        less = relations == "≤"
+        greater = relations == "≥"
+        equal = relations == "="
+        if not (less | greater | equal).all():
+            return False
+        return bool((lhs[less] <= rhs[less] + tol).all()
+                    and (lhs[greater] >= rhs[greater] - tol).all()
+                    and (np.abs(lhs[equal] - rhs[equal]) <= tol).all())
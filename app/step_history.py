@@ -0,0 +1,85 @@
+# step_history.py
+#
+# Solution steps of the simplex method without a full tableau per step. Only the initial
+# tableau, the pivot of every step and a checkpoint tableau every few steps are kept;
+# the tableau of any step is rebuilt by replaying the pivots from the nearest checkpoint.
+
+from collections import OrderedDict
+
+from simplex_engine import TABLEAU_ENGINES, swap_variables
+
+
+class StepHistory:
+    """
+    Behaves like the list of step dicts used by the solution window: len(history) is the
+    number of steps and history[k] is a dict with tableau_df, basic_vars, non_basic_vars,
+    pivot_row_index and pivot_col_index of step k. Step k + 1 is step k after its pivot.
+    Rebuilt steps are kept in an LRU cache of cache_size entries. Pivots are replayed with the
+    exact rational engine, which gives the same Fractions as the solver and is faster to replay.
+    """
+
+    def __init__(self, tableau_df, basic_vars, non_basic_vars, checkpoint_every=10, cache_size=8,
+                 engine="rational"):
+        self.pivots = []
+        self.checkpoints = {0: (tableau_df.copy(), list(basic_vars), list(non_basic_vars))}
+        self.checkpoint_every = checkpoint_every
+        self.cache_size = cache_size
+        self.tableau_class = TABLEAU_ENGINES[engine]
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.pivots) + 1
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("step index out of range")
+        tableau_df, basic_vars, non_basic_vars = self.tableau(k)
+        pivot_row_index, pivot_col_index = self.pivots[k] if k < len(self.pivots) else (None, None)
+        return {
+            'tableau_df': tableau_df,
+            'basic_vars': list(basic_vars),
+            'non_basic_vars': list(non_basic_vars),
+            'pivot_row_index': pivot_row_index,
+            'pivot_col_index': pivot_col_index
+        }
+
+    def add_pivot(self, pivot_row_index, pivot_col_index, checkpoint=None):
+        """
+        Record the pivot of the last step, which creates a new step.
+        checkpoint is (tableau_df, basic_vars, non_basic_vars) of the new step or None.
+        A step without a pivot (both indexes None, the F row was replaced) needs a checkpoint.
+        """
+        self.pivots.append((pivot_row_index, pivot_col_index))
+        if checkpoint is not None:
+            self.add_checkpoint(len(self) - 1, *checkpoint)
+
+    def add_checkpoint(self, k, tableau_df, basic_vars, non_basic_vars):
+        self.checkpoints[k] = (tableau_df, list(basic_vars), list(non_basic_vars))
+
+    def tableau(self, k):
+        """
+        (tableau_df, basic_vars, non_basic_vars) of step k, shared with the cache.
+        """
+        if k in self.checkpoints:
+            return self.checkpoints[k]
+        if k in self._cache:
+            self._cache.move_to_end(k)
+            return self._cache[k]
+
+        # Replay from the closest known step before k
+        start = max([j for j in self.checkpoints if j < k] + [j for j in self._cache if j < k])
+        tableau_df, basic_vars, non_basic_vars = self.checkpoints.get(start) or self._cache[start]
+        tableau = self.tableau_class(tableau_df)
+        basic_vars = list(basic_vars)
+        non_basic_vars = list(non_basic_vars)
+        for pivot_row_index, pivot_col_index in self.pivots[start:k]:
+            tableau.pivot(pivot_row_index, pivot_col_index)
+            swap_variables(basic_vars, non_basic_vars, pivot_row_index, pivot_col_index)
+
+        step = (tableau.to_dataframe(), basic_vars, non_basic_vars)
+        self._cache[k] = step
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return step
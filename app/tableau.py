@@ -0,0 +1,392 @@
+# tableau.py
+#
+# Numeric backends for the simplex tableau. Every backend keeps the layout used by the
+# solution window (Si column at index 0, F row last) and answers the same small set of
+# queries, so the pivot rules in simplex_engine.py do not depend on the number type.
+
+from fractions import Fraction
+import math
+
+import numpy as np
+from pandas import DataFrame
+
+
+class SimplexError(Exception):
+    """
+    Raised when the tableau cannot be processed (e.g. a zero pivot element).
+    """
+
+
+class DenseTableau:
+    """
+    Tableau stored as a dense 2-D NumPy array.
+    With dtype=object the cells are exact Fractions, with dtype=float64 values closer
+    to zero than tol are treated as zero.
+    With inplace=True pivots overwrite the array using one preallocated column buffer and
+    one scratch row instead of allocating new tableaus.
+    Negative Si rows and positive F entries are kept as boolean masks that each pivot
+    refreshes only where it changed the tableau, so the pivot rules do not rescan the values.
+    Blocked columns (artificial variables after phase 1) are never offered as pivot columns.
+    """
+
+    def __init__(self, df, dtype=object, tol=0, inplace=False):
+        self.index = list(df.index)
+        self.columns = list(df.columns)
+        self.tol = tol
+        self.inplace = inplace
+        if dtype is object:
+            self.values = np.array(
+                [[x if isinstance(x, Fraction) else Fraction(x) for x in row] for row in df.itertuples(index=False)],
+                dtype=object
+            ).reshape(df.shape)
+        else:
+            self.values = np.array(
+                [[float(x) for x in row] for row in df.itertuples(index=False)],
+                dtype=dtype
+            ).reshape(df.shape)
+        if inplace:
+            self._col_buffer = np.empty(self.values.shape[0], dtype=self.values.dtype)
+            self._row_buffer = np.empty(self.values.shape[1], dtype=self.values.dtype)
+        self._blocked = np.zeros(self.values.shape[1], dtype=bool)
+        self._blocked[0] = True
+        self._negative_si = self.values[:, 0] < -self.tol
+        self._positive_f = (self.values[-1] > self.tol) & ~self._blocked
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def value(self, i, j):
+        return self.values[i, j]
+
+    def negative_si_rows(self, num_basic):
+        return np.flatnonzero(self._negative_si[:num_basic])
+
+    def negative_cols(self, row_index):
+        # Exclude 'Si' at index 0
+        return np.flatnonzero((self.values[row_index, 1:] < -self.tol) & ~self._blocked[1:]) + 1
+
+    def positive_f_cols(self):
+        return np.flatnonzero(self._positive_f)
+
+    def infeasibility(self, num_basic):
+        """
+        Sum of the negative Si values as a non-negative number.
+        """
+        return -self.values[self.negative_si_rows(num_basic), 0].sum()
+
+    def _update_candidates(self, changed_rows, pivot_row_index):
+        """
+        Refresh the candidate masks after a pivot that changed changed_rows. The F row
+        changes only in the columns where the pivot row is nonzero.
+        """
+        a = self.values
+        self._negative_si[changed_rows] = a[changed_rows, 0] < -self.tol
+        if changed_rows[-1] == len(a) - 1:
+            cols = np.flatnonzero(a[pivot_row_index] != 0)
+            self._positive_f[cols] = (a[-1, cols] > self.tol) & ~self._blocked[cols]
+
+    def block_columns(self, cols):
+        self._blocked[cols] = True
+        self._positive_f[cols] = False
+
+    def row(self, i):
+        """
+        Exact values of row i, a copy.
+        """
+        return self.values[i].copy()
+
+    def set_f_row(self, values):
+        """
+        Replace the F row, e.g. by the phase 1 objective and back.
+        """
+        self.values[-1] = values
+        self._negative_si[-1] = self.values[-1, 0] < -self.tol
+        self._positive_f = (self.values[-1] > self.tol) & ~self._blocked
+
+    def min_ratio_row(self, col_index, num_basic, row_priority=None):
+        """
+        Row with the smallest non-negative ratio Si / value over positive entries of the column,
+        or None if there is no such row. Ties go to the first row, or to the row with the
+        smallest row_priority if it is given.
+        """
+        column = self.values[:num_basic, col_index]
+        rows = np.flatnonzero(column > self.tol)
+        if len(rows) == 0:
+            return None
+        ratios = self.values[rows, 0] / column[rows]
+        valid = ratios >= -self.tol
+        if not valid.any():
+            return None
+        rows = rows[valid]
+        ratios = ratios[valid]
+        best = ratios.min()
+        ties = rows[ratios <= best + self.tol]
+        if row_priority is not None:
+            return int(ties[np.argmin(row_priority[ties])])
+        return int(ties[0])
+
+    def dual_ratio_col(self, row_index):
+        """
+        Column with the smallest ratio F / value over negative entries of the row, or None if
+        the row has no negative entry. Pivoting there keeps F entries that are not positive
+        non-positive. Ties go to the first column.
+        """
+        row = self.values[row_index, 1:]
+        cols = np.flatnonzero((row < -self.tol) & ~self._blocked[1:])
+        if len(cols) == 0:
+            return None
+        ratios = self.values[-1, cols + 1] / row[cols]
+        return int(cols[np.argmax(ratios <= ratios.min() + self.tol)]) + 1
+
+    def pivot(self, pivot_row_index, pivot_col_index):
+        """
+        Pivot as one rank-1 update:
+        a[i, j] - a[i, c] * a[r, j] / y off the pivot row and column,
+        a[r, j] / y on the pivot row, a[i, c] / -y on the pivot column and 1 / y for the pivot.
+        """
+        a = self.values
+        y = a[pivot_row_index, pivot_col_index]
+        if abs(y) <= self.tol:
+            raise SimplexError("Pivot element is zero. Cannot perform pivot operation.")
+
+        changed_rows = np.flatnonzero(a[:, pivot_col_index] != 0)
+
+        if self.inplace:
+            self._pivot_inplace(pivot_row_index, pivot_col_index, y)
+        else:
+            pivot_row = a[pivot_row_index] / y
+            pivot_col = a[:, pivot_col_index] / -y
+            a -= np.outer(a[:, pivot_col_index], pivot_row)
+            a[pivot_row_index] = pivot_row
+            a[:, pivot_col_index] = pivot_col
+            a[pivot_row_index, pivot_col_index] = Fraction(1, y) if a.dtype == object else 1 / y
+
+        self._update_candidates(changed_rows, pivot_row_index)
+
+    def _pivot_inplace(self, pivot_row_index, pivot_col_index, y):
+        """
+        Same update as pivot(), row by row: the pivot row is scaled first and then
+        subtracted from every row with a nonzero in the old pivot column.
+        """
+        a = self.values
+        col = self._col_buffer
+        scratch = self._row_buffer
+
+        np.copyto(col, a[:, pivot_col_index])
+        pivot_row = a[pivot_row_index]
+        np.divide(pivot_row, y, out=pivot_row)
+
+        for i in range(len(col)):
+            factor = col[i]
+            if i == pivot_row_index or factor == 0:
+                continue
+            row = a[i]
+            np.multiply(pivot_row, factor, out=scratch)
+            np.subtract(row, scratch, out=row)
+
+        np.divide(col, -y, out=col)
+        a[:, pivot_col_index] = col
+        a[pivot_row_index, pivot_col_index] = Fraction(1, y) if a.dtype == object else 1 / y
+
+    def float_values(self):
+        """
+        The tableau as float64 for the pricing rules, not a copy for float tableaus.
+        """
+        return self.values if self.values.dtype == np.float64 else self.values.astype(np.float64)
+
+    def float_row(self, i):
+        return np.asarray(self.values[i], dtype=np.float64)
+
+    def float_column(self, j):
+        return np.asarray(self.values[:, j], dtype=np.float64)
+
+    def to_dataframe(self):
+        return DataFrame(self.values.copy(), index=self.index, columns=self.columns)
+
+
+class FractionTableau(DenseTableau):
+    """
+    Exact tableau of Fractions.
+    """
+
+    def __init__(self, df, inplace=False):
+        super().__init__(df, dtype=object, tol=0, inplace=inplace)
+
+
+class FloatTableau(DenseTableau):
+    """
+    float64 tableau, much faster than Fractions but subject to rounding.
+    """
+
+    def __init__(self, df, tol=1e-9, inplace=False):
+        super().__init__(df, dtype=np.float64, tol=tol, inplace=inplace)
+
+
+class RationalTableau:
+    """
+    Exact tableau kept as integer numerators with one positive common denominator per row:
+    cell (i, j) is num[i, j] / den[i]. Numerators are Python ints in an object array, so
+    they never overflow, and no Fraction is created inside the pivot loop.
+    With inplace=True rows are updated one at a time through a single scratch row.
+    Candidate masks are kept up to date like in DenseTableau.
+    """
+
+    def __init__(self, df, inplace=False):
+        self.index = list(df.index)
+        self.columns = list(df.columns)
+        self.tol = 0
+        self.inplace = inplace
+        rows, cols = df.shape
+        self.num = np.zeros((rows, cols), dtype=object)
+        self.den = np.ones(rows, dtype=object)
+        for i, row in enumerate(df.itertuples(index=False)):
+            row = [x if isinstance(x, Fraction) else Fraction(x) for x in row]
+            common = math.lcm(*(x.denominator for x in row)) if row else 1
+            self.num[i] = [x.numerator * (common // x.denominator) for x in row]
+            self.den[i] = common
+        if inplace:
+            self._row_buffer = np.empty(cols, dtype=object)
+        # Denominators are positive, so signs are the signs of the numerators
+        self._blocked = np.zeros(cols, dtype=bool)
+        self._blocked[0] = True
+        self._negative_si = self.num[:, 0] < 0
+        self._positive_f = (self.num[-1] > 0) & ~self._blocked
+
+    @property
+    def shape(self):
+        return self.num.shape
+
+    def value(self, i, j):
+        return Fraction(self.num[i, j], self.den[i])
+
+    def negative_si_rows(self, num_basic):
+        return np.flatnonzero(self._negative_si[:num_basic])
+
+    def negative_cols(self, row_index):
+        return np.flatnonzero((self.num[row_index, 1:] < 0) & ~self._blocked[1:]) + 1
+
+    def block_columns(self, cols):
+        self._blocked[cols] = True
+        self._positive_f[cols] = False
+
+    def row(self, i):
+        return np.array([Fraction(n, self.den[i]) for n in self.num[i]], dtype=object)
+
+    def set_f_row(self, values):
+        values = [x if isinstance(x, Fraction) else Fraction(x) for x in values]
+        common = math.lcm(*(x.denominator for x in values))
+        self.num[-1] = [x.numerator * (common // x.denominator) for x in values]
+        self.den[-1] = common
+        g = math.gcd(common, *self.num[-1])
+        if g > 1:
+            np.floor_divide(self.num[-1], g, out=self.num[-1])
+            self.den[-1] //= g
+        self._negative_si[-1] = self.num[-1, 0] < 0
+        self._positive_f = (self.num[-1] > 0) & ~self._blocked
+
+    def positive_f_cols(self):
+        return np.flatnonzero(self._positive_f)
+
+    def infeasibility(self, num_basic):
+        return -sum((Fraction(self.num[i, 0], self.den[i]) for i in self.negative_si_rows(num_basic)), Fraction(0))
+
+    def min_ratio_row(self, col_index, num_basic, row_priority=None):
+        """
+        Same rule as DenseTableau.min_ratio_row. Within a row the denominator cancels,
+        so the ratio is num[i, 0] / num[i, col] and is compared by cross-multiplication.
+        """
+        best_row = None
+        best_num = best_den = 0
+        for i in np.flatnonzero(self.num[:num_basic, col_index] > 0):
+            si = self.num[i, 0]
+            value = self.num[i, col_index]
+            if si < 0:
+                continue
+            if best_row is None or si * best_den < best_num * value \
+                    or (row_priority is not None and si * best_den == best_num * value
+                        and row_priority[i] < row_priority[best_row]):
+                best_row, best_num, best_den = int(i), si, value
+        return best_row
+
+    def dual_ratio_col(self, row_index):
+        """
+        Same rule as DenseTableau.dual_ratio_col. The row denominators are positive and common to
+        all ratios, so num[-1, j] / num[r, j] are compared by cross-multiplication.
+        """
+        best_col = None
+        best_num = best_den = 0
+        F_row = self.num[-1]
+        for j in self.negative_cols(row_index):
+            value = self.num[row_index, j]
+            # Both denominators are negative, so a / b < c / d is a * d < c * b
+            if best_col is None or F_row[j] * best_den < best_num * value:
+                best_col, best_num, best_den = int(j), F_row[j], value
+        return best_col
+
+    def pivot(self, pivot_row_index, pivot_col_index):
+        """
+        With p = num[r, c]:
+        row i != r: num[i] * p - num[i, c] * num[r], column c: -num[i, c] * den[r], den[i] * p
+        row r: numerators unchanged except num[r, c] = den[r], den[r] = p
+        Rows with a zero in the pivot column do not change. Updated rows are reduced by their gcd.
+        """
+        num = self.num
+        den = self.den
+        r, c = pivot_row_index, pivot_col_index
+        p = num[r, c]
+        if p == 0:
+            raise SimplexError("Pivot element is zero. Cannot perform pivot operation.")
+
+        rows = np.flatnonzero(num[:, c] != 0)
+        rows = rows[rows != r]
+
+        if self.inplace:
+            # The pivot row is not modified until the other rows are done, so it needs no copy
+            pivot_row = num[r]
+            scratch = self._row_buffer
+            for i in rows:
+                factor = num[i, c]
+                row = num[i]
+                np.multiply(row, p, out=row)
+                np.multiply(pivot_row, factor, out=scratch)
+                np.subtract(row, scratch, out=row)
+                row[c] = -factor * den[r]
+                den[i] *= p
+        else:
+            pivot_row = num[r].copy()
+            col = num[rows, c]
+            num[rows] = num[rows] * p - np.outer(col, pivot_row)
+            num[rows, c] = -col * den[r]
+            den[rows] = den[rows] * p
+
+        num[r, c] = den[r]
+        den[r] = p
+
+        rows = np.append(rows, r)
+        if p < 0:
+            num[rows] *= -1
+            den[rows] *= -1
+        for i in rows:
+            g = math.gcd(den[i], *num[i])
+            if g > 1:
+                np.floor_divide(num[i], g, out=num[i])
+                den[i] //= g
+
+        self._negative_si[rows] = num[rows, 0] < 0
+        if len(num) - 1 in rows:
+            cols = np.flatnonzero(num[r] != 0)
+            self._positive_f[cols] = (num[-1, cols] > 0) & ~self._blocked[cols]
+
+    def float_values(self):
+        return self.num.astype(np.float64) / self.den.astype(np.float64)[:, None]
+
+    def float_row(self, i):
+        return self.num[i].astype(np.float64) / float(self.den[i])
+
+    def float_column(self, j):
+        return self.num[:, j].astype(np.float64) / self.den.astype(np.float64)
+
+    def to_dataframe(self):
+        values = [[Fraction(n, d) for n in row] for row, d in zip(self.num, self.den)]
+        return DataFrame(values, index=self.index, columns=self.columns)
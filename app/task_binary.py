@@ -0,0 +1,211 @@
+# task_binary.py
+#
+# Compact binary container for tasks, for caching parsed models and for repeated benchmark runs.
+# A file is a 40 byte header followed by the little-endian arrays of a task_format.TaskArrays:
+#   magic b"SMPXTASK", version (uint32), flags (uint32, bit 0: max), num_vars, num_constraints, nnz (int64)
+#   goal numerators, goal denominators                   int64[num_vars] each
+#   indptr                                               int64[num_constraints + 1]
+#   indices, numerators, denominators                    int64[nnz] each
+#   rhs numerators, rhs denominators                     int64[num_constraints] each
+#   relation codes (0 "≤", 1 "≥", 2 "=")                 uint8[num_constraints]
+# Every int64 array starts at a multiple of 8 bytes, so loading makes NumPy views of the file
+# mapped into memory instead of copying or parsing anything.
+#
+#   python task_binary.py task.txt task.smpx     text to binary
+#   python task_binary.py task.smpx task.txt     and back
+# A container holds one problem, a text file with several problems is not converted.
+
+import mmap
+import sys
+
+import numpy as np
+
+from task_format import TaskArrays, format_task_arrays, read_task_file
+
+MAGIC = b"SMPXTASK"
+VERSION = 1
+FLAG_MAXIMIZE = 1
+
+HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("flags", "<u4"),
+                   ("num_vars", "<i8"), ("num_constraints", "<i8"), ("nnz", "<i8")])
+INT = np.dtype("<i8")
+RELATION_CODES = {"≤": 0, "≥": 1, "=": 2}
+RELATIONS = np.array(["≤", "≥", "="], dtype=object)
+
+
+def task_to_bytes(arrays):
+    """
+    The binary container of a TaskArrays.
+    Raises ValueError if a number does not fit int64, such tasks stay in the text format.
+    """
+    header = np.zeros((), dtype=HEADER)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["flags"] = FLAG_MAXIMIZE if arrays.goal_type == "max" else 0
+    header["num_vars"] = arrays.num_vars
+    header["num_constraints"] = arrays.num_constraints
+    header["nnz"] = len(arrays.indices)
+
+    parts = [header.tobytes()]
+    for values in (arrays.goal_numerators, arrays.goal_denominators, arrays.indptr, arrays.indices,
+                   arrays.numerators, arrays.denominators, arrays.rhs_numerators, arrays.rhs_denominators):
+        parts.append(int64_bytes(values))
+    codes = np.fromiter((RELATION_CODES[relation] for relation in arrays.relations), dtype=np.uint8,
+                        count=arrays.num_constraints)
+    parts.append(codes.tobytes())
+    return b"".join(parts)
+
+
+def int64_bytes(values):
+    if values.dtype == object:
+        # TaskArrays keeps numbers that do not fit int64 as Python ints
+        try:
+            values = np.array(values.tolist(), dtype=INT)
+        except OverflowError:
+            raise ValueError("Числа задачи не помещаются в 64 бита, сохраните её в текстовом формате.")
+    return values.astype(INT, copy=False).tobytes()
+
+
+def task_from_buffer(buffer):
+    """
+    TaskArrays of a binary container in any buffer (bytes, memoryview, mmap). The arrays are
+    read-only views of the buffer, only the list of relations is built.
+    Raises ValueError with a message for the user if the buffer is not a valid container.
+    """
+    if len(buffer) < HEADER.itemsize or bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Файл не является двоичной задачей.")
+    header = np.frombuffer(buffer, dtype=HEADER, count=1)[0]
+    if header["version"] != VERSION:
+        raise ValueError(f"Неподдерживаемая версия двоичной задачи: {header['version']}.")
+    num_vars = int(header["num_vars"])
+    num_constraints = int(header["num_constraints"])
+    nnz = int(header["nnz"])
+    if min(num_vars, num_constraints, nnz) < 0:
+        raise ValueError("Двоичная задача повреждена.")
+    sizes = [num_vars, num_vars, num_constraints + 1, nnz, nnz, nnz, num_constraints, num_constraints]
+    if len(buffer) != HEADER.itemsize + INT.itemsize * sum(sizes) + num_constraints:
+        raise ValueError("Двоичная задача повреждена.")
+
+    arrays = []
+    offset = HEADER.itemsize
+    for size in sizes:
+        arrays.append(np.frombuffer(buffer, dtype=INT, count=size, offset=offset))
+        offset += INT.itemsize * size
+    codes = np.frombuffer(buffer, dtype=np.uint8, count=num_constraints, offset=offset)
+    if (codes >= len(RELATIONS)).any():
+        raise ValueError("Двоичная задача повреждена.")
+    goal_numerators, goal_denominators, indptr, indices, numerators, denominators, rhs_numerators, \
+        rhs_denominators = arrays
+    check_arrays(num_vars, goal_denominators, indptr, indices, denominators, rhs_denominators)
+    goal_type = "max" if header["flags"] & FLAG_MAXIMIZE else "min"
+    return TaskArrays(num_vars, goal_type, goal_numerators, goal_denominators, indptr, indices, numerators,
+                      denominators, RELATIONS[codes].tolist(), rhs_numerators, rhs_denominators)
+
+
+def check_arrays(num_vars, goal_denominators, indptr, indices, denominators, rhs_denominators):
+    """
+    Raise ValueError with a message for the user if the arrays of a container do not make a
+    task: the CSR layout must be consistent, with the columns of every row increasing and in
+    range, and every denominator positive.
+    """
+    if indptr[0] != 0 or indptr[-1] != len(indices) or (np.diff(indptr) < 0).any():
+        raise ValueError("Двоичная задача повреждена: неверные границы ограничений.")
+
+    def fail(k, message):
+        # Constraint of the k-th nonzero
+        i = int(np.searchsorted(indptr, k, side="right")) - 1
+        raise ValueError(f"Двоичная задача повреждена: огр. {i + 1}: {message}")
+
+    bad = np.flatnonzero((indices < 0) | (indices >= num_vars))
+    if len(bad):
+        fail(bad[0], f"неверная переменная X{int(indices[bad[0]]) + 1}")
+    # Within a row the columns increase, np.diff only goes down where a new row starts
+    row_starts = np.zeros(len(indices), dtype=bool)
+    row_starts[indptr[1:-1][indptr[1:-1] < len(indices)]] = True
+    bad = np.flatnonzero((np.diff(indices) <= 0) & ~row_starts[1:])
+    if len(bad):
+        fail(bad[0] + 1, f"переменная X{int(indices[bad[0] + 1]) + 1} указана дважды или не по порядку")
+    bad = np.flatnonzero(denominators <= 0)
+    if len(bad):
+        fail(bad[0], denominator_error(denominators[bad[0]]))
+    bad = np.flatnonzero(rhs_denominators <= 0)
+    if len(bad):
+        raise ValueError(f"Двоичная задача повреждена: огр. {bad[0] + 1}: "
+                         f"{denominator_error(rhs_denominators[bad[0]])}")
+    bad = np.flatnonzero(goal_denominators <= 0)
+    if len(bad):
+        raise ValueError(f"Двоичная задача повреждена: вторая строка: {denominator_error(goal_denominators[bad[0]])}")
+
+
+def denominator_error(denominator):
+    return "деление на ноль в дроби" if denominator == 0 else f"отрицательный знаменатель {int(denominator)}"
+
+
+def write_task_binary(arrays, path):
+    with open(path, "wb") as f:
+        f.write(task_to_bytes(arrays))
+
+
+def read_task_binary(path):
+    """
+    TaskArrays of a binary task file. The file is mapped into memory and stays mapped as long
+    as the arrays are in use.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            raise ValueError("Файл не является двоичной задачей.")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return task_from_buffer(data)
+
+
+def is_task_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_task_file(path):
+    """
+    TaskArrays of a binary or text task file, told apart by the magic bytes.
+    """
+    if is_task_binary(path):
+        return read_task_binary(path)
+    return read_task_file(path)
+
+
+def has_more_problems(path, num_constraints):
+    """
+    Whether a text task file has anything but whitespace after its first problem, the
+    num_constraints + 2 lines from the first line that is not blank.
+    """
+    with open(path, "rb") as f:
+        lines = (line for line in f if line.strip())
+        for _ in zip(range(num_constraints + 2), lines):
+            pass
+        return next(lines, None) is not None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Использование: python task_binary.py ВХОД ВЫХОД (двоичный вход пишется текстом и наоборот)",
+              file=sys.stderr)
+        return 2
+    source, target = argv
+    try:
+        arrays = load_task_file(source)
+        if is_task_binary(source):
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(format_task_arrays(arrays))
+        elif has_more_problems(source, arrays.num_constraints):
+            print(f"{source}: в файле несколько задач, а двоичный файл хранит одну.", file=sys.stderr)
+            return 1
+        else:
+            write_task_binary(arrays, target)
+    except (OSError, ValueError) as e:
+        print(f"{source}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,634 @@
+# task_format.py
+#
+# Text task format shared by the text mode and the GUI-free tools:
+#   first line: num_vars num_constraints
+#   second line: goal coefficients and min/max
+#   then one line per constraint: coefficients, relation (<, <=, >, >=, =) and the right-hand side
+# In the sparse variant the coefficients are written as var:coef pairs (e.g. "3:2.5" or "x3:2.5")
+# and omitted variables are zero. Sparse and dense lines can be mixed.
+# Numbers are integers, decimals with a dot or a comma, or integer fractions a/b.
+
+from fractions import Fraction
+from math import gcd
+import mmap
+import os
+import re
+
+import numpy as np
+
+from simplex_engine import SimplexProblem
+from sparse_problem import CSRMatrix, SparseProblem
+from task_tokenizer import parse_numbers, split_tokens
+
+ALLOWED_RELATIONS = {"<": "≤", "<=": "≤", ">": "≥", ">=": "≥", "=": "="}
+RELATION_TEXT = {"≤": "<=", "≥": ">=", "=": "="}
+
+DECIMAL_RE = re.compile(r"([+-]?)(\d*)\.(\d+)")
+TOKEN_RE = re.compile(r"\S+")
+
+# Bytes of constraint lines read_task_file converts at a time, the temporary arrays of a chunk
+# take some tens of times its size
+CHUNK_SIZE = 1 << 20
+WHITESPACE_BYTES = frozenset(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")
+
+
+def number_parts(text):
+    """
+    (numerator, denominator) of a number token with a positive denominator, not reduced.
+    Raises ValueError with a message for the user.
+    """
+    # Fast paths for integers and plain decimals, anything else gets the full checks below
+    number = text.replace(',', '.')
+    if '/' not in number:
+        dot = number.find('.')
+        try:
+            if dot < 0:
+                return int(number), 1
+            decimals = number[dot + 1:]
+            if decimals.isdigit():
+                return int(number[:dot] + decimals), 10 ** len(decimals)
+        except ValueError:
+            pass
+    return checked_number_parts(text)
+
+
+def checked_number_parts(text):
+    # number_parts for the tokens that are not plain integers or decimals, with the error messages
+    if 'x' in text.lower():
+        raise ValueError(f"Текстовый режим не позволяет вводить имена переменных: '{text}'")
+
+    # Replace comma with dot for decimals
+    text = text.replace(',', '.')
+
+    if '/' in text:
+        parts = text.split('/')
+        if len(parts) != 2:
+            raise ValueError(f"Неверный формат дроби: {text}")
+        num_str, den_str = parts
+        if '.' in num_str or '.' in den_str:
+            raise ValueError("Дроби должны быть только с целыми числами (напр. '3/2', нет '3.5/2').")
+        try:
+            numerator = int(num_str)
+            denominator = int(den_str)
+        except ValueError:
+            raise ValueError(f"Не целые числа в дроби: {text}")
+        if denominator == 0:
+            raise ValueError("Деление на ноль в дроби")
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+    else:
+        # Decimal number, e.g. -3.25 = -325/100
+        match = DECIMAL_RE.fullmatch(text)
+        if match is None:
+            raise ValueError(f"Неверное число: {text}")
+        sign, integral_str, decimal_str = match.groups()
+        denominator = 10 ** len(decimal_str)
+        numerator = int(integral_str or '0') * denominator + int(decimal_str)
+        if sign == '-':
+            numerator = -numerator
+    return numerator, denominator
+
+
+def parse_input_number(text):
+    text = text.strip()
+    if not text:
+        return Fraction(0)
+    return Fraction(*number_parts(text))
+
+
+def format_task_number(num):
+    if num.denominator == 1:
+        return str(num.numerator)
+    else:
+        return f"{num.numerator}/{num.denominator}"
+
+
+def is_sparse_text(text):
+    return ':' in text
+
+
+def int_array(values):
+    # int64 array, or an object array of Python ints if a value does not fit
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
+def lowest_terms(numerators, denominators):
+    """
+    Numerator and denominator arrays divided by their greatest common divisors.
+    """
+    if numerators.dtype == object or denominators.dtype == object:
+        divisors = [gcd(n, d) for n, d in zip(numerators.tolist(), denominators.tolist())]
+        return (np.array([n // g for n, g in zip(numerators.tolist(), divisors)], dtype=object),
+                np.array([d // g for d, g in zip(denominators.tolist(), divisors)], dtype=object))
+    fractional = np.flatnonzero(denominators != 1)
+    if not len(fractional):
+        return numerators, denominators
+    divisors = np.gcd(numerators[fractional], denominators[fractional])
+    numerators = numerators.copy()
+    denominators = denominators.copy()
+    numerators[fractional] //= divisors
+    denominators[fractional] //= divisors
+    return numerators, denominators
+
+
+def token_error(line, line_number, token_index, message, offset=0):
+    """
+    ValueError for the token_index-th token of a line, with its line and column (1-based).
+    offset moves the column inside the token.
+    """
+    column = [match.start() for match in TOKEN_RE.finditer(line)][token_index] + offset + 1
+    return ValueError(f"Строка {line_number}, столбец {column}: {message}")
+
+
+class TaskArrays:
+    """
+    A task read by read_task_arrays: every number as an integer numerator and a positive
+    denominator in lowest terms, the constraint coefficients in CSR form without zeros.
+    goal_numerators, goal_denominators: objective coefficients of X1..Xn
+    indptr, indices, numerators, denominators: nonzeros of row i are at indptr[i]:indptr[i + 1]
+    relations: one of "≤", "≥", "=" per constraint
+    rhs_numerators, rhs_denominators: right-hand sides
+    The integer arrays are int64, or object arrays of Python ints if a number does not fit.
+    """
+
+    def __init__(self, num_vars, goal_type, goal_numerators, goal_denominators, indptr, indices, numerators,
+                 denominators, relations, rhs_numerators, rhs_denominators):
+        self.num_vars = num_vars
+        self.goal_type = goal_type
+        self.goal_numerators = goal_numerators
+        self.goal_denominators = goal_denominators
+        self.indptr = indptr
+        self.indices = indices
+        self.numerators = numerators
+        self.denominators = denominators
+        self.relations = relations
+        self.rhs_numerators = rhs_numerators
+        self.rhs_denominators = rhs_denominators
+
+    @property
+    def num_constraints(self):
+        return len(self.relations)
+
+    @classmethod
+    def from_problem(cls, problem):
+        """
+        TaskArrays of a SimplexProblem or a SparseProblem.
+        """
+        if not isinstance(problem, SparseProblem):
+            problem = SparseProblem.from_problem(problem)
+        values = [Fraction(value) for value in problem.matrix.data.tolist()]
+        nonzero = np.array([value != 0 for value in values], dtype=bool)
+        indptr = np.zeros(problem.num_constraints + 1, dtype=np.int64)
+        np.cumsum(np.bincount(problem.matrix.row_of_nnz[nonzero], minlength=problem.num_constraints),
+                  out=indptr[1:])
+        values = [value for value, keep in zip(values, nonzero.tolist()) if keep]
+        goal_values = [Fraction(value) for value in problem.goal_values]
+        rhs = [Fraction(value) for value in problem.rhs]
+        return cls(problem.num_vars, problem.goal_type,
+                   int_array([v.numerator for v in goal_values]), int_array([v.denominator for v in goal_values]),
+                   indptr, problem.matrix.indices[nonzero],
+                   int_array([v.numerator for v in values]), int_array([v.denominator for v in values]),
+                   list(problem.relations),
+                   int_array([v.numerator for v in rhs]), int_array([v.denominator for v in rhs]))
+
+    def to_sparse_problem(self):
+        matrix = CSRMatrix(self.indptr, self.indices, fraction_array(self.numerators, self.denominators),
+                           (self.num_constraints, self.num_vars))
+        return SparseProblem(self.num_vars, fractions_of(self.goal_numerators, self.goal_denominators),
+                             self.goal_type, matrix, self.relations,
+                             fractions_of(self.rhs_numerators, self.rhs_denominators))
+
+    def to_problem(self):
+        # The dense rows are filled as one object array, the nonzeros in a single assignment
+        rows = np.full((self.num_constraints, self.num_vars), Fraction(0), dtype=object)
+        row_of_nnz = np.repeat(np.arange(self.num_constraints), np.diff(self.indptr))
+        rows[row_of_nnz, self.indices] = fraction_array(self.numerators, self.denominators)
+        rhs = fractions_of(self.rhs_numerators, self.rhs_denominators)
+        constraints = list(zip(rows.tolist(), self.relations, rhs))
+        return SimplexProblem(self.num_vars, fractions_of(self.goal_numerators, self.goal_denominators),
+                              self.goal_type, constraints)
+
+
+def number_strings(numerators, denominators):
+    """
+    Numbers of numerator and denominator arrays as text format tokens ("3", "-5/2").
+    """
+    return [str(n) if d == 1 else f"{n}/{d}" for n, d in zip(numerators.tolist(), denominators.tolist())]
+
+
+def format_task_arrays(arrays, sparse=None):
+    """
+    Text of a TaskArrays in the task format. The constraint lines are written as var:coef pairs
+    if sparse is True, by default when fewer than a third of the coefficients are nonzero.
+    """
+    numbers = number_strings(arrays.numerators, arrays.denominators)
+    if sparse is None:
+        sparse = 3 * len(numbers) < arrays.num_constraints * arrays.num_vars
+    goal = number_strings(arrays.goal_numerators, arrays.goal_denominators)
+    rhs = number_strings(arrays.rhs_numerators, arrays.rhs_denominators)
+    indptr = arrays.indptr.tolist()
+    indices = arrays.indices.tolist()
+    lines = [f"{arrays.num_vars} {arrays.num_constraints}", " ".join(goal + [arrays.goal_type])]
+    for i, relation in enumerate(arrays.relations):
+        row = range(indptr[i], indptr[i + 1])
+        if sparse:
+            coeffs = [f"{indices[k] + 1}:{numbers[k]}" for k in row]
+            if not coeffs and arrays.num_vars:
+                # An empty row still needs a pair, otherwise it reads as a dense line
+                coeffs = ["1:0"]
+        else:
+            coeffs = ["0"] * arrays.num_vars
+            for k in row:
+                coeffs[indices[k]] = numbers[k]
+        lines.append(" ".join(coeffs + [RELATION_TEXT[relation], rhs[i]]))
+    return "\n".join(lines) + "\n"
+
+
+def fractions_of(numerators, denominators):
+    """
+    List of Fractions from numerator and denominator arrays, see fraction_array.
+    """
+    return fraction_array(numerators, denominators).tolist()
+
+
+def fraction_array(numerators, denominators):
+    """
+    Object array of Fractions from numerator and denominator arrays in lowest terms. Models
+    repeat the same few numbers a lot, so every distinct value is built once and the array is
+    filled from them by index.
+    """
+    if numerators.dtype == object or denominators.dtype == object or not len(numerators):
+        # Python ints that do not fit int64 are rare, they are cached one by one
+        cache = {}
+        fractions = np.empty(len(numerators), dtype=object)
+        for k, pair in enumerate(zip(numerators.tolist(), denominators.tolist())):
+            value = cache.get(pair)
+            if value is None:
+                value = cache[pair] = Fraction(*pair)
+            fractions[k] = value
+        return fractions
+
+    # One int64 key per (numerator, denominator) pair, if the key range fits
+    low = int(numerators.min())
+    span = int(numerators.max()) - low + 1
+    den_span = int(denominators.max()) + 1
+    if span * den_span < 1 << 62:
+        keys = (numerators - low) * den_span + denominators
+        if span * den_span <= 4 * len(keys) + (1 << 16):
+            # Small key range: distinct keys by a lookup table, no sorting
+            present = np.zeros(span * den_span, dtype=bool)
+            present[keys] = True
+            distinct = np.flatnonzero(present)
+            lookup = np.empty(len(present), dtype=np.intp)
+            lookup[distinct] = np.arange(len(distinct))
+            inverse = lookup[keys]
+        else:
+            distinct, inverse = np.unique(keys, return_inverse=True)
+        values = np.empty(len(distinct), dtype=object)
+        values[:] = [Fraction(n, d) for n, d in zip((distinct // den_span + low).tolist(),
+                                                       (distinct % den_span).tolist())]
+        return values[inverse]
+
+    pairs, inverse = np.unique(np.stack([numerators, denominators], axis=1), axis=0, return_inverse=True)
+    values = np.empty(len(pairs), dtype=object)
+    values[:] = [Fraction(n, d) for n, d in pairs.tolist()]
+    return values[inverse.reshape(-1)]
+
+
+def read_numbers(tokens, line, line_number, first_token=0):
+    """
+    (numerators, denominators) of number tokens of one line. A line of plain integers is
+    converted in one go, otherwise every token goes through number_parts.
+    first_token is the index of tokens[0] in the line, for the error position.
+    """
+    try:
+        numerators = list(map(int, tokens))
+        return numerators, [1] * len(numerators)
+    except ValueError:
+        pass
+    numerators = []
+    denominators = []
+    for k, token in enumerate(tokens):
+        try:
+            numerator, denominator = number_parts(token)
+        except ValueError as e:
+            raise token_error(line, line_number, first_token + k, e)
+        numerators.append(numerator)
+        denominators.append(denominator)
+    return numerators, denominators
+
+
+def read_terms(tokens, line, line_number, num_vars, where):
+    """
+    Read the coefficient tokens of one line into (column_indices, numerators, denominators),
+    in column order. Zeros of dense lines are kept, read_task_arrays drops them all at once.
+    tokens are either num_vars plain numbers or any number of var:coef pairs.
+    """
+    if not any(':' in token for token in tokens):
+        if len(tokens) != num_vars:
+            raise ValueError(f"{where}: неверный формат.")
+        numerators, denominators = read_numbers(tokens, line, line_number)
+        return range(num_vars), numerators, denominators
+
+    terms = []
+    seen = set()
+    for k, token in enumerate(tokens):
+        var_str, sep, coef_str = token.partition(':')
+        var_str = var_str.lower().lstrip('x')
+        if not sep or not var_str.isdigit() or not 1 <= int(var_str) <= num_vars:
+            raise ValueError(f"{where}: неверная переменная '{token}'")
+        j = int(var_str) - 1
+        if j in seen:
+            raise ValueError(f"{where}: переменная X{j + 1} указана дважды")
+        seen.add(j)
+        if not coef_str:
+            raise ValueError(f"{where}: нет коэффициента у переменной '{token}'")
+        try:
+            numerator, denominator = number_parts(coef_str)
+        except ValueError as e:
+            raise token_error(line, line_number, k, e, len(token) - len(coef_str))
+        terms.append((j, numerator, denominator))
+    terms.sort()
+    return [j for j, _, _ in terms], [n for _, n, _ in terms], [d for _, _, d in terms]
+
+
+def read_task_arrays(text):
+    """
+    Read a task in the dense or sparse text format into a TaskArrays in one pass over its lines,
+    without building a Fraction per token.
+    Raises ValueError with a message for the user if the text is malformed, errors in numbers
+    give the line and column.
+    """
+    stripped = text.strip()
+    if not stripped:
+        raise ValueError("Текст задачи пуст.")
+    # Line number of the first line for error messages
+    first_line_number = text[:len(text) - len(text.lstrip())].count('\n') + 1
+
+    # The constraint lines stay in one buffer, read_dense_block reads them without splitting
+    lines = stripped.split('\n', 2)
+    if len(lines) < 2:
+        raise ValueError("Недостаточно строк.")
+    header = read_header(lines[0], lines[1], first_line_number)
+    num_vars, num_constraints = header[:2]
+    body = lines[2].encode("utf-8") if len(lines) > 2 else None
+    if num_constraints and (body is None or body.count(b'\n') + 1 < num_constraints):
+        raise ValueError("Ограничений меньше, чем указано.")
+    return join_blocks(header, [read_constraint_block(body or b"", num_vars, num_constraints,
+                                                      first_line_number + 2)])
+
+
+def read_task_file(path, chunk_size=CHUNK_SIZE):
+    """
+    read_task_arrays for a task file of any size. The file is mapped into memory and its
+    constraint lines are converted chunk_size bytes at a time, so the text is never held as one
+    string and only the arrays of the nonzero coefficients grow with the file.
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            raise ValueError("Текст задачи пуст.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return read_task_buffer(data, chunk_size)
+
+
+def read_task_buffer(data, chunk_size=CHUNK_SIZE):
+    """
+    read_task_file for the UTF-8 text of a task as bytes or an mmap. Only slices of at most
+    about chunk_size bytes are copied out of data.
+    """
+    # Bounds of the text without the surrounding whitespace, like str.strip()
+    start = 0
+    end = len(data)
+    while start < end and data[start] in WHITESPACE_BYTES:
+        start += 1
+    while end > start and data[end - 1] in WHITESPACE_BYTES:
+        end -= 1
+    if start == end:
+        raise ValueError("Текст задачи пуст.")
+    first_line_number = data[:start].count(b'\n') + 1
+
+    first_end = data.find(b'\n', start, end)
+    if first_end < 0:
+        raise ValueError("Недостаточно строк.")
+    second_end = data.find(b'\n', first_end + 1, end)
+    if second_end < 0:
+        second_end = end
+    header = read_header(decode_text(data[start:first_end]), decode_text(data[first_end + 1:second_end]),
+                         first_line_number)
+    num_vars, num_constraints = header[:2]
+
+    position = second_end + 1
+    if num_constraints and (position > end or count_lines(data, position, end, chunk_size) < num_constraints):
+        raise ValueError("Ограничений меньше, чем указано.")
+
+    # Chunks of whole lines, a line longer than chunk_size makes a chunk of its own
+    blocks = []
+    rows = 0
+    while rows < num_constraints:
+        cut = end
+        if position + chunk_size < end:
+            cut = data.rfind(b'\n', position, position + chunk_size)
+            if cut < 0:
+                cut = data.find(b'\n', position + chunk_size, end)
+                if cut < 0:
+                    cut = end
+        chunk = data[position:cut]
+        num_rows = min(chunk.count(b'\n') + 1, num_constraints - rows)
+        blocks.append(read_constraint_block(chunk, num_vars, num_rows, first_line_number + 2 + rows, rows))
+        rows += num_rows
+        position = cut + 1
+    if not blocks:
+        blocks.append(read_constraint_block(b"", num_vars, 0, first_line_number + 2))
+    return join_blocks(header, blocks)
+
+
+def count_lines(data, start, end, chunk_size):
+    # Lines of data[start:end] counted chunk by chunk, an mmap has no count()
+    return 1 + sum(data[k:min(k + chunk_size, end)].count(b'\n') for k in range(start, end, chunk_size))
+
+
+def decode_text(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("Текст задачи не в кодировке UTF-8.")
+
+
+def read_header(first_line, second_line, first_line_number):
+    """
+    (num_vars, num_constraints, goal_type, goal_numerators, goal_denominators) of the first two
+    lines of a task, the goal arrays in lowest terms.
+    """
+    first_tokens = first_line.split()
+    if len(first_tokens) != 2:
+        raise ValueError("Первая строка: 2 числа (переменные и ограничения).")
+    try:
+        num_vars = int(first_tokens[0])
+        num_constraints = int(first_tokens[1])
+    except ValueError:
+        raise ValueError("Первая строка нечисловая.")
+    if num_vars < 0 or num_constraints < 0:
+        raise ValueError("Первая строка: числа не могут быть отрицательными.")
+
+    second_tokens = second_line.split()
+    if not second_tokens or second_tokens[-1].lower() not in ["min", "max"]:
+        raise ValueError("Должно быть min или max в конце второй строки.")
+    goal_type_str = second_tokens[-1].lower()
+    goal_cols, goal_nums, goal_dens = read_terms(second_tokens[:-1], second_line, first_line_number + 1, num_vars,
+                                                 "Вторая строка")
+    goal_numerators = [0] * num_vars
+    goal_denominators = [1] * num_vars
+    for j, numerator, denominator in zip(goal_cols, goal_nums, goal_dens):
+        goal_numerators[j] = numerator
+        goal_denominators[j] = denominator
+    return (num_vars, num_constraints, goal_type_str,
+            *lowest_terms(int_array(goal_numerators), int_array(goal_denominators)))
+
+
+def read_constraint_block(data, num_vars, num_rows, first_line_number, first_row=0):
+    """
+    Read num_rows constraint lines from the start of data, UTF-8 bytes of at least num_rows whole
+    lines (the callers check the line count, an empty data is one blank line), into
+    (row_counts, indices, numerators, denominators, relations, rhs_numerators, rhs_denominators):
+    the nonzero coefficients of the rows one after another in lowest terms and their count per row.
+    first_line_number and first_row locate the first line in the task for the error messages.
+    """
+    block = read_dense_block(data, num_vars, num_rows, first_line_number) if num_rows else None
+    if block is None:
+        lines = decode_text(data).split('\n')
+        block = read_constraint_lines(lines[:num_rows], num_vars, first_line_number, first_row)
+    row_lengths, indices, numerators, denominators, relations, rhs_numerators, rhs_denominators = block
+
+    numerators, denominators = lowest_terms(numerators, denominators)
+    nonzero = numerators != 0
+    row_counts = np.bincount(np.repeat(np.arange(num_rows), row_lengths)[nonzero], minlength=num_rows)
+    return (row_counts, indices[nonzero], numerators[nonzero], denominators[nonzero], relations,
+            *lowest_terms(rhs_numerators, rhs_denominators))
+
+
+def join_blocks(header, blocks):
+    """
+    TaskArrays of a read_header result and the read_constraint_block results of its constraint
+    lines in order.
+    """
+    num_vars, num_constraints, goal_type, goal_numerators, goal_denominators = header
+    indptr = np.zeros(num_constraints + 1, dtype=np.int64)
+    np.cumsum(np.concatenate([block[0] for block in blocks]), out=indptr[1:])
+    arrays = [np.concatenate([block[k] for block in blocks]) for k in (1, 2, 3, 5, 6)]
+    relations = [relation for block in blocks for relation in block[4]]
+    indices, numerators, denominators, rhs_numerators, rhs_denominators = arrays
+    return TaskArrays(num_vars, goal_type, goal_numerators, goal_denominators, indptr, indices, numerators,
+                      denominators, relations, rhs_numerators, rhs_denominators)
+
+
+def read_constraint_lines(lines, num_vars, first_line_number, first_row=0):
+    """
+    Read constraint lines of the dense or sparse format one by one, first_row is the index of
+    the first line among the constraints.
+    Returns (row_lengths, indices, numerators, denominators, relations, rhs_numerators,
+    rhs_denominators): the coefficients of all rows one after another as arrays, zeros included.
+    """
+    row_lengths = []
+    indices = []
+    numerators = []
+    denominators = []
+    relations = []
+    rhs_numerators = []
+    rhs_denominators = []
+    for i, line in enumerate(lines):
+        line_number = first_line_number + i
+        row_number = first_row + i + 1
+        tokens = line.split()
+        if len(tokens) < 2:
+            raise ValueError(f"Огр. {row_number}: неверный формат.")
+        relation_str = tokens[-2]
+        if relation_str not in ALLOWED_RELATIONS:
+            raise ValueError(f"Огр. {row_number}: неверный знак.")
+        cols, nums, dens = read_terms(tokens[:-2], line, line_number, num_vars, f"Огр. {row_number}")
+        indices.extend(cols)
+        numerators.extend(nums)
+        denominators.extend(dens)
+        row_lengths.append(len(cols))
+        relations.append(ALLOWED_RELATIONS[relation_str])
+        (rhs_numerator,), (rhs_denominator,) = read_numbers(tokens[-1:], line, line_number, len(tokens) - 1)
+        rhs_numerators.append(rhs_numerator)
+        rhs_denominators.append(rhs_denominator)
+    return (np.array(row_lengths, dtype=np.int64), np.array(indices, dtype=np.int64), int_array(numerators),
+            int_array(denominators), relations, int_array(rhs_numerators), int_array(rhs_denominators))
+
+
+def read_dense_block(data, num_vars, num_constraints, first_line_number):
+    """
+    read_constraint_lines for the first num_constraints lines of data, the bytes of dense ASCII
+    lines, with task_tokenizer: the numbers of all lines are converted at once, only tokens it
+    cannot read go through number_parts.
+    Returns None for text that needs read_constraint_lines, that is sparse lines, non-ASCII text,
+    too few lines and lines with a wrong number of tokens or an unknown relation, which get
+    their error message there.
+    """
+    if b':' in data or not data.isascii():
+        return None
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    if len(newlines) < num_constraints - 1:
+        return None
+    if len(newlines) >= num_constraints:
+        # Lines after the constraints are ignored
+        buf = buf[:newlines[num_constraints - 1]]
+    starts, ends = split_tokens(buf)
+    width = num_vars + 2
+    line_of_token = np.searchsorted(newlines[:num_constraints - 1], starts)
+    if (np.bincount(line_of_token, minlength=num_constraints) != width).any():
+        return None
+    starts = starts.reshape(num_constraints, width)
+    ends = ends.reshape(num_constraints, width)
+
+    relations = [ALLOWED_RELATIONS.get(data[start:end].decode("ascii"))
+                 for start, end in zip(starts[:, -2].tolist(), ends[:, -2].tolist())]
+    if None in relations:
+        return None
+
+    # Coefficients and the right-hand side, the relation column is skipped
+    number_cols = list(range(num_vars)) + [num_vars + 1]
+    numerators, denominators, valid = parse_numbers(buf, starts[:, number_cols].ravel(), ends[:, number_cols].ravel())
+    for k in np.flatnonzero(~valid).tolist():
+        i, col = divmod(k, num_vars + 1)
+        token_index = number_cols[col]
+        try:
+            numerator, denominator = number_parts(data[starts[i, token_index]:ends[i, token_index]].decode("ascii"))
+        except ValueError as e:
+            line_start = newlines[i - 1] + 1 if i else 0
+            line_end = newlines[i] if i < len(newlines) else len(data)
+            raise token_error(data[line_start:line_end].decode("ascii"), first_line_number + i, token_index, e)
+        if numerators.dtype != object and not (-2 ** 63 <= numerator < 2 ** 63 and denominator < 2 ** 63):
+            numerators = numerators.astype(object)
+            denominators = denominators.astype(object)
+        numerators[k] = numerator
+        denominators[k] = denominator
+
+    numerators = numerators.reshape(num_constraints, num_vars + 1)
+    denominators = denominators.reshape(num_constraints, num_vars + 1)
+    return (np.full(num_constraints, num_vars, dtype=np.int64),
+            np.tile(np.arange(num_vars, dtype=np.int64), num_constraints),
+            numerators[:, :-1].ravel(), denominators[:, :-1].ravel(), relations,
+            numerators[:, -1].copy(), denominators[:, -1].copy())
+
+
+def parse_task_text(text):
+    """
+    Parse a task in the text format into a SimplexProblem.
+    Raises ValueError with a message for the user if the text is malformed.
+    """
+    return read_task_arrays(text).to_problem()
+
+
+def parse_sparse_task_text(text):
+    """
+    Parse a task in the sparse or dense text format into a SparseProblem without building
+    dense coefficient rows.
+    Raises ValueError with a message for the user if the text is malformed.
+    """
+    return read_task_arrays(text).to_sparse_problem()
@@ -0,0 +1,110 @@
+# task_tokenizer.py
+#
+# Table-driven tokenizer for the text task format. It works on a NumPy array of the bytes of
+# a buffer: a lookup table gives the class of every byte, and the token boundaries and the
+# values of integer, decimal and a/b tokens are computed with array operations for all tokens at once.
+
+import numpy as np
+
+OTHER, SPACE, DIGIT, POINT, SIGN = range(5)
+
+CHAR_CLASSES = np.zeros(256, dtype=np.uint8)
+CHAR_CLASSES[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = SPACE  # the ASCII whitespace of str.split()
+CHAR_CLASSES[ord('0'):ord('9') + 1] = DIGIT
+CHAR_CLASSES[[ord('.'), ord(',')]] = POINT
+CHAR_CLASSES[[ord('+'), ord('-')]] = SIGN
+
+# Classes that cannot appear after the first character of a number
+MISPLACED_INSIDE = np.zeros(5, dtype=bool)
+MISPLACED_INSIDE[[OTHER, SIGN]] = True
+
+# Tokens with more digits may not fit int64 and are left to the caller
+MAX_DIGITS = 18
+MAX_TOKEN_LENGTH = MAX_DIGITS + 2  # with a sign and a point
+POWERS_OF_TEN = 10 ** np.arange(MAX_DIGITS + 1, dtype=np.int64)
+HORNER_FACTORS = np.array([1, 10], dtype=np.int64)  # by "is a digit"
+
+
+def split_tokens(buf):
+    """
+    (starts, ends) of the whitespace separated tokens of a uint8 array.
+    """
+    in_token = (CHAR_CLASSES[buf] != SPACE).view(np.int8)
+    edges = np.diff(in_token, prepend=np.int8(0), append=np.int8(0))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def parse_numbers(buf, starts, ends):
+    """
+    Values of number tokens ("7", "-3", "+2", "2.5", "-,75", "3/-4") given by their byte ranges
+    in a uint8 array, as int64 arrays (numerators, denominators, valid); the denominators are
+    positive, the fractions are not reduced. valid is False for any other token and for tokens
+    with more than MAX_DIGITS digits in a part, their numerator and denominator mean nothing.
+    """
+    numerators, denominators, valid = parse_decimals(buf, starts, ends)
+    # Fractions a/b: both parts are integers of their own
+    candidates = np.flatnonzero(~valid)
+    slashes = find_byte(buf, starts[candidates], ends[candidates], ord('/'))
+    candidates = candidates[slashes >= 0]
+    slashes = slashes[slashes >= 0]
+    if len(candidates):
+        top, top_scale, top_valid = parse_decimals(buf, starts[candidates], slashes)
+        bottom, bottom_scale, bottom_valid = parse_decimals(buf, slashes + 1, ends[candidates])
+        fraction = top_valid & bottom_valid & (top_scale == 1) & (bottom_scale == 1) & (bottom != 0)
+        candidates = candidates[fraction]
+        sign = np.sign(bottom[fraction])
+        numerators[candidates] = top[fraction] * sign
+        denominators[candidates] = bottom[fraction] * sign
+        valid[candidates] = True
+    return numerators, denominators, valid
+
+
+def find_byte(buf, starts, ends, byte):
+    """
+    Offset in buf of the first occurrence of byte in every token, -1 where there is none.
+    """
+    found = np.full(len(starts), -1, dtype=np.int64)
+    lengths = ends - starts
+    for position in range(int(lengths.max()) if len(lengths) else 0):
+        hit = (found < 0) & (lengths > position) & (np.take(buf, starts + position, mode="clip") == byte)
+        found[hit] = starts[hit] + position
+    return found
+
+
+def parse_decimals(buf, starts, ends):
+    """
+    parse_numbers for integer and decimal tokens only.
+    """
+    lengths = ends - starts
+    # Horner's rule over the character positions, each step handles that position of all tokens
+    # at once; tokens longer than MAX_TOKEN_LENGTH cannot be valid and are cut there
+    width = int(min(lengths.max(), MAX_TOKEN_LENGTH)) if len(lengths) else 0
+    shortest = int(lengths.min()) if len(lengths) else 0
+    values = np.zeros(len(starts), dtype=np.int64)
+    # The counters stay below MAX_TOKEN_LENGTH, small integers keep the passes cheap
+    num_digits = np.zeros(len(starts), dtype=np.int8)
+    decimals = np.zeros(len(starts), dtype=np.int8)
+    num_points = np.zeros(len(starts), dtype=np.int8)
+    misplaced = np.zeros(len(starts), dtype=bool)
+    for position in range(width):
+        chars = np.take(buf, starts + position, mode="clip")
+        classes = np.take(CHAR_CLASSES, chars)
+        if position >= shortest:
+            classes[lengths <= position] = SPACE
+        digit = classes == DIGIT
+        # values * 10 + digit for digits, values unchanged for anything else
+        digits = digit.view(np.int8)
+        values = values * np.take(HORNER_FACTORS, digits) + digits * (chars - ord('0'))
+        num_digits += digits
+        if position:
+            decimals += digit & (num_points > 0)
+            misplaced |= np.take(MISPLACED_INSIDE, classes)
+        else:
+            misplaced |= classes == OTHER
+        num_points += classes == POINT
+
+    valid = (~misplaced & (num_points <= 1) & (lengths > 0)
+             & (np.take(CHAR_CLASSES, np.take(buf, ends - 1, mode="clip")) == DIGIT)
+             & (lengths <= MAX_TOKEN_LENGTH) & (num_digits <= MAX_DIGITS))
+    numerators = np.where(np.take(buf, starts, mode="clip") == ord('-'), -values, values)
+    return numerators, POWERS_OF_TEN[np.minimum(decimals, MAX_DIGITS)], valid
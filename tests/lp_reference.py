@@ -0,0 +1,99 @@
+# lp_reference.py
+#
+# Reference answers for the tests: the optimum of a small linear program found by checking
+# every vertex in exact Fractions, and the seeded random problems of the regression sets.
+
+from fractions import Fraction
+from itertools import combinations
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app"))
+
+from simplex_engine import SimplexProblem
+
+
+def solve_linear_system(rows, rhs):
+    # Gauss-Jordan elimination in Fractions, None if the system is singular
+    n = len(rows)
+    matrix = [list(row) + [value] for row, value in zip(rows, rhs)]
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if matrix[r][col] != 0), None)
+        if pivot is None:
+            return None
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        for r in range(n):
+            if r != col and matrix[r][col] != 0:
+                factor = matrix[r][col] / matrix[col][col]
+                matrix[r] = [a - factor * b for a, b in zip(matrix[r], matrix[col])]
+    return [matrix[i][n] / matrix[i][i] for i in range(n)]
+
+
+def satisfies(problem, point):
+    if any(value < 0 for value in point):
+        return False
+    for coeffs, relation, rhs in problem.constraints:
+        lhs = sum(a * x for a, x in zip(coeffs, point))
+        if (relation == "≤" and lhs > rhs) or (relation == "≥" and lhs < rhs) or (relation == "=" and lhs != rhs):
+            return False
+    return True
+
+
+def vertex_optimum(problem):
+    """
+    Optimal goal value of a bounded SimplexProblem as a Fraction, None if it has no feasible
+    point. Every vertex of the constraints and of X >= 0 is tried, so keep the problem small.
+    """
+    n = problem.num_vars
+    planes = [(list(coeffs), rhs) for coeffs, _, rhs in problem.constraints]
+    planes += [([Fraction(int(i == j)) for j in range(n)], Fraction(0)) for i in range(n)]
+    best = None
+    for chosen in combinations(planes, n):
+        point = solve_linear_system([coeffs for coeffs, _ in chosen], [rhs for _, rhs in chosen])
+        if point is None or not satisfies(problem, point):
+            continue
+        value = sum(g * x for g, x in zip(problem.goal_values, point))
+        if best is None or (value > best if problem.is_maximization else value < best):
+            best = value
+    return best
+
+
+def random_problem(rng):
+    """
+    A small mixed problem with "≤", "≥" and "=" rows, some of them with a ±1 column that
+    build_tableau can make basic. The last row bounds the sum of the variables, so the
+    problem is never unbounded.
+    """
+    num_vars = rng.randint(2, 4)
+    constraints = []
+    for _ in range(rng.randint(1, 4)):
+        relation = rng.choice(["≤", "≥", "=", "="])
+        coeffs = [Fraction(rng.randint(-4, 6)) for _ in range(num_vars)]
+        if relation == "=" and rng.random() < 0.4:
+            coeffs[rng.randrange(num_vars)] = Fraction(rng.choice([1, -1]))
+        constraints.append((coeffs, relation, Fraction(rng.randint(-10, 20))))
+    constraints.append(([Fraction(1)] * num_vars, "≤", Fraction(50)))
+    goal = [Fraction(rng.randint(-5, 9)) for _ in range(num_vars)]
+    return SimplexProblem(num_vars, goal, rng.choice(["min", "max"]), constraints)
+
+
+def regression_set(seed=5, count=300):
+    # The seeded problem set the engines are compared on
+    rng = random.Random(seed)
+    return [random_problem(rng) for _ in range(count)]
+
+
+def assert_answer(result, expected, tol=1e-6):
+    """
+    The result of a solve has the reference optimum, or no solution if expected is None.
+    Exact engines must match exactly, float engines within tol.
+    """
+    if expected is None:
+        assert result.status == "no_solution"
+        return
+    assert result.status == "optimal"
+    if isinstance(result.optimal_value, Fraction):
+        assert result.optimal_value == expected
+    else:
+        assert abs(float(result.optimal_value) - float(expected)) < tol
@@ -0,0 +1,56 @@
+# test_bland_fallback.py
+#
+# The fallback to Bland's rule must end the runs that cycle under the other pivot rules.
+
+from fractions import Fraction
+import random
+
+import pytest
+
+from lp_reference import assert_answer, vertex_optimum
+from simplex_engine import SimplexProblem, build_tableau, run_simplex, solve
+
+
+def beale_problem():
+    # Beale's example, which cycles under the largest-coefficient rule
+    constraints = [([Fraction(1, 4), -8, -1, 9], "≤", 0),
+                   ([Fraction(1, 2), -12, Fraction(-1, 2), 3], "≤", 0),
+                   ([0, 0, 1, 0], "≤", 1)]
+    constraints = [([Fraction(c) for c in coeffs], relation, Fraction(rhs)) for coeffs, relation, rhs in constraints]
+    return SimplexProblem(4, [Fraction(-3, 4), Fraction(20), Fraction(-1, 2), Fraction(6)], "min", constraints)
+
+
+@pytest.mark.parametrize("engine", ["fraction", "float", "rational"])
+def test_beale_cycles_without_fallback(engine):
+    df, basic_vars, non_basic_vars = build_tableau(beale_problem())
+    result = run_simplex(df, basic_vars, non_basic_vars, max_iterations=1000, engine=engine, pricing="dantzig",
+                         stall_limit=None)
+    assert result.status == "iteration_limit"
+
+
+@pytest.mark.parametrize("engine", ["fraction", "float", "rational"])
+def test_beale_with_fallback(engine):
+    df, basic_vars, non_basic_vars = build_tableau(beale_problem())
+    result = run_simplex(df, basic_vars, non_basic_vars, max_iterations=1000, engine=engine, pricing="dantzig")
+    assert_answer(result, Fraction(-5, 4))
+    assert result.iterations < 100
+
+
+@pytest.mark.parametrize("engine", ["fraction", "float", "rational", "revised", "hybrid"])
+@pytest.mark.parametrize("pricing", ["first", "dantzig", "devex", "steepest"])
+def test_beale_every_engine_and_rule(engine, pricing):
+    assert_answer(solve(beale_problem(), engine=engine, pricing=pricing), Fraction(-5, 4))
+
+
+@pytest.mark.parametrize("engine", ["fraction", "revised"])
+def test_degenerate_problems_terminate(engine):
+    # Zero right-hand sides make every vertex degenerate
+    rng = random.Random(3)
+    for _ in range(100):
+        num_vars = rng.randint(2, 4)
+        constraints = [([Fraction(rng.randint(-5, 5)) for _ in range(num_vars)], "≤", Fraction(0))
+                       for _ in range(rng.randint(2, 5))]
+        constraints.append(([Fraction(1)] * num_vars, "≤", Fraction(10)))
+        problem = SimplexProblem(num_vars, [Fraction(rng.randint(-5, 5)) for _ in range(num_vars)],
+                                 rng.choice(["min", "max"]), constraints)
+        assert_answer(solve(problem, engine=engine, pricing="dantzig"), vertex_optimum(problem))
@@ -0,0 +1,58 @@
+# test_dual_simplex.py
+#
+# Cost-minimising problems with "≥" rows start dual feasible: the dual simplex pivots must keep
+# the F row non-positive and reach the optimum.
+
+from fractions import Fraction
+import random
+
+import pytest
+
+from lp_reference import assert_answer, vertex_optimum
+from simplex_engine import SimplexProblem, build_tableau, run_simplex, solve
+
+
+def diet_problem(rng):
+    num_vars = rng.randint(2, 4)
+    constraints = [([Fraction(rng.randint(0, 9)) for _ in range(num_vars)], "≥", Fraction(rng.randint(5, 60)))
+                   for _ in range(rng.randint(2, 4))]
+    constraints.append(([Fraction(1)] * num_vars, "≤", Fraction(100)))
+    return SimplexProblem(num_vars, [Fraction(rng.randint(1, 9)) for _ in range(num_vars)], "min", constraints)
+
+
+def diet_problems(count=100):
+    rng = random.Random(16)
+    return [diet_problem(rng) for _ in range(count)]
+
+
+@pytest.mark.parametrize("engine", ["fraction", "float", "rational"])
+def test_f_row_stays_dual_feasible(engine):
+    for problem in diet_problems():
+        df, basic_vars, non_basic_vars = build_tableau(problem)
+        F_values = []
+
+        def on_pivot(tableau, basic_vars, non_basic_vars, pivot_row_index, pivot_col_index):
+            assert not len(tableau.positive_f_cols())
+            F_values.append(tableau.value(tableau.shape[0] - 1, 0))
+
+        result = run_simplex(df, basic_vars, non_basic_vars, engine=engine, on_pivot=on_pivot)
+        assert_answer(result, vertex_optimum(problem))
+        # The minimized F only grows until the rows are feasible
+        assert F_values == sorted(F_values)
+
+
+def test_revised_objective_grows():
+    for problem in diet_problems():
+        objectives = []
+        result = solve(problem, engine="revised", on_iteration=lambda stats: objectives.append(stats.objective))
+        assert_answer(result, vertex_optimum(problem))
+        assert all(b >= a - 1e-9 for a, b in zip(objectives, objectives[1:]))
+
+
+@pytest.mark.parametrize("engine", ["fraction", "float", "rational", "revised"])
+def test_row_without_negative_entry_has_no_solution(engine):
+    # -X1 - X2 >= 3 cannot hold for X >= 0, the dual ratio test finds no entering column
+    problem = SimplexProblem(2, [Fraction(1), Fraction(1)], "min",
+                             [([Fraction(1), Fraction(2)], "≥", Fraction(4)),
+                              ([Fraction(-1), Fraction(-1)], "≥", Fraction(3))])
+    assert solve(problem, engine=engine).status == "no_solution"
@@ -0,0 +1,87 @@
+# test_phase1.py
+#
+# "=" rows without a basic variable start from artificial variables, whose sum phase 1 drives
+# to zero before the goal is restored.
+
+from fractions import Fraction
+import random
+
+import pytest
+
+from lp_reference import assert_answer, vertex_optimum
+from simplex_engine import SimplexProblem, artificial_vars, build_tableau, run_simplex, solve
+
+ENGINES = ["fraction", "float", "rational", "revised", "hybrid"]
+
+
+def fractions(values):
+    return [Fraction(value) for value in values]
+
+
+def equality_problem(rng):
+    # Coefficients from 2 to 6, so no "=" row has a ±1 column build_tableau could make basic
+    num_vars = rng.randint(2, 4)
+    constraints = [(fractions(rng.randint(2, 6) for _ in range(num_vars)), "=", Fraction(rng.randint(10, 40)))
+                   for _ in range(rng.randint(1, 2))]
+    constraints.append((fractions([1] * num_vars), "≤", Fraction(50)))
+    goal = fractions(rng.randint(-5, 9) for _ in range(num_vars))
+    return SimplexProblem(num_vars, goal, rng.choice(["min", "max"]), constraints)
+
+
+def equality_problems(count=100):
+    rng = random.Random(17)
+    return [equality_problem(rng) for _ in range(count)]
+
+
+def test_equality_rows_get_artificial_variables():
+    for problem in equality_problems():
+        _, basic_vars, _ = build_tableau(problem)
+        relations = [relation for _, relation, _ in problem.constraints]
+        assert len(artificial_vars(relations, basic_vars, problem.num_vars)) == relations.count("=")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_equality_problems(engine):
+    for problem in equality_problems():
+        assert_answer(solve(problem, engine=engine), vertex_optimum(problem))
+
+
+def test_f_row_replaced_at_start_and_end_of_phase_1():
+    for problem in equality_problems(20):
+        df, basic_vars, non_basic_vars = build_tableau(problem)
+        relations = [relation for _, relation, _ in problem.constraints]
+        artificial = artificial_vars(relations, basic_vars, problem.num_vars)
+        replaced = []
+
+        def on_pivot(tableau, basic_vars, non_basic_vars, pivot_row_index, pivot_col_index):
+            if pivot_row_index is None:
+                replaced.append(set(basic_vars))
+
+        result = run_simplex(df, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                             constraints=problem.constraints, num_vars=problem.num_vars, on_pivot=on_pivot,
+                             artificial_vars=artificial)
+        if result.status != "optimal":
+            continue
+        assert len(replaced) == 2
+        # The artificial variables are basic at the start and have left the basis at the end
+        assert replaced[0] >= set(artificial) and not replaced[1] & set(artificial)
+
+
+@pytest.mark.parametrize("engine", ["fraction", "revised"])
+def test_phase_1_objective(engine):
+    for problem in equality_problems(20):
+        stats = []
+        result = solve(problem, engine=engine, on_iteration=stats.append)
+        phase_1 = [s.objective for s in stats if s.phase == 1]
+        assert phase_1 and all(b <= a + 1e-9 for a, b in zip(phase_1, phase_1[1:]))
+        if result.status == "optimal":
+            assert abs(float(phase_1[-1])) < 1e-9
+            assert all(s.phase == 2 for s in stats[len(phase_1):])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_inconsistent_equalities(engine):
+    # The sum of the artificial variables cannot reach zero
+    problem = SimplexProblem(2, fractions([1, 1]), "max",
+                             [(fractions([2, 3]), "=", Fraction(6)), (fractions([2, 3]), "=", Fraction(12))])
+    assert solve(problem, engine=engine).status == "no_solution"
@@ -0,0 +1,101 @@
+# test_presolve.py
+#
+# Presolve reductions and postsolve: the answer of the reduced problem, mapped back to
+# X1..Xn, must be the answer of the original problem.
+
+from fractions import Fraction
+import random
+
+import pytest
+
+from lp_reference import assert_answer, satisfies, vertex_optimum
+from presolve import presolve_problem
+from simplex_engine import SimplexProblem, solve
+from sparse_problem import SparseProblem
+
+
+def fractions(values):
+    return [Fraction(value) for value in values]
+
+
+def reducible_problem(rng):
+    # Singleton, empty and proportional rows that presolve can fold into bounds
+    num_vars = rng.randint(2, 5)
+    constraints = []
+    for _ in range(rng.randint(1, 6)):
+        coeffs = [Fraction(0)] * num_vars
+        for j in rng.sample(range(num_vars), rng.choice([0, 1, 1, 2, num_vars])):
+            coeffs[j] = Fraction(rng.randint(-4, 6))
+        constraints.append((coeffs, rng.choice(["≤", "≥", "="]), Fraction(rng.randint(-5, 20))))
+        if rng.random() < 0.3:
+            factor = Fraction(rng.choice([-2, -1, 2, 3]))
+            constraints.append(([c * factor for c in coeffs], rng.choice(["≤", "≥", "="]),
+                                Fraction(rng.randint(-5, 20))))
+    constraints.append((fractions([1] * num_vars), "≤", Fraction(50)))
+    goal = fractions(rng.randint(-5, 9) for _ in range(num_vars))
+    return SimplexProblem(num_vars, goal, rng.choice(["min", "max"]), constraints)
+
+
+def reducible_problems(count=300):
+    rng = random.Random(18)
+    return [reducible_problem(rng) for _ in range(count)]
+
+
+PROBLEMS = reducible_problems()
+EXPECTED = [vertex_optimum(problem) for problem in PROBLEMS]
+
+
+def goal_value(problem, values):
+    return sum(g * values[f"X{j + 1}"] for j, g in enumerate(problem.goal_values))
+
+
+def test_presolve_reduces():
+    removed_rows = removed_columns = 0
+    for problem in PROBLEMS:
+        presolved = presolve_problem(problem)
+        removed_rows += presolved.removed_rows
+        removed_columns += presolved.removed_columns
+    assert removed_rows > 0 and removed_columns > 0
+
+
+def test_postsolve_exact():
+    for problem, expected in zip(PROBLEMS, EXPECTED):
+        result = solve(problem, presolve=True)
+        assert_answer(result, expected)
+        if expected is not None:
+            point = [result.variable_values[f"X{j + 1}"] for j in range(problem.num_vars)]
+            assert satisfies(problem, point)
+            assert goal_value(problem, result.variable_values) == result.optimal_value
+
+
+@pytest.mark.parametrize("engine", ["float", "rational", "revised", "hybrid"])
+def test_presolve_every_engine(engine):
+    for problem, expected in zip(PROBLEMS[:100], EXPECTED):
+        assert_answer(solve(problem, engine=engine, presolve=True), expected)
+
+
+def test_sparse_problem():
+    for problem, expected in zip(PROBLEMS[:100], EXPECTED):
+        assert_answer(solve(SparseProblem.from_problem(problem), engine="revised", presolve=True), expected)
+
+
+def test_singleton_rows_become_bounds():
+    # X1 >= 2 and X2 <= 3 are bounds, X1 is shifted by its lower bound and X2's bound comes back as a row
+    problem = SimplexProblem(2, fractions([1, 2]), "max",
+                             [(fractions([1, 0]), "≥", Fraction(2)), (fractions([0, 1]), "≤", Fraction(3)),
+                              (fractions([1, 1]), "≤", Fraction(10))])
+    presolved = presolve_problem(problem)
+    assert presolved.lower == fractions([2, 0])
+    assert presolved.problem.num_constraints == 2
+    result = presolved.postsolve(solve(presolved.problem))
+    assert result.status == "optimal" and result.optimal_value == 13
+    assert result.variable_values == {"X1": 7, "X2": 3}
+
+
+def test_infeasible_found_by_presolve():
+    problem = SimplexProblem(2, fractions([1, 1]), "min",
+                             [(fractions([1, 0]), "≥", Fraction(5)), (fractions([2, 0]), "≤", Fraction(4))])
+    presolved = presolve_problem(problem)
+    assert presolved.problem is None
+    assert presolved.postsolve().status == "no_solution"
+    assert solve(problem, presolve=True).status == "no_solution"
@@ -0,0 +1,72 @@
+# test_revised_simplex.py
+#
+# The revised engine against the tableau engines and the dense LU of its basis factorization.
+
+import random
+
+import numpy as np
+import pytest
+
+from lp_reference import assert_answer, regression_set, vertex_optimum
+from revised_simplex import LU_BLOCK_SIZE, build_sparse_model, lu_factor, lu_solve, run_revised_simplex
+from simplex_engine import SimplexProblem, artificial_vars, solve
+from sparse_problem import SparseProblem
+from tableau import SimplexError
+
+PROBLEMS = regression_set()
+EXPECTED = [vertex_optimum(problem) for problem in PROBLEMS]
+
+
+@pytest.mark.parametrize("engine", ["fraction", "float", "rational", "revised", "hybrid"])
+def test_regression_set(engine):
+    for problem, expected in zip(PROBLEMS, EXPECTED):
+        assert_answer(solve(problem, engine=engine), expected)
+
+
+def test_revised_follows_float_tableau():
+    # Same pivot rules on the same scaled model, so the same path
+    for problem in PROBLEMS:
+        tableau = solve(problem, engine="float")
+        revised = solve(problem, engine="revised")
+        assert (revised.status, revised.iterations) == (tableau.status, tableau.iterations)
+
+
+@pytest.mark.parametrize("n", [1, 2, LU_BLOCK_SIZE - 1, LU_BLOCK_SIZE, LU_BLOCK_SIZE + 1, 3 * LU_BLOCK_SIZE + 5])
+def test_lu_solve(n):
+    rng = np.random.default_rng(n)
+    K = rng.normal(size=(n, n))
+    v = rng.normal(size=n)
+    factors = lu_factor(K)
+    assert np.allclose(K @ lu_solve(factors, v), v)
+    assert np.allclose(K.T @ lu_solve(factors, v, trans=True), v)
+
+
+def test_lu_factor_pivots():
+    # A zero on the diagonal needs a row swap
+    K = np.array([[0.0, 2.0, 1.0], [1.0, 1.0, 0.0], [3.0, 0.0, 1.0]])
+    v = np.array([1.0, 2.0, 3.0])
+    assert np.allclose(K @ lu_solve(lu_factor(K), v), v)
+
+
+def test_lu_factor_singular():
+    with pytest.raises(SimplexError):
+        lu_factor(np.array([[1.0, 2.0], [2.0, 4.0]]))
+    with pytest.raises(SimplexError):
+        lu_factor(np.zeros((LU_BLOCK_SIZE + 3, LU_BLOCK_SIZE + 3)))
+
+
+def test_refactor_frequency_does_not_change_answer():
+    # Eta vectors on top of the LU factors give the same answer as refactoring on every pivot
+    rng = random.Random(11)
+    n, m = 40, 30
+    constraints = [([rng.randint(0, 9) for _ in range(n)], "≤", rng.randint(50, 99)) for _ in range(m)]
+    problem = SparseProblem.from_problem(SimplexProblem(n, [rng.randint(1, 9) for _ in range(n)], "max", constraints))
+    answers = []
+    for refactor_frequency in (1, 8, 1000):
+        A, b, c, basic_cost, basic_vars, non_basic_vars = build_sparse_model(problem)
+        result = run_revised_simplex(A, b, c, basic_vars, non_basic_vars, is_maximization=True,
+                                     refactor_frequency=refactor_frequency, basic_cost=basic_cost,
+                                     artificial_vars=artificial_vars(problem.relations, basic_vars, n))
+        assert result.status == "optimal" and result.iterations > 8
+        answers.append(result.optimal_value)
+    assert np.allclose(answers, answers[0])
@@ -0,0 +1,129 @@
+# test_task_binary.py
+#
+# The binary task container: round trips with the text format, rejection of damaged files,
+# the converter and batch solves of binary files.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app"))
+
+from batch_solve import iter_sources, main as batch_main
+from lp_reference import regression_set
+from task_binary import (HEADER, INT, is_task_binary, load_task_file, main, read_task_binary, task_from_buffer,
+                         task_to_bytes, write_task_binary)
+from task_format import TaskArrays, format_task_arrays, parse_task_text, read_task_arrays
+
+TEXT = "4 3\n1 -2 3/4 0 max\n1 0 2,5 -1 <= 10\n2:-1/3 4:7 >= 1/2\n1 1 1 1 = 6\n"
+
+
+def same_arrays(a, b):
+    assert (a.num_vars, a.goal_type, a.relations) == (b.num_vars, b.goal_type, b.relations)
+    for name in ("goal_numerators", "goal_denominators", "indptr", "indices", "numerators", "denominators",
+                 "rhs_numerators", "rhs_denominators"):
+        assert getattr(a, name).tolist() == getattr(b, name).tolist()
+
+
+def test_round_trip():
+    arrays = read_task_arrays(TEXT)
+    same_arrays(task_from_buffer(task_to_bytes(arrays)), arrays)
+    for problem in regression_set(count=50):
+        arrays = TaskArrays.from_problem(problem)
+        same_arrays(task_from_buffer(task_to_bytes(arrays)), arrays)
+
+
+def test_file_round_trip(tmp_path):
+    arrays = read_task_arrays(TEXT)
+    path = tmp_path / "task.smpx"
+    write_task_binary(arrays, path)
+    assert is_task_binary(path)
+    same_arrays(read_task_binary(path), arrays)
+    same_arrays(load_task_file(path), arrays)
+    text_path = tmp_path / "task.txt"
+    text_path.write_text(TEXT, encoding="utf-8")
+    assert not is_task_binary(text_path)
+    same_arrays(load_task_file(text_path), arrays)
+
+
+def test_numbers_beyond_int64():
+    with pytest.raises(ValueError):
+        task_to_bytes(read_task_arrays(f"1 1\n{10 ** 30} max\n1 <= 1"))
+
+
+def damaged(data, array, position, value):
+    # data with element position of the array-th int64 array after the header set to value,
+    # TEXT has 4 variables, 3 constraints and 9 nonzeros
+    sizes = [4, 4, 3 + 1, 9, 9, 9, 3, 3]
+    buffer = bytearray(data)
+    offset = HEADER.itemsize + INT.itemsize * (sum(sizes[:array]) + position)
+    buffer[offset:offset + INT.itemsize] = np.array([value], dtype=INT).tobytes()
+    return bytes(buffer)
+
+
+@pytest.mark.parametrize("array, position, value, message", [
+    (2, 1, 9, "неверные границы ограничений"),
+    (2, 0, 1, "неверные границы ограничений"),
+    (3, 0, 4, "огр. 1: неверная переменная X5"),
+    (3, 0, -1, "огр. 1: неверная переменная X0"),
+    (3, 4, 0, "огр. 2: переменная X1 указана дважды или не по порядку"),
+    (5, 3, 0, "огр. 2: деление на ноль в дроби"),
+    (5, 0, -2, "огр. 1: отрицательный знаменатель -2"),
+    (7, 1, 0, "огр. 2: деление на ноль в дроби"),
+    (1, 2, 0, "вторая строка: деление на ноль в дроби"),
+])
+def test_damaged_arrays(array, position, value, message):
+    data = task_to_bytes(read_task_arrays(TEXT))
+    with pytest.raises(ValueError) as error:
+        task_from_buffer(damaged(data, array, position, value))
+    assert message in error.value.args[0]
+
+
+def test_damaged_container():
+    data = task_to_bytes(read_task_arrays(TEXT))
+    for broken in (b"", data[:20], b"NOTATASK" + data[8:], data[:-1], data + b"\0"):
+        with pytest.raises(ValueError):
+            task_from_buffer(broken)
+    header = np.frombuffer(data, dtype=HEADER, count=1).copy()
+    header["version"] = 99
+    with pytest.raises(ValueError):
+        task_from_buffer(header.tobytes() + data[HEADER.itemsize:])
+    # Relation code 3 does not exist
+    with pytest.raises(ValueError):
+        task_from_buffer(data[:-1] + b"\3")
+
+
+def test_converter(tmp_path):
+    text_path = tmp_path / "task.txt"
+    text_path.write_text(TEXT, encoding="utf-8")
+    assert main([str(text_path), str(tmp_path / "task.smpx")]) == 0
+    assert main([str(tmp_path / "task.smpx"), str(tmp_path / "back.txt")]) == 0
+    back = parse_task_text((tmp_path / "back.txt").read_text(encoding="utf-8"))
+    assert back.constraints == parse_task_text(TEXT).constraints
+
+
+def test_converter_refuses_several_problems(tmp_path):
+    text_path = tmp_path / "tasks.txt"
+    text_path.write_text(TEXT + "\n" + TEXT, encoding="utf-8")
+    assert main([str(text_path), str(tmp_path / "tasks.smpx")]) == 1
+    assert not (tmp_path / "tasks.smpx").exists()
+    # Trailing blank lines are not another problem
+    text_path.write_text(TEXT + "\n\n", encoding="utf-8")
+    assert main([str(text_path), str(tmp_path / "task.smpx")]) == 0
+
+
+def test_batch_solve_reads_binary(tmp_path, capsys):
+    for k, problem in enumerate(regression_set(seed=25, count=5)):
+        arrays = TaskArrays.from_problem(problem)
+        write_task_binary(arrays, tmp_path / f"{k}.smpx")
+        (tmp_path / f"{k}.txt").write_text(format_task_arrays(arrays), encoding="utf-8")
+    items = list(iter_sources([str(tmp_path)]))
+    assert len(items) == 10 and all(error is None for _, _, error in items)
+    for engine in ("fraction", "revised"):
+        assert batch_main([str(tmp_path), "--engine", engine]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        answers = {line.split("\t")[0]: line.split("\t")[1:] for line in lines}
+        for k in range(5):
+            assert answers[f"{tmp_path / f'{k}.smpx'}#1"] == answers[f"{tmp_path / f'{k}.txt'}#1"]
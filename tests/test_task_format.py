@@ -0,0 +1,127 @@
+# test_task_format.py
+#
+# Reading the text task format: line endings, number forms, sparse lines, chunked file reads
+# and the line and column of errors.
+
+from fractions import Fraction
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app"))
+
+from task_format import (format_task_arrays, parse_input_number, parse_sparse_task_text, parse_task_text,
+                         read_task_arrays, read_task_buffer, read_task_file)
+
+
+def constraints_of(problem):
+    return [(list(coeffs), relation, rhs) for coeffs, relation, rhs in problem.constraints]
+
+
+def test_crlf_line_endings():
+    text = "2 2\n1 2 max\n1 1 <= 4\n3 -1 >= 1/2\n"
+    lf = parse_task_text(text)
+    crlf = parse_task_text(text.replace("\n", "\r\n"))
+    assert crlf.goal_values == lf.goal_values and crlf.goal_type == "max"
+    assert constraints_of(crlf) == constraints_of(lf)
+
+
+def test_number_forms():
+    problem = parse_task_text("3 1\n1,5 -2.25 3/4 min\n-6/8 2/-4 0,0 = 7/2")
+    assert problem.goal_values == [Fraction(3, 2), Fraction(-9, 4), Fraction(3, 4)]
+    coeffs, relation, rhs = problem.constraints[0]
+    assert coeffs == [Fraction(-3, 4), Fraction(-1, 2), 0]
+    assert relation == "=" and rhs == Fraction(7, 2)
+
+
+def test_arrays_in_lowest_terms():
+    arrays = read_task_arrays("2 1\n4/6 2,50 max\n-10/4 0 <= 6/3")
+    assert arrays.goal_numerators.tolist() == [2, 5] and arrays.goal_denominators.tolist() == [3, 2]
+    # Zeros are not stored
+    assert arrays.numerators.tolist() == [-5] and arrays.denominators.tolist() == [2]
+    assert arrays.rhs_numerators.tolist() == [2] and arrays.rhs_denominators.tolist() == [1]
+
+
+def test_tokens_match_parse_input_number():
+    rng = random.Random(23)
+    tokens = [rng.choice([str(rng.randint(-99, 99)), f"{rng.randint(-9, 9)}.{rng.randint(0, 999)}",
+                          f"{rng.randint(-9, 9)},{rng.randint(0, 99)}", f"{rng.randint(-20, 20)}/{rng.randint(1, 12)}"])
+              for _ in range(300)]
+    problem = parse_task_text(f"{len(tokens)} 1\n{' '.join(tokens)} max\n{' '.join(tokens)} <= 1")
+    expected = [parse_input_number(token) for token in tokens]
+    assert problem.goal_values == expected
+    assert problem.constraints[0][0] == expected
+
+
+def test_numbers_beyond_int64():
+    big = 10 ** 30
+    problem = parse_task_text(f"1 1\n{big} max\n1/{big} <= {big}.5")
+    assert problem.goal_values == [big]
+    assert problem.constraints[0][0] == [Fraction(1, big)] and problem.constraints[0][2] == Fraction(2 * big + 1, 2)
+
+
+def test_sparse_lines():
+    dense = parse_task_text("4 2\n1 0 2 0 max\n0 3 0 -1/2 <= 4\n1 0 0 0 >= 0")
+    sparse = parse_task_text("4 2\n1 0 2 0 max\n2:3 x4:-1/2 <= 4\n1:1 >= 0")
+    assert constraints_of(sparse) == constraints_of(dense)
+    matrix = parse_sparse_task_text("4 2\n1 0 2 0 max\n2:3 x4:-1/2 <= 4\n1:1 >= 0").matrix
+    assert matrix.indptr.tolist() == [0, 2, 3] and matrix.indices.tolist() == [1, 3, 0]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("2 1\n1 2 max\n1 2.5.1 <= 4", "Строка 3, столбец 3: Неверное число: 2.5.1"),
+    ("2 1\n1 2 max\n1 2 <= 4/0", "Строка 3, столбец 8: Деление на ноль в дроби"),
+    ("2 1\n1 2 max\n1 x <= 4", "Строка 3, столбец 3: Текстовый режим не позволяет вводить имена переменных: 'x'"),
+    ("\n\n2 1\n1 2 max\n1 2.5.1 <= 4", "Строка 5, столбец 3: Неверное число: 2.5.1"),
+    ("2 1\r\n1 2 max\r\n7 1.2.3 <= 4\r\n", "Строка 3, столбец 3: Неверное число: 1.2.3"),
+    ("2 2\n1 2 max\n1 2 <= 4", "Ограничений меньше, чем указано."),
+    ("2 1\n1 2 max\n1 2 =< 4", "Огр. 1: неверный знак."),
+    ("2 1\n1 2 max\n1 2 3 <= 4", "Огр. 1: неверный формат."),
+    ("2 1\n1 2\n1 2 <= 4", "Должно быть min или max в конце второй строки."),
+    ("2 1\n1 2 max\n1:1 1:2 <= 4", "Огр. 1: переменная X1 указана дважды"),
+    ("2 1\n1 2 max\n3:1 <= 4", "Огр. 1: неверная переменная '3:1'"),
+    ("", "Текст задачи пуст."),
+])
+def test_errors(text, message):
+    with pytest.raises(ValueError) as error:
+        parse_task_text(text)
+    assert error.value.args[0] == message
+    # The chunked reader of large files reports the same
+    with pytest.raises(ValueError) as error:
+        read_task_buffer(text.encode("utf-8"), chunk_size=8)
+    assert error.value.args[0] == message
+
+
+def random_task_text(rng, num_vars, num_constraints):
+    def number():
+        return rng.choice([str(rng.randint(-9, 9)), f"{rng.randint(-9, 9)}.{rng.randint(0, 9)}",
+                           f"{rng.randint(1, 9)}/{rng.randint(1, 9)}"])
+
+    lines = [f"{num_vars} {num_constraints}", " ".join(number() for _ in range(num_vars)) + " min"]
+    for _ in range(num_constraints):
+        relation = rng.choice(["<=", ">=", "="])
+        lines.append(" ".join(number() for _ in range(num_vars)) + f" {relation} {number()}")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 1 << 20])
+def test_file_chunks(tmp_path, chunk_size):
+    rng = random.Random(chunk_size)
+    text = random_task_text(rng, 12, 30)
+    path = tmp_path / "task.txt"
+    path.write_bytes(text.replace("\n", "\r\n").encode("utf-8"))
+    expected = parse_task_text(text)
+    problem = read_task_file(path, chunk_size=chunk_size).to_problem()
+    assert problem.goal_values == expected.goal_values
+    assert constraints_of(problem) == constraints_of(expected)
+
+
+def test_format_round_trip():
+    rng = random.Random(4)
+    for sparse in (False, True):
+        text = random_task_text(rng, 6, 5)
+        arrays = read_task_arrays(text)
+        again = parse_task_text(format_task_arrays(arrays, sparse=sparse))
+        assert constraints_of(again) == constraints_of(arrays.to_problem())
@@ -0,0 +1,78 @@
+# test_warm_start.py
+#
+# Warm re-solves as the solution window makes them must give the same answer as a cold solve.
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app"))
+
+from simplex_engine import SimplexProblem, artificial_vars, build_tableau, run_simplex, solve, warm_start_tableau
+
+
+def run_tableau(problem):
+    df, basic_vars, non_basic_vars = build_tableau(problem)
+    relations = [relation for _, relation, _ in problem.constraints]
+    result = run_simplex(df, basic_vars, non_basic_vars, is_maximization=problem.is_maximization,
+                         artificial_vars=artificial_vars(relations, basic_vars, problem.num_vars))
+    return df, result
+
+
+def warm_resolve(problem, changed):
+    """
+    Solve changed from the optimal basis of problem like SimplexSolutionWindow.add_step.
+    """
+    initial_df, result = run_tableau(problem)
+    assert result.status == "optimal"
+    new_df, basic_vars, _ = build_tableau(changed)
+    warm_df = warm_start_tableau(initial_df, result.tableau_df, result.basic_vars, result.non_basic_vars, new_df)
+    assert warm_df is not None
+    relations = [relation for _, relation, _ in changed.constraints]
+    return run_simplex(warm_df, result.basic_vars, result.non_basic_vars, is_maximization=changed.is_maximization,
+                       artificial_vars=artificial_vars(relations, basic_vars, changed.num_vars))
+
+
+def equality_problem(goal, equality_rhs, goal_type="max"):
+    # X3 appears only in the "=" row with coefficient 1, so build_tableau makes it the row's basic
+    # variable and moves its goal term into the F row
+    constraints = [([1, 2, 0], "≤", 10),
+                   ([3, 1, 0], "≤", 15),
+                   ([1, -1, 1], "=", equality_rhs),
+                   ([1, 1, 0], "≤", 8)]
+    return SimplexProblem(3, goal, goal_type, constraints)
+
+
+def assert_same_answer(warm, cold):
+    assert warm.status == cold.status
+    if cold.status == "optimal":
+        assert warm.optimal_value == cold.optimal_value
+
+
+def test_equality_rhs_change_with_structural_basic():
+    problem = equality_problem([2, 3, 4], 6)
+    changed = equality_problem([2, 3, 4], 9)
+    assert build_tableau(changed)[0].iloc[-1, 0] != build_tableau(problem)[0].iloc[-1, 0]
+    assert_same_answer(warm_resolve(problem, changed), solve(changed))
+
+
+def test_equality_goal_change_with_structural_basic():
+    problem = equality_problem([2, 3, 4], 6)
+    changed = equality_problem([2, 3, -1], 6)
+    assert_same_answer(warm_resolve(problem, changed), solve(changed))
+
+
+def test_random_equality_edits():
+    rng = random.Random(7)
+    checked = 0
+    for _ in range(200):
+        goal = [rng.randint(-5, 5) for _ in range(3)]
+        goal_type = rng.choice(["min", "max"])
+        problem = equality_problem(goal, rng.randint(0, 10), goal_type)
+        if run_tableau(problem)[1].status != "optimal":
+            continue
+        changed_goal = goal[:2] + [goal[2] + rng.randint(-3, 3)]
+        changed = equality_problem(changed_goal, problem.constraints[2][2] + rng.randint(-3, 3), goal_type)
+        assert_same_answer(warm_resolve(problem, changed), solve(changed))
+        checked += 1
+    assert checked > 50